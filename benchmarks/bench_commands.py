@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+命令提取基准测试
+
+对比原 extract_skill_commands 的四次 re.findall，与 CommandExtractor.extract 的耗时
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from skill_commands import CommandExtractor
+from bench_markdown import collect_samples
+
+LEGACY_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in [r'命令:\s*(.+)', r'Command:\s*(.+)', r'Usage:\s*(.+)', r'用法:\s*(.+)']
+]
+
+
+def legacy_extract(content):
+    """原 extract_skill_commands 的实现（对照组，正则已预编译）"""
+    commands = []
+    for pattern in LEGACY_PATTERNS:
+        commands.extend(pattern.findall(content))
+    return commands
+
+
+def time_extractor(extract, samples, rounds, repeat):
+    """
+    计时：对全部样本重复提取 rounds 轮，取 repeat 次中的最小值
+
+    Returns:
+        耗时（毫秒）
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for _, content in samples:
+                extract(content)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """主函数"""
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='命令提取基准测试')
+    parser.add_argument('--rounds', type=int, default=20, help='每次计时的重复轮数')
+    parser.add_argument('--repeat', type=int, default=5, help='计时次数（取最小值）')
+    parser.add_argument('--sections', type=int, default=2000, help='合成 SKILL.md 的章节数量')
+    parser.add_argument('--skills-dir', action='append',
+                        default=[str(repo_root / "deployed_skills"), str(repo_root / "example_skills")],
+                        help='扫描 SKILL.md 的目录（可多次指定）')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出结果')
+    args = parser.parse_args()
+
+    samples = collect_samples(args.skills_dir, args.sections)
+    extractor = CommandExtractor()
+
+    for _, content in samples:
+        if sorted(match.text for match in extractor.extract(content)) != sorted(legacy_extract(content)):
+            raise SystemExit("提取结果与原实现不一致")
+
+    results = {
+        'samples': len(samples),
+        'bytes': sum(len(content.encode('utf-8')) for _, content in samples),
+        'rounds': args.rounds,
+        'legacy_ms': time_extractor(legacy_extract, samples, args.rounds, args.repeat),
+        'extractor_ms': time_extractor(extractor.extract, samples, args.rounds, args.repeat),
+    }
+    results['speedup'] = results['legacy_ms'] / results['extractor_ms']
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"样本数: {results['samples']}  总大小: {results['bytes'] / 1024:.0f} KiB  轮数: {results['rounds']}")
+        print(f"四次 findall:     {results['legacy_ms']:.1f} ms")
+        print(f"CommandExtractor: {results['extractor_ms']:.1f} ms")
+        print(f"加速比: {results['speedup']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+YAML 头部解析基准测试
+
+对比 yaml.safe_load 与 parse_frontmatter（快速路径 + CSafeLoader）的解析结果和耗时
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import yaml
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from skill_frontmatter import YAML_LOADER, parse_frontmatter, read_frontmatter
+
+
+# 覆盖快速路径与回退路径的合成样本
+SYNTHETIC_SAMPLES = [
+    "name: flat-skill\ndescription: 只有扁平字段的技能\nlicense: Complete terms in LICENSE.txt",
+    "name: versioned\ndescription: 带版本号\nversion: 1.0.0\nauthor: MyTool Team\ncategory: test",
+    "name: tagged\ndescription: 带标签列表\ntags: [test, example, deployment]",
+    "name: nested\ndescription: 带嵌套元数据\nmetadata:\n  owner: team\n  level: 3",
+    "name: typed\ndescription: 带数字和布尔值\nversion: 2\nenabled: true\ncreated: 2024-01-01",
+    "name: quoted\ndescription: \"带引号: 与冒号\"",
+]
+
+
+def collect_samples(skill_dirs):
+    """
+    收集基准样本：仓库中的 SKILL.md 头部加上合成样本
+
+    Args:
+        skill_dirs: 扫描 SKILL.md 的目录列表
+
+    Returns:
+        YAML 文本列表
+    """
+    samples = list(SYNTHETIC_SAMPLES)
+
+    for skill_dir in skill_dirs:
+        for skill_file in sorted(Path(skill_dir).glob("*/SKILL.md")):
+            frontmatter = read_frontmatter(skill_file)
+            if frontmatter:
+                samples.append(frontmatter[0].strip())
+
+    return samples
+
+
+def check_equivalence(samples):
+    """
+    校验两种解析方式的结果一致
+
+    Raises:
+        AssertionError: 结果不一致
+    """
+    for text in samples:
+        expected = yaml.safe_load(text)
+        actual = parse_frontmatter(text)
+        assert actual == expected, f"解析结果不一致:\n{text}\n{expected!r}\n{actual!r}"
+
+
+def time_parser(parser, samples, rounds):
+    """
+    计时：对全部样本重复解析 rounds 轮
+
+    Returns:
+        每个样本的平均耗时（微秒）
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in samples:
+            parser(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(samples)) * 1e6
+
+
+def main():
+    """主函数"""
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='YAML 头部解析基准测试')
+    parser.add_argument('--rounds', type=int, default=200, help='重复轮数')
+    parser.add_argument('--skills-dir', action='append',
+                        default=[str(repo_root / "deployed_skills"), str(repo_root / "example_skills")],
+                        help='扫描 SKILL.md 的目录（可多次指定）')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出结果')
+    args = parser.parse_args()
+
+    samples = collect_samples(args.skills_dir)
+    check_equivalence(samples)
+
+    results = {
+        'samples': len(samples),
+        'rounds': args.rounds,
+        'yaml_loader': YAML_LOADER.__name__,
+        'safe_load_us': time_parser(yaml.safe_load, samples, args.rounds),
+        'parse_frontmatter_us': time_parser(parse_frontmatter, samples, args.rounds),
+    }
+    results['speedup'] = results['safe_load_us'] / results['parse_frontmatter_us']
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"样本数: {results['samples']}  轮数: {results['rounds']}  回退解析器: {results['yaml_loader']}")
+        print(f"yaml.safe_load:    {results['safe_load_us']:.1f} µs/次")
+        print(f"parse_frontmatter: {results['parse_frontmatter_us']:.1f} µs/次")
+        print(f"加速比: {results['speedup']:.1f}x（结果一致性已校验）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Markdown 结构解析基准测试
+
+对比原逐行多次 strip 的解析 + 四次 re.findall 的命令提取，与单遍解析 parse_markdown 的耗时
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from skill_frontmatter import read_frontmatter, read_body
+from skill_markdown import parse_markdown
+
+
+def legacy_parse(content):
+    """原 SkillLoader._parse_markdown_content + extract_skill_commands 的实现（对照组）"""
+    parsed = {
+        'sections': [],
+        'examples': [],
+        'guidelines': [],
+        'commands': []
+    }
+
+    current_section = None
+
+    for line in content.split('\n'):
+        if line.startswith('#'):
+            level = len(line) - len(line.lstrip('#'))
+            title = line.lstrip('#').strip()
+            current_section = {'level': level, 'title': title, 'content': []}
+            parsed['sections'].append(current_section)
+        elif line.strip().startswith('- Example:'):
+            parsed['examples'].append(line.replace('- Example:', '').strip())
+        elif line.strip().startswith('- Guideline:'):
+            parsed['guidelines'].append(line.replace('- Guideline:', '').strip())
+        elif line.strip().startswith('```'):
+            pass
+        elif current_section and line.strip():
+            current_section['content'].append(line.strip())
+
+    for pattern in [r'命令:\s*(.+)', r'Command:\s*(.+)', r'Usage:\s*(.+)', r'用法:\s*(.+)']:
+        parsed['commands'].extend(re.findall(pattern, content, re.IGNORECASE | re.MULTILINE))
+
+    return parsed
+
+
+def synthetic_skill(sections):
+    """
+    生成大型 SKILL.md 正文
+
+    Args:
+        sections: 章节数量
+
+    Returns:
+        Markdown 正文
+    """
+    parts = []
+    for i in range(sections):
+        parts.append(f"## Section {i}\n")
+        parts.append(f"Paragraph text for section {i}, describing what the skill does in detail.\n" * 8)
+        parts.append(f"- Example: example {i}\n- Guideline: guideline {i}\n")
+        parts.append(f"Usage: python scripts/tool_{i}.py --input file.pdf\n")
+        parts.append("```python\n# comment inside code\nimport os\nprint(os.getcwd())\n```\n")
+    return '\n'.join(parts)
+
+
+def collect_samples(skill_dirs, sections):
+    """
+    收集基准样本：合成的大型正文加上仓库中的 SKILL.md 正文
+
+    Returns:
+        (名称, 正文) 列表
+    """
+    samples = [(f"synthetic-{sections}", synthetic_skill(sections))]
+
+    for skill_dir in skill_dirs:
+        for skill_file in sorted(Path(skill_dir).glob("*/SKILL.md")):
+            frontmatter = read_frontmatter(skill_file)
+            if frontmatter:
+                samples.append((skill_file.parent.name, read_body(skill_file, frontmatter[1])))
+
+    return samples
+
+
+def time_parser(parser, samples, rounds):
+    """
+    计时：对全部样本重复解析 rounds 轮
+
+    Returns:
+        总耗时（毫秒）
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for _, content in samples:
+            parser(content)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    """主函数"""
+    repo_root = Path(__file__).parent.parent
+
+    parser = argparse.ArgumentParser(description='Markdown 结构解析基准测试')
+    parser.add_argument('--rounds', type=int, default=20, help='重复轮数')
+    parser.add_argument('--sections', type=int, default=2000, help='合成 SKILL.md 的章节数量')
+    parser.add_argument('--skills-dir', action='append',
+                        default=[str(repo_root / "deployed_skills"), str(repo_root / "example_skills")],
+                        help='扫描 SKILL.md 的目录（可多次指定）')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出结果')
+    args = parser.parse_args()
+
+    samples = collect_samples(args.skills_dir, args.sections)
+
+    results = {
+        'samples': len(samples),
+        'bytes': sum(len(content.encode('utf-8')) for _, content in samples),
+        'rounds': args.rounds,
+        'legacy_ms': time_parser(legacy_parse, samples, args.rounds),
+        'single_pass_ms': time_parser(parse_markdown, samples, args.rounds),
+    }
+    results['speedup'] = results['legacy_ms'] / results['single_pass_ms']
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"样本数: {results['samples']}  总大小: {results['bytes'] / 1024:.0f} KiB  轮数: {results['rounds']}")
+        print(f"原实现:   {results['legacy_ms']:.1f} ms")
+        print(f"单遍解析: {results['single_pass_ms']:.1f} ms")
+        print(f"加速比: {results['speedup']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
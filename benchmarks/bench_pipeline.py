@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+技能部署流程基准测试
+
+在合成技能仓库上分别计时发现、加载、部署、索引生成与 list_skills.py 端到端运行，
+结果以 JSON 输出，可用 --compare 与之前的结果对比
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from skill_manager import SkillManager
+from skill_deployer import SkillDeployer
+from synthetic_repo import generate_repository
+
+
+def measure(func, repeat, setup=None):
+    """
+    重复计时
+
+    Args:
+        func: 被计时的函数（参数为 setup 的返回值）
+        repeat: 重复次数
+        setup: 每次计时前执行的准备函数（不计时）
+
+    Returns:
+        {min_ms, median_ms, mean_ms, runs}
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        func(state)
+        times.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'min_ms': min(times),
+        'median_ms': statistics.median(times),
+        'mean_ms': statistics.fmean(times),
+        'runs': repeat
+    }
+
+
+def run_benchmarks(work_dir: Path, skills_dir: Path, repeat: int, jobs: int):
+    """
+    运行全部基准
+
+    Args:
+        work_dir: 工作目录（部署目录、配置与缓存都放在这里）
+        skills_dir: 合成技能仓库
+        repeat: 每项的重复次数
+        jobs: deploy_all_skills 并行测试使用的线程数
+
+    Returns:
+        {基准名称: 计时结果}
+    """
+    results = {}
+    counter = [0]
+
+    def fresh_dir(prefix):
+        counter[0] += 1
+        path = work_dir / f"{prefix}-{counter[0]}"
+        if path.exists():
+            shutil.rmtree(path)
+        return path
+
+    manager = SkillManager(str(skills_dir), str(work_dir / "unused"))
+    names = manager.discover_skills()
+
+    results['discover_skills'] = measure(lambda _: manager.discover_skills(), repeat)
+
+    results['load_skill'] = measure(lambda _: [manager.load_skill(name) for name in names], repeat)
+    results['load_skill_metadata_only'] = measure(
+        lambda _: [manager.load_skill(name, metadata_only=True) for name in names], repeat)
+
+    cached = SkillManager(str(skills_dir), str(work_dir / "unused"), str(work_dir / "skill_cache.db"))
+    for name in names:
+        cached.load_skill(name)
+    results['load_skill_cached'] = measure(lambda _: [cached.load_skill(name) for name in names], repeat)
+
+    def deploy_all(job_count):
+        def setup():
+            return SkillManager(str(skills_dir), str(fresh_dir("manager-deployed")))
+        return measure(lambda m: m.deploy_all_skills(jobs=job_count), repeat, setup)
+
+    results['deploy_all_skills'] = deploy_all(1)
+    if jobs > 1:
+        results[f'deploy_all_skills_jobs{jobs}'] = deploy_all(jobs)
+
+    infos = {name: manager.load_skill(name) for name in names}
+
+    def deployer_setup():
+        root = fresh_dir("deployer")
+        root.mkdir()
+        return SkillDeployer(str(root / "deployed"), str(root / "config"))
+
+    def deploy_each(deployer):
+        for name in names:
+            deployer.deploy_skill(skills_dir / name, infos[name])
+
+    results['deploy_skill_full'] = measure(deploy_each, repeat, deployer_setup)
+
+    deployer = deployer_setup()
+    deploy_each(deployer)
+    results['deploy_skill_incremental_noop'] = measure(lambda _: deploy_each(deployer), repeat)
+
+    results['generate_skill_index_rebuild'] = measure(
+        lambda _: deployer.generate_skill_index(rebuild=True), repeat)
+    results['generate_skill_index_cached'] = measure(lambda _: deployer.generate_skill_index(), repeat)
+
+    def list_skills(_):
+        subprocess.run(
+            [sys.executable, str(REPO_ROOT / "scripts" / "list_skills.py"),
+             '--skills-dir', str(skills_dir), '--deployed-dir', str(deployer.deployed_dir),
+             '--format', 'jsonl'],
+            cwd=str(work_dir), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    results['list_skills_cli'] = measure(list_skills, repeat)
+
+    return results
+
+
+def compare(results, baseline_file):
+    """
+    输出与基线结果的对比（按中位数）
+
+    Args:
+        results: 本次结果
+        baseline_file: 基线 JSON 文件
+    """
+    baseline = json.loads(Path(baseline_file).read_text(encoding='utf-8'))
+    if baseline.get('params') != results['params']:
+        print("警告: 基线的参数与本次不同，对比结果仅供参考", file=sys.stderr)
+
+    print(f"{'基准':<36}{'基线(ms)':>12}{'本次(ms)':>12}{'比值':>8}", file=sys.stderr)
+    for name, current in results['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            continue
+        ratio = current['median_ms'] / before['median_ms'] if before['median_ms'] else float('inf')
+        print(f"{name:<36}{before['median_ms']:>12.1f}{current['median_ms']:>12.1f}{ratio:>8.2f}", file=sys.stderr)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='技能部署流程基准测试')
+    parser.add_argument('--skills', type=int, default=200, help='合成技能数量')
+    parser.add_argument('--skill-md-kb', type=float, default=4.0, help='每个 SKILL.md 的大小（KiB）')
+    parser.add_argument('--resource-files', type=int, default=5, help='每个技能的资源文件数量')
+    parser.add_argument('--resource-kb', type=float, default=8.0, help='每个资源文件的大小（KiB）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--repeat', type=int, default=3, help='每项的重复次数')
+    parser.add_argument('--jobs', type=int, default=4, help='并行部署测试使用的线程数')
+    parser.add_argument('--work-dir', help='工作目录（默认使用临时目录并在结束后删除）')
+    parser.add_argument('--output', help='结果 JSON 文件（默认输出到标准输出）')
+    parser.add_argument('--compare', metavar='BASELINE', help='与之前的结果 JSON 对比')
+    args = parser.parse_args()
+
+    # 基准测试期间不输出模块的 INFO 日志
+    logging.disable(logging.INFO)
+
+    params = {
+        'skills': args.skills,
+        'skill_md_kb': args.skill_md_kb,
+        'resource_files': args.resource_files,
+        'resource_kb': args.resource_kb,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'jobs': args.jobs
+    }
+
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix="skill-bench-"))
+    try:
+        skills_dir = generate_repository(work_dir / "skills", args.skills, args.skill_md_kb,
+                                         args.resource_files, args.resource_kb, args.seed)
+        results = {
+            'benchmark': 'pipeline',
+            'params': params,
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count()
+            },
+            'results': run_benchmarks(work_dir, skills_dir, args.repeat, args.jobs)
+        }
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n', encoding='utf-8')
+    else:
+        print(output)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+合成技能仓库生成器
+
+按给定的技能数量、SKILL.md 大小、资源文件数量与大小生成可复现的技能仓库，供基准测试使用
+"""
+
+import sys
+import random
+import argparse
+from pathlib import Path
+
+# 合成技能使用的分类与标签
+CATEGORIES = ['documents', 'development', 'design', 'communication', 'data']
+TAGS = ['pdf', 'docx', 'testing', 'web', 'slides', 'forms', 'api', 'automation']
+
+_WORDS = (
+    "skill deploy resource template script example guideline section document form table "
+    "render parse validate extract convert generate review index search cache manifest"
+).split()
+
+
+def _paragraph(rng: random.Random, size: int) -> str:
+    """生成约 size 字节的英文段落"""
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)
+
+
+def _random_bytes(rng: random.Random, size: int) -> bytes:
+    """生成 size 字节的随机数据（Random.randbytes 需要 Python 3.9+）"""
+    if size <= 0:
+        return b''
+    return rng.getrandbits(8 * size).to_bytes(size, 'little')
+
+
+def skill_markdown(name: str, rng: random.Random, size_kb: float) -> str:
+    """
+    生成单个 SKILL.md 内容
+
+    Args:
+        name: 技能名称
+        rng: 随机数生成器
+        size_kb: 正文目标大小（KiB）
+
+    Returns:
+        SKILL.md 文本
+    """
+    tags = ', '.join(rng.sample(TAGS, 2))
+    lines = [
+        "---",
+        f"name: {name}",
+        f"description: Synthetic benchmark skill {name} for {rng.choice(_WORDS)} workflows",
+        "version: 1.0.0",
+        "author: Benchmark",
+        f"category: {rng.choice(CATEGORIES)}",
+        f"tags: [{tags}]",
+        "---",
+        "",
+        f"# {name}",
+        "",
+    ]
+
+    target = int(size_kb * 1024)
+    length = sum(len(line) + 1 for line in lines)
+    section = 0
+    while length < target:
+        block = [
+            f"## Section {section}",
+            "",
+            _paragraph(rng, 400),
+            "",
+            f"- Example: {_paragraph(rng, 40)}",
+            f"- Guideline: {_paragraph(rng, 40)}",
+            f"Usage: python scripts/tool_{section}.py --input file.pdf",
+            "",
+            "```bash",
+            f"# step {section}",
+            f"python scripts/tool_{section}.py",
+            "```",
+            "",
+        ]
+        lines.extend(block)
+        length += sum(len(line) + 1 for line in block)
+        section += 1
+
+    return '\n'.join(lines) + '\n'
+
+
+def generate_repository(root: str, skills: int = 100, skill_md_kb: float = 4.0,
+                        resource_files: int = 5, resource_kb: float = 8.0, seed: int = 0) -> Path:
+    """
+    生成合成技能仓库
+
+    资源文件分布在 scripts/、templates/、resources/ 三个目录中，内容由种子决定，
+    相同参数生成的仓库完全相同
+
+    Args:
+        root: 输出目录（不存在时创建）
+        skills: 技能数量
+        skill_md_kb: 每个 SKILL.md 的目标大小（KiB）
+        resource_files: 每个技能的资源文件数量
+        resource_kb: 每个资源文件的大小（KiB）
+        seed: 随机种子
+
+    Returns:
+        仓库根目录
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    resource_dirs = ['scripts', 'templates', 'resources']
+    resource_size = int(resource_kb * 1024)
+
+    for i in range(skills):
+        name = f"skill-{i:05d}"
+        skill_dir = root / name
+        skill_dir.mkdir(exist_ok=True)
+        (skill_dir / "SKILL.md").write_text(skill_markdown(name, rng, skill_md_kb), encoding='utf-8')
+
+        for j in range(resource_files):
+            resource_dir = skill_dir / resource_dirs[j % len(resource_dirs)]
+            resource_dir.mkdir(exist_ok=True)
+            (resource_dir / f"file_{j}.txt").write_bytes(_random_bytes(rng, resource_size))
+
+    return root
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='生成合成技能仓库')
+    parser.add_argument('output', help='输出目录')
+    parser.add_argument('--skills', type=int, default=100, help='技能数量')
+    parser.add_argument('--skill-md-kb', type=float, default=4.0, help='每个 SKILL.md 的大小（KiB）')
+    parser.add_argument('--resource-files', type=int, default=5, help='每个技能的资源文件数量')
+    parser.add_argument('--resource-kb', type=float, default=8.0, help='每个资源文件的大小（KiB）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args()
+
+    root = generate_repository(args.output, args.skills, args.skill_md_kb,
+                               args.resource_files, args.resource_kb, args.seed)
+    print(f"已生成 {args.skills} 个技能: {root}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+技能包脚本
+
+将已部署技能打包为单个技能包文件，或在不解包的情况下查看、读取、解包其中的技能
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from rich import box
+from rich.markup import escape
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from skill_deployer import SkillDeployer
+from skill_bundle import SkillBundle
+
+console = Console()
+
+
+def pack_bundle(bundle_path: str, deployed_dir: str, skill_names: list = None):
+    """
+    打包已部署技能
+
+    Args:
+        bundle_path: 技能包文件路径
+        deployed_dir: 已部署技能目录
+        skill_names: 要打包的技能，为空时打包全部
+    """
+    deployer = SkillDeployer(deployed_dir)
+    packed = deployer.export_bundle(bundle_path, skill_names or None)
+    stats = deployer.transfer_stats
+    console.print(f"[green]已打包 {len(packed)} 个技能到 {escape(bundle_path)}[/green] "
+                  f"({stats.files} 个文件, {stats.bytes / 1024:.1f} KB)")
+
+
+def list_bundle(bundle_path: str, output_format: str = 'table'):
+    """
+    列出技能包中的技能
+
+    Args:
+        bundle_path: 技能包文件路径
+        output_format: 输出格式（table / jsonl）
+    """
+    with SkillBundle(bundle_path) as bundle:
+        if output_format == 'jsonl':
+            for record in bundle.records():
+                print(json.dumps(record.to_dict(), ensure_ascii=False))
+            return
+
+        table = Table(title=f"技能包: {bundle_path}", box=box.ROUNDED, show_header=True, header_style="bold magenta")
+        table.add_column("技能名称", style="cyan", width=25)
+        table.add_column("分类", width=15)
+        table.add_column("文件数", justify="right", width=8)
+        table.add_column("描述", style="green")
+
+        for name in bundle.skills():
+            metadata = bundle.metadata(name)
+            table.add_row(
+                escape(name),
+                escape(metadata.get('category', 'uncategorized')),
+                str(len(bundle.files(name))),
+                escape(metadata.get('description', ''))
+            )
+
+        console.print(table)
+
+
+def cat_file(bundle_path: str, skill_name: str, rel_path: str):
+    """
+    输出技能包中的单个文件（默认 SKILL.md）
+
+    Args:
+        bundle_path: 技能包文件路径
+        skill_name: 技能名称
+        rel_path: 文件相对路径
+    """
+    with SkillBundle(bundle_path) as bundle:
+        with bundle.view(skill_name, rel_path) as data:
+            sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+
+def extract_bundle(bundle_path: str, target_dir: str, skill_names: list = None):
+    """
+    解包技能
+
+    Args:
+        bundle_path: 技能包文件路径
+        target_dir: 目标目录
+        skill_names: 要解包的技能，为空时解包全部
+    """
+    with SkillBundle(bundle_path) as bundle:
+        for name in skill_names or bundle.skills():
+            skill_dir = bundle.extract(name, target_dir)
+            console.print(f"[green]已解包: {escape(str(skill_dir))}[/green]")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='技能包打包与读取')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    pack = subparsers.add_parser('pack', help='将已部署技能打包为单个文件')
+    pack.add_argument('bundle', help='技能包文件路径')
+    pack.add_argument('skills', nargs='*', help='要打包的技能（默认全部）')
+    pack.add_argument('--deployed-dir', default='deployed_skills', help='已部署技能目录')
+
+    list_parser = subparsers.add_parser('list', help='列出技能包中的技能')
+    list_parser.add_argument('bundle', help='技能包文件路径')
+    list_parser.add_argument('--format', choices=('table', 'jsonl'), default='table', help='输出格式')
+
+    cat = subparsers.add_parser('cat', help='输出技能包中的文件（不解包）')
+    cat.add_argument('bundle', help='技能包文件路径')
+    cat.add_argument('skill', help='技能名称')
+    cat.add_argument('path', nargs='?', default='SKILL.md', help='文件相对路径（默认 SKILL.md）')
+
+    extract = subparsers.add_parser('extract', help='解包技能')
+    extract.add_argument('bundle', help='技能包文件路径')
+    extract.add_argument('skills', nargs='*', help='要解包的技能（默认全部）')
+    extract.add_argument('--target-dir', default='deployed_skills', help='目标目录')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'pack':
+            pack_bundle(args.bundle, args.deployed_dir, args.skills)
+        elif args.command == 'list':
+            list_bundle(args.bundle, args.format)
+        elif args.command == 'cat':
+            cat_file(args.bundle, args.skill, args.path)
+        else:
+            extract_bundle(args.bundle, args.target_dir, args.skills)
+    except (OSError, KeyError, ValueError) as e:
+        console.print(f"[bold red]错误: {escape(str(e))}[/bold red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
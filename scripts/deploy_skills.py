@@ -6,6 +6,7 @@
 """
 
 import sys
+import time
 import argparse
 from pathlib import Path
 
@@ -14,6 +15,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from skill_manager import SkillManager
 from skill_deployer import SkillDeployer
+from skill_cache import DEFAULT_CACHE_FILE
+from skill_catalog import DEFAULT_CATALOG_FILE
+from parallel_deployer import ParallelDeployer
+from async_deployer import AsyncSkillDeployer
+from skill_watcher import SkillWatcher
+from instrumentation import enable_tracing, disable_tracing
 import logging
 
 # 配置日志
@@ -29,7 +36,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def deploy_skills(skills_dir: str, deployed_dir: str, specific_skill: str = None) -> bool:
+def deploy_skills(skills_dir: str, deployed_dir: str, specific_skill: str = None,
+                  use_cache: bool = True, jobs: int = 1, parse_processes: int = 0,
+                  force: bool = False, dry_run: bool = False, dedup: bool = False,
+                  use_catalog: bool = True, use_async: bool = False, staged: bool = False,
+                  keep_releases: int = 2) -> bool:
     """
     部署技能
     
@@ -37,14 +48,26 @@ def deploy_skills(skills_dir: str, deployed_dir: str, specific_skill: str = None
         skills_dir: 技能仓库目录
         deployed_dir: 已部署技能目录
         specific_skill: 指定部署的单个技能（可选）
+        use_cache: 是否使用技能解析缓存
+        jobs: 并行部署线程数
+        parse_processes: 解析进程数（0 表示不使用进程池）
+        force: 是否强制完整重建（默认增量部署）
+        dry_run: 只输出增量部署计划，不修改任何文件
+        dedup: 是否使用按内容寻址的对象存储去重部署文件
+        use_catalog: 是否维护 SQLite 技能目录（供 list_skills.py 按条件查询）
+        use_async: 是否使用异步流水线部署（jobs 为阻塞文件操作的线程数）
+        staged: 是否分阶段部署（完成后原子切换，保留历史版本用于回滚）
+        keep_releases: 分阶段部署时保留的历史版本数
         
     Returns:
         部署是否成功
     """
     try:
         # 初始化管理器
-        manager = SkillManager(skills_dir, deployed_dir)
-        deployer = SkillDeployer(deployed_dir)
+        manager = SkillManager(skills_dir, deployed_dir, DEFAULT_CACHE_FILE if use_cache else None)
+        deployer = SkillDeployer(deployed_dir, use_object_store=dedup,
+                                 catalog_file=DEFAULT_CATALOG_FILE if use_catalog else None,
+                                 staged=staged, keep_releases=keep_releases)
         
         # 发现技能
         skills = manager.discover_skills()
@@ -55,19 +78,24 @@ def deploy_skills(skills_dir: str, deployed_dir: str, specific_skill: str = None
         
         logger.info(f"发现 {len(skills)} 个技能")
         
+        if specific_skill and specific_skill not in skills:
+            logger.error(f"指定的技能不存在: {specific_skill}")
+            return False
+        
+        # 预演：只报告计划的变更
+        if dry_run:
+            report_deployment_plan(deployer, skills_dir, [specific_skill] if specific_skill else skills, force)
+            return True
+        
         # 部署技能
         if specific_skill:
-            if specific_skill not in skills:
-                logger.error(f"指定的技能不存在: {specific_skill}")
-                return False
-            
             # 部署单个技能
             skill_info = manager.load_skill(specific_skill)
             if not skill_info:
                 logger.error(f"无法加载技能: {specific_skill}")
                 return False
             
-            success = deployer.deploy_skill(Path(skills_dir) / specific_skill, skill_info)
+            success = deployer.deploy_skill(Path(skills_dir) / specific_skill, skill_info, force=force)
             if success:
                 logger.info(f"技能部署成功: {specific_skill}")
             else:
@@ -76,21 +104,26 @@ def deploy_skills(skills_dir: str, deployed_dir: str, specific_skill: str = None
             return success
         else:
             # 部署所有技能
-            results = {}
-            success_count = 0
+            if use_async:
+                reports = AsyncSkillDeployer(manager, deployer, workers=jobs, force=force).run(skills)
+            else:
+                reports = ParallelDeployer(manager, deployer, jobs, parse_processes, force).deploy(skills)
+            success_count = sum(1 for report in reports if report['success'])
             
-            for skill_name in skills:
-                skill_info = manager.load_skill(skill_name)
-                if skill_info:
-                    success = deployer.deploy_skill(Path(skills_dir) / skill_name, skill_info)
-                    results[skill_name] = success
-                    if success:
-                        success_count += 1
-                else:
-                    results[skill_name] = False
+            # 每个技能的耗时明细（按发现顺序输出）
+            for report in reports:
+                status = "成功" if report['success'] else f"失败 ({report['error']})"
+                logger.info(
+                    f"  {report['skill_name']}: {status} - 加载 {report['load_time']:.3f}s, "
+                    f"部署 {report['deploy_time']:.3f}s, 合计 {report['total_time']:.3f}s"
+                )
             
             # 生成部署报告
             logger.info(f"部署完成 - 成功: {success_count}/{len(skills)}")
+            report_transfer(deployer.transfer_stats)
+            
+            # 清理对象存储中未被引用的对象
+            deployer.collect_garbage()
             
             # 生成技能索引
             deployer.generate_skill_index()
@@ -102,16 +135,198 @@ def deploy_skills(skills_dir: str, deployed_dir: str, specific_skill: str = None
         return False
 
 
+def redeploy_changed(manager: SkillManager, deployer: SkillDeployer, skill_names: set,
+                      detected_at: float, force: bool = False):
+    """
+    重新部署发生变更的技能（技能目录已删除时卸载）
+    
+    Args:
+        manager: 技能管理器
+        deployer: 技能部署器
+        skill_names: 发生变更的技能名称
+        detected_at: 第一次检测到变更的时间（time.perf_counter()）
+        force: 是否强制完整重建
+    """
+    for skill_name in sorted(skill_names):
+        skill_path = manager.skills_dir / skill_name
+        
+        if not (skill_path / "SKILL.md").exists():
+            if (deployer.deployed_dir / skill_name).exists():
+                logger.info(f"技能已从仓库移除，卸载: {skill_name}")
+                deployer.undeploy_skill(skill_name)
+            continue
+        
+        skill_info = manager.load_skill(skill_name)
+        if not skill_info:
+            logger.error(f"无法加载技能: {skill_name}")
+            continue
+        
+        deployer.deploy_skill(skill_path, skill_info, force=force)
+    
+    logger.info(f"已重新部署 {', '.join(sorted(skill_names))} - 延迟 {time.perf_counter() - detected_at:.3f}s")
+
+
+def watch_skills(skills_dir: str, deployed_dir: str, use_cache: bool = True, force: bool = False,
+                 dedup: bool = False, use_catalog: bool = True, debounce: float = 0.2,
+                 poll_interval: float = 0.5, use_inotify: bool = True, staged: bool = False,
+                 keep_releases: int = 2):
+    """
+    监视技能仓库，技能发生变更时只重新部署该技能（Ctrl+C 退出）
+    
+    Args:
+        skills_dir: 技能仓库目录
+        deployed_dir: 已部署技能目录
+        use_cache: 是否使用技能解析缓存
+        force: 是否强制完整重建
+        dedup: 是否使用对象存储去重部署文件
+        use_catalog: 是否维护 SQLite 技能目录
+        debounce: 去抖时间（秒）
+        poll_interval: 轮询模式的扫描间隔（秒）
+        use_inotify: 是否优先使用 inotify
+        staged: 是否分阶段部署
+        keep_releases: 分阶段部署时保留的历史版本数
+    """
+    manager = SkillManager(skills_dir, deployed_dir, DEFAULT_CACHE_FILE if use_cache else None)
+    deployer = SkillDeployer(deployed_dir, use_object_store=dedup,
+                             catalog_file=DEFAULT_CATALOG_FILE if use_catalog else None,
+                             staged=staged, keep_releases=keep_releases)
+    watcher = SkillWatcher(skills_dir, debounce, poll_interval, use_inotify)
+    
+    logger.info(f"正在监视技能仓库 ({watcher.backend})，按 Ctrl+C 退出")
+    
+    try:
+        watcher.run(lambda names, detected_at: redeploy_changed(manager, deployer, names, detected_at, force))
+    except KeyboardInterrupt:
+        watcher.stop()
+        logger.info("已停止监视")
+
+
+def rollback_skill(deployed_dir: str, skill_name: str, release_id: str = None,
+                   use_catalog: bool = True) -> bool:
+    """
+    回滚分阶段部署的技能
+    
+    Args:
+        deployed_dir: 已部署技能目录
+        skill_name: 技能名称
+        release_id: 目标版本号（为 None 时回滚到上一个版本）
+        use_catalog: 是否维护 SQLite 技能目录
+        
+    Returns:
+        回滚是否成功
+    """
+    deployer = SkillDeployer(deployed_dir, catalog_file=DEFAULT_CATALOG_FILE if use_catalog else None,
+                             staged=True)
+    
+    releases = deployer.list_releases(skill_name)
+    if not releases:
+        logger.error(f"技能没有分阶段部署的版本: {skill_name}")
+        return False
+    
+    for release in releases:
+        marker = " (当前)" if release['current'] else ""
+        logger.info(f"  版本 {release['release']}{marker} - 部署时间 {release['deployed_at']}")
+    
+    return deployer.rollback(skill_name, release_id)
+
+
+def report_deployment_plan(deployer: SkillDeployer, skills_dir: str, skills: list, force: bool = False):
+    """
+    输出部署计划（预演模式）
+    
+    Args:
+        deployer: 技能部署器
+        skills_dir: 技能仓库目录
+        skills: 技能名称列表
+        force: 是否强制完整重建
+    """
+    for skill_name in skills:
+        plan = deployer.plan_deployment(Path(skills_dir) / skill_name, skill_name)
+        mode = "完整重建" if force or plan['mode'] == 'full' else "增量"
+        logger.info(
+            f"[预演] {skill_name} ({mode}): 新增 {len(plan['added'])}, 变更 {len(plan['changed'])}, "
+            f"删除 {len(plan['removed'])}, 未变 {len(plan['unchanged'])}"
+        )
+        for action, label in (('added', '+'), ('changed', '~'), ('removed', '-')):
+            for rel_path in plan[action]:
+                logger.info(f"    {label} {rel_path}")
+
+
+def report_transfer(stats):
+    """
+    输出文件复制统计
+    
+    Args:
+        stats: 文件传输统计（TransferStats）
+    """
+    if not stats.files:
+        return
+    
+    summary = stats.to_dict()
+    methods = ", ".join(f"{method} {count}" for method, count in sorted(summary['methods'].items()))
+    logger.info(
+        f"文件复制: {summary['files']} 个文件, {summary['bytes'] / 1024 / 1024:.1f} MiB, "
+        f"{summary['throughput'] / 1024 / 1024:.1f} MiB/s ({methods})"
+    )
+
+
+def report_trace(tracer, trace_file: str = None, json_file: str = None):
+    """
+    输出各阶段耗时汇总并写入追踪文件
+    
+    Args:
+        tracer: 追踪器
+        trace_file: Chrome trace 文件路径（可选）
+        json_file: JSON 报告文件路径（可选）
+    """
+    logger.info("各阶段耗时:")
+    for stage, stats in sorted(tracer.summary().items(), key=lambda item: -item[1]['total_ms']):
+        extra = ", ".join(f"{key} {value}" for key, value in stats.items()
+                          if key not in ('count', 'total_ms', 'max_ms'))
+        logger.info(
+            f"  {stage}: {stats['count']} 次, 合计 {stats['total_ms']:.1f}ms, 最长 {stats['max_ms']:.1f}ms"
+            + (f", {extra}" if extra else "")
+        )
+    
+    if trace_file:
+        tracer.write_chrome_trace(trace_file)
+        logger.info(f"Chrome trace 已写入: {trace_file}")
+    if json_file:
+        tracer.write_json(json_file)
+        logger.info(f"追踪报告已写入: {json_file}")
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='部署 Anthropic Skills 仓库中的技能')
     parser.add_argument('--skills-dir', default='skills', help='技能仓库目录')
     parser.add_argument('--deployed-dir', default='deployed_skills', help='已部署技能目录')
     parser.add_argument('--skill', help='指定部署的单个技能名称')
-    parser.add_argument('--force', action='store_true', help='强制重新部署')
+    parser.add_argument('--force', action='store_true', help='强制完整重建（默认只复制变更的文件）')
+    parser.add_argument('--dry-run', action='store_true', help='只显示增量部署计划，不修改文件')
+    parser.add_argument('--dedup', action='store_true', help='使用对象存储去重部署文件（硬链接）')
+    parser.add_argument('--no-cache', action='store_true', help='禁用技能解析缓存')
+    parser.add_argument('--no-catalog', action='store_true', help='不维护 SQLite 技能目录')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='并行部署线程数')
+    parser.add_argument('--trace', metavar='FILE', help='记录各阶段耗时并写入 Chrome trace 文件（chrome://tracing / Perfetto）')
+    parser.add_argument('--trace-json', metavar='FILE', help='记录各阶段耗时并写入 JSON 报告')
+    parser.add_argument('--async-io', action='store_true', help='使用异步流水线部署（适合 NFS 等高延迟的部署目录）')
+    parser.add_argument('--staged', action='store_true', help='分阶段部署：写入新版本目录后原子切换（可回滚）')
+    parser.add_argument('--keep-releases', type=int, default=2, help='分阶段部署时保留的历史版本数')
+    parser.add_argument('--rollback', metavar='SKILL', help='将分阶段部署的技能回滚到上一个版本（或 --release 指定的版本）')
+    parser.add_argument('--release', help='--rollback 的目标版本号')
+    parser.add_argument('--watch', action='store_true', help='部署后持续监视技能仓库，只重新部署发生变更的技能')
+    parser.add_argument('--debounce', type=float, default=0.2, help='监视模式的去抖时间（秒）')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='监视模式轮询扫描间隔（秒，inotify 不可用时使用）')
+    parser.add_argument('--polling', action='store_true', help='监视模式强制使用轮询而不是 inotify')
+    parser.add_argument('--parse-processes', type=int, default=0, help='解析技能使用的进程数（0 表示不使用进程池）')
     
     args = parser.parse_args()
     
+    # 回滚不需要技能仓库
+    if args.rollback:
+        sys.exit(0 if rollback_skill(args.deployed_dir, args.rollback, args.release, not args.no_catalog) else 1)
+    
     logger.info("开始技能部署过程")
     
     # 检查技能目录是否存在
@@ -121,15 +336,30 @@ def main():
         logger.info("请先克隆技能仓库或指定正确的目录")
         sys.exit(1)
     
+    # 启用性能追踪（进程池中的解析不会被记录）
+    tracer = enable_tracing() if args.trace or args.trace_json else None
+    
     # 执行部署
-    success = deploy_skills(args.skills_dir, args.deployed_dir, args.skill)
+    success = deploy_skills(args.skills_dir, args.deployed_dir, args.skill, not args.no_cache,
+                            args.jobs, args.parse_processes, args.force, args.dry_run, args.dedup,
+                            not args.no_catalog, args.async_io, args.staged, args.keep_releases)
+    
+    if tracer:
+        disable_tracing()
+        report_trace(tracer, args.trace, args.trace_json)
     
     if success:
         logger.info("技能部署完成")
-        sys.exit(0)
     else:
         logger.error("技能部署失败")
-        sys.exit(1)
+    
+    # 监视模式：初始部署后只重新部署发生变更的技能
+    if args.watch and not args.dry_run:
+        watch_skills(args.skills_dir, args.deployed_dir, not args.no_cache, args.force, args.dedup,
+                     not args.no_catalog, args.debounce, args.poll_interval, not args.polling,
+                     args.staged, args.keep_releases)
+    
+    sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
@@ -6,11 +6,32 @@
 """
 
 import os
-import yaml
+import sys
 import json
 from pathlib import Path
 from datetime import datetime
 
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from skill_discovery import discover_skill_dirs
+from skill_frontmatter import parse_frontmatter, read_frontmatter
+from skill_record import SkillRecord
+
+# 文档中元数据字段的默认值
+METADATA_DEFAULTS = {
+    'description': '暂无描述',
+    'version': '1.0.0',
+    'author': '未知',
+    'category': '未分类',
+    'tags': []
+}
+
+
+def metadata_field(skill: SkillRecord, key: str):
+    """读取元数据字段，缺失时使用文档默认值"""
+    return skill.metadata.get(key, METADATA_DEFAULTS[key])
+
 
 def scan_skills_directory(base_dir: str) -> list:
     """
@@ -20,7 +41,7 @@ def scan_skills_directory(base_dir: str) -> list:
         base_dir: 基础目录路径
         
     Returns:
-        技能信息列表
+        技能记录列表
     """
     skills = []
     base_path = Path(base_dir)
@@ -28,34 +49,26 @@ def scan_skills_directory(base_dir: str) -> list:
     if not base_path.exists():
         return skills
     
-    # 扫描所有包含 SKILL.md 的文件夹
-    for item in base_path.rglob("SKILL.md"):
-        skill_dir = item.parent
+    # 扫描所有包含 SKILL.md 的文件夹（不限深度，支持嵌套技能）
+    for skill in discover_skill_dirs(base_dir, max_depth=None, nested=True):
+        item = Path(skill.skill_file)
+        skill_dir = Path(skill.path)
         
         try:
-            # 读取技能文件
-            content = item.read_text(encoding='utf-8')
-            
-            # 解析 YAML 头部
-            if content.startswith('---'):
-                parts = content.split('---', 2)
-                if len(parts) >= 3:
-                    yaml_content = parts[1].strip()
-                    metadata = yaml.safe_load(yaml_content) or {}
-                    
-                    # 提取技能信息
-                    skill_info = {
-                        'name': metadata.get('name', skill_dir.name),
-                        'description': metadata.get('description', '暂无描述'),
-                        'version': metadata.get('version', '1.0.0'),
-                        'author': metadata.get('author', '未知'),
-                        'category': metadata.get('category', '未分类'),
-                        'tags': metadata.get('tags', []),
-                        'path': str(skill_dir.relative_to(base_path)),
-                        'source': base_dir
-                    }
-                    
-                    skills.append(skill_info)
+            # 只读取 YAML 头部，不加载 Markdown 正文
+            frontmatter = read_frontmatter(item)
+            if frontmatter:
+                yaml_content = frontmatter[0].strip()
+                metadata = parse_frontmatter(yaml_content) or {}
+                
+                # 提取技能信息
+                skill_info = SkillRecord(
+                    metadata.get('name', skill_dir.name), metadata,
+                    path=str(skill_dir.relative_to(base_path)),
+                    source=base_dir
+                )
+                
+                skills.append(skill_info)
                     
         except Exception as e:
             print(f"解析技能文件失败 {item}: {e}")
@@ -71,7 +84,7 @@ def load_deployed_skills(deployed_dir: str) -> list:
         deployed_dir: 已部署技能目录
         
     Returns:
-        已部署技能信息列表
+        已部署技能记录列表
     """
     skills = []
     deployed_path = Path(deployed_dir)
@@ -88,18 +101,12 @@ def load_deployed_skills(deployed_dir: str) -> list:
                     with open(config_file, 'r', encoding='utf-8') as f:
                         config = json.load(f)
                     
-                    metadata = config.get('metadata', {})
-                    skill_info = {
-                        'name': config.get('skill_name', item.name),
-                        'description': metadata.get('description', '暂无描述'),
-                        'version': metadata.get('version', '1.0.0'),
-                        'author': metadata.get('author', '未知'),
-                        'category': metadata.get('category', '未分类'),
-                        'tags': metadata.get('tags', []),
-                        'path': str(item.relative_to(deployed_path)),
-                        'source': '已部署',
-                        'deployed_at': config.get('deployed_at')
-                    }
+                    skill_info = SkillRecord(
+                        config.get('skill_name', item.name), config.get('metadata', {}),
+                        path=str(item.relative_to(deployed_path)),
+                        source='已部署',
+                        deployed_at=config.get('deployed_at')
+                    )
                     
                     skills.append(skill_info)
                     
@@ -120,7 +127,7 @@ def generate_skill_document(skills: list, output_file: str):
     # 按分类分组
     categories = {}
     for skill in skills:
-        category = skill['category']
+        category = metadata_field(skill, 'category')
         if category not in categories:
             categories[category] = []
         categories[category].append(skill)
@@ -145,19 +152,20 @@ def generate_skill_document(skills: list, output_file: str):
         content += f"## {category} 类技能\n\n"
         content += f"**技能数量**: {len(category_skills)}\n\n"
         
-        for skill in sorted(category_skills, key=lambda x: x['name']):
-            content += f"### {skill['name']}\n\n"
-            content += f"**描述**: {skill['description']}  \n"
-            content += f"**版本**: {skill['version']}  \n"
-            content += f"**作者**: {skill['author']}  \n"
-            content += f"**来源**: {skill['source']}  \n"
-            content += f"**路径**: {skill['path']}  \n"
+        for skill in sorted(category_skills, key=lambda x: x.name):
+            content += f"### {skill.name}\n\n"
+            content += f"**描述**: {metadata_field(skill, 'description')}  \n"
+            content += f"**版本**: {metadata_field(skill, 'version')}  \n"
+            content += f"**作者**: {metadata_field(skill, 'author')}  \n"
+            content += f"**来源**: {skill.source}  \n"
+            content += f"**路径**: {skill.path}  \n"
             
-            if skill['tags']:
-                content += f"**标签**: {', '.join(skill['tags'])}  \n"
+            tags = metadata_field(skill, 'tags')
+            if tags:
+                content += f"**标签**: {', '.join(tags)}  \n"
             
-            if skill.get('deployed_at'):
-                content += f"**部署时间**: {skill['deployed_at']}  \n"
+            if skill.deployed_at:
+                content += f"**部署时间**: {skill.deployed_at}  \n"
             
             content += "\n---\n\n"
     
@@ -194,12 +202,12 @@ def main():
     # 去重（按名称）
     unique_skills = {}
     for skill in all_skills:
-        name = skill['name']
+        name = skill.name
         if name not in unique_skills:
             unique_skills[name] = skill
         else:
             # 优先保留已部署的技能
-            if skill['source'] == '已部署':
+            if skill.source == '已部署':
                 unique_skills[name] = skill
     
     unique_skills_list = list(unique_skills.values())
@@ -215,7 +223,7 @@ def main():
     # 按分类统计
     categories = {}
     for skill in unique_skills_list:
-        category = skill['category']
+        category = metadata_field(skill, 'category')
         if category not in categories:
             categories[category] = 0
         categories[category] += 1
@@ -6,8 +6,10 @@
 """
 
 import sys
+import json
 import argparse
 from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, TextIO
 from rich.console import Console
 from rich.table import Table
 from rich import box
@@ -16,12 +18,163 @@ from rich import box
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from skill_manager import SkillManager
-from skill_deployer import SkillDeployer
+from skill_deployer import SkillDeployer, STATUS_LEVELS
+from skill_cache import DEFAULT_CACHE_FILE
+from skill_catalog import DEFAULT_CATALOG_FILE
 
 console = Console()
 
 
-def list_skills(skills_dir: str, deployed_dir: str, show_details: bool = False):
+# 流式输出格式
+OUTPUT_FORMATS = ('table', 'json', 'jsonl')
+
+
+def iter_skill_rows(manager: SkillManager, deployed_index: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    单次遍历技能仓库，与已部署技能索引连接生成列表行
+
+    Args:
+        manager: 技能管理器
+        deployed_index: 已部署技能索引 {技能名称: 技能记录}
+
+    Yields:
+        列表行 {name, deployed, description, version, category, deployed_at, intact}
+    """
+    for skill_name in manager.discover_skills():
+        skill_info = manager.load_skill(skill_name, metadata_only=True)
+        if not skill_info:
+            continue
+
+        metadata = skill_info.metadata
+        deployed = deployed_index.get(skill_name)
+        yield {
+            'name': skill_name,
+            'deployed': deployed is not None,
+            'description': metadata.get('description', '暂无描述'),
+            'version': metadata.get('version', '1.0.0'),
+            'category': metadata.get('category', '未分类'),
+            'deployed_at': deployed.deployed_at if deployed is not None else None,
+            'intact': deployed.intact if deployed is not None else None
+        }
+
+
+def write_rows(rows: Iterable[Dict[str, Any]], output_format: str, stream: TextIO = sys.stdout) -> int:
+    """
+    逐行写出列表行，不在内存中累积
+
+    Args:
+        rows: 列表行
+        output_format: json（JSON 数组）或 jsonl（每行一个 JSON 对象）
+        stream: 输出流
+
+    Returns:
+        写出的行数
+    """
+    count = 0
+
+    if output_format == 'json':
+        stream.write('[')
+    for row in rows:
+        line = json.dumps(row, ensure_ascii=False, default=str)
+        if output_format == 'json':
+            stream.write(('\n  ' if count == 0 else ',\n  ') + line)
+        else:
+            stream.write(line + '\n')
+        count += 1
+    if output_format == 'json':
+        stream.write('\n]\n' if count else ']\n')
+
+    stream.flush()
+    return count
+
+
+def iter_catalog_rows(skills: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    将技能目录的查询结果转换为列表行
+
+    Args:
+        skills: SkillCatalog.query 的结果
+
+    Yields:
+        列表行 {name, deployed, description, version, category, deployed_at, author, tags}
+    """
+    for skill in skills:
+        yield {
+            'name': skill['name'],
+            'deployed': True,
+            'description': skill['description'] or '暂无描述',
+            'version': skill['version'] or '1.0.0',
+            'category': skill['category'],
+            'deployed_at': skill['deployed_at'],
+            'author': skill['author'],
+            'tags': skill['tags']
+        }
+
+
+def print_table(rows: Iterable[Dict[str, Any]], title: str = "技能列表") -> int:
+    """
+    以 Rich 表格输出列表行
+
+    Args:
+        rows: 列表行
+        title: 表格标题
+
+    Returns:
+        输出的行数
+    """
+    table = Table(title=title, box=box.ROUNDED, show_header=True, header_style="bold magenta")
+    
+    table.add_column("技能名称", style="cyan", width=30)
+    table.add_column("状态", justify="center", width=10)
+    table.add_column("描述", style="green", width=50)
+    table.add_column("版本", width=10)
+    table.add_column("分类", width=15)
+    
+    count = 0
+    for row in rows:
+        count += 1
+        table.add_row(
+            row['name'],
+            "✅ 已部署" if row['deployed'] else "⏳ 未部署",
+            row['description'][:45] + "...",
+            row['version'],
+            row['category']
+        )
+    
+    console.print(table)
+    return count
+
+
+def query_skills(deployed_dir: str, filters: Dict[str, Any], output_format: str = 'table',
+                 catalog_file: str = DEFAULT_CATALOG_FILE):
+    """
+    通过 SQLite 技能目录按条件查询已部署技能
+
+    Args:
+        deployed_dir: 已部署技能目录
+        filters: 查询条件 {category, tag, author, name_prefix, limit}
+        output_format: 输出格式（table / json / jsonl）
+        catalog_file: 技能目录文件路径
+    """
+    try:
+        deployer = SkillDeployer(deployed_dir, catalog_file=catalog_file)
+        catalog = deployer.sync_catalog()
+        rows = iter_catalog_rows(catalog.query(**filters))
+        
+        if output_format != 'table':
+            write_rows(rows, output_format)
+            return
+        
+        count = print_table(rows, title="已部署技能查询结果")
+        console.print(f"\n匹配的技能: {count}")
+        
+    except Exception as e:
+        console.print(f"[bold red]错误: {e}[/bold red]")
+        sys.exit(1)
+
+
+def list_skills(skills_dir: str, deployed_dir: str, show_details: bool = False,
+                use_cache: bool = True, output_format: str = 'table', check: str = 'quick'):
     """
     列出技能
     
@@ -29,50 +182,30 @@ def list_skills(skills_dir: str, deployed_dir: str, show_details: bool = False):
         skills_dir: 技能仓库目录
         deployed_dir: 已部署技能目录
         show_details: 是否显示详细信息
+        use_cache: 是否使用技能解析缓存
+        output_format: 输出格式（table / json / jsonl）
+        check: 已部署技能的状态检查级别（quick / stat / verify）
     """
     try:
         # 初始化管理器
-        manager = SkillManager(skills_dir, deployed_dir)
+        manager = SkillManager(skills_dir, deployed_dir, DEFAULT_CACHE_FILE if use_cache else None)
         deployer = SkillDeployer(deployed_dir)
         
-        # 发现技能仓库中的技能
-        available_skills = manager.discover_skills()
+        # 已部署技能按名称建立索引，部署状态查询为 O(1)
+        deployed_skills = deployer.list_deployed_skills(level=check)
+        deployed_index = {skill.name: skill for skill in deployed_skills}
         
-        # 获取已部署的技能
-        deployed_skills = deployer.list_deployed_skills()
+        rows = iter_skill_rows(manager, deployed_index)
         
-        # 创建表格
-        table = Table(title="技能列表", box=box.ROUNDED, show_header=True, header_style="bold magenta")
-        
-        table.add_column("技能名称", style="cyan", width=30)
-        table.add_column("状态", justify="center", width=10)
-        table.add_column("描述", style="green", width=50)
-        table.add_column("版本", width=10)
-        table.add_column("分类", width=15)
-        
-        # 处理技能仓库中的技能
-        for skill_name in available_skills:
-            skill_info = manager.load_skill(skill_name)
-            if skill_info:
-                metadata = skill_info.get('metadata', {})
-                
-                # 检查是否已部署
-                is_deployed = any(s.get('skill_name') == skill_name for s in deployed_skills)
-                status = "✅ 已部署" if is_deployed else "⏳ 未部署"
-                
-                table.add_row(
-                    skill_name,
-                    status,
-                    metadata.get('description', '暂无描述')[:45] + "...",
-                    metadata.get('version', '1.0.0'),
-                    metadata.get('category', '未分类')
-                )
+        if output_format != 'table':
+            write_rows(rows, output_format)
+            return
         
-        console.print(table)
+        available_count = print_table(rows)
         
         # 显示统计信息
         console.print(f"\n[bold]统计信息:[/bold]")
-        console.print(f"技能仓库中的技能: {len(available_skills)}")
+        console.print(f"技能仓库中的技能: {available_count}")
         console.print(f"已部署的技能: {len(deployed_skills)}")
         
         # 显示详细信息（如果启用）
@@ -80,9 +213,9 @@ def list_skills(skills_dir: str, deployed_dir: str, show_details: bool = False):
             console.print(f"\n[bold]已部署技能详细信息:[/bold]")
             
             for skill in deployed_skills:
-                metadata = skill.get('metadata', {})
+                metadata = skill.metadata
                 
-                detail_table = Table(title=f"技能: {skill.get('skill_name')}", 
+                detail_table = Table(title=f"技能: {skill.name}", 
                                    box=box.SIMPLE, show_header=False)
                 detail_table.add_column("属性", style="bold cyan")
                 detail_table.add_column("值", style="white")
@@ -90,8 +223,10 @@ def list_skills(skills_dir: str, deployed_dir: str, show_details: bool = False):
                 detail_table.add_row("描述", metadata.get('description', '暂无'))
                 detail_table.add_row("版本", metadata.get('version', '1.0.0'))
                 detail_table.add_row("作者", metadata.get('author', '未知'))
-                detail_table.add_row("部署时间", skill.get('deployed_at', '未知'))
-                detail_table.add_row("文件数量", str(len(skill.get('files_exist', {}))))
+                detail_table.add_row("部署时间", skill.deployed_at or '未知')
+                detail_table.add_row("文件数量", str(len(skill.files_exist or {})))
+                if skill.intact is not None:
+                    detail_table.add_row("完整性", "✅ 完整" if skill.intact else "❌ 文件缺失或已修改")
                 
                 console.print(detail_table)
                 console.print()
@@ -106,16 +241,17 @@ def list_skills(skills_dir: str, deployed_dir: str, show_details: bool = False):
         sys.exit(1)
 
 
-def show_skill_index(deployed_dir: str):
+def show_skill_index(deployed_dir: str, rebuild: bool = False):
     """
     显示技能索引信息
     
     Args:
         deployed_dir: 已部署技能目录
+        rebuild: 是否完整重建索引
     """
     try:
         deployer = SkillDeployer(deployed_dir)
-        index = deployer.generate_skill_index()
+        index = deployer.generate_skill_index(rebuild=rebuild)
         
         if not index:
             console.print("[yellow]暂无技能索引信息[/yellow]")
@@ -143,13 +279,37 @@ def main():
     parser.add_argument('--deployed-dir', default='deployed_skills', help='已部署技能目录')
     parser.add_argument('--details', action='store_true', help='显示详细信息')
     parser.add_argument('--index', action='store_true', help='显示技能索引信息')
+    parser.add_argument('--rebuild-index', action='store_true', help='完整重建技能索引（与 --index 一起使用）')
+    parser.add_argument('--no-cache', action='store_true', help='禁用技能解析缓存')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='table',
+                        help='输出格式：table（Rich 表格）、json、jsonl（流式输出，适合管道）')
+    parser.add_argument('--json', action='store_const', const='json', dest='format',
+                        help='等同于 --format json')
+    parser.add_argument('--category', help='按分类查询已部署技能（使用 SQLite 技能目录）')
+    parser.add_argument('--tag', help='按标签查询已部署技能')
+    parser.add_argument('--author', help='按作者查询已部署技能')
+    parser.add_argument('--name-prefix', help='按名称前缀查询已部署技能')
+    parser.add_argument('--limit', type=int, help='最多返回的技能数量')
+    parser.add_argument('--check', choices=STATUS_LEVELS, default='quick',
+                        help='已部署技能的检查级别：quick（只读清单）、stat（比较大小与 mtime）、verify（校验哈希）')
     
     args = parser.parse_args()
     
+    filters = {
+        'category': args.category,
+        'tag': args.tag,
+        'author': args.author,
+        'name_prefix': args.name_prefix,
+        'limit': args.limit
+    }
+    
     if args.index:
-        show_skill_index(args.deployed_dir)
+        show_skill_index(args.deployed_dir, args.rebuild_index)
+    elif any(value is not None for value in filters.values()):
+        query_skills(args.deployed_dir, filters, args.format)
     else:
-        list_skills(args.skills_dir, args.deployed_dir, args.details)
+        list_skills(args.skills_dir, args.deployed_dir, args.details, not args.no_cache, args.format,
+                    args.check)
 
 
 if __name__ == "__main__":
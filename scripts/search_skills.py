@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+技能搜索脚本
+
+通过 SQLite FTS5 全文索引搜索已部署技能的描述、章节、正文和命令
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from rich import box
+from rich.markup import escape
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from skill_deployer import SkillDeployer
+from skill_catalog import DEFAULT_CATALOG_FILE
+
+console = Console()
+
+
+def search_skills(query: str, deployed_dir: str, limit: int = 10, phrase: bool = False,
+                  output_format: str = 'table', rebuild: bool = False,
+                  catalog_file: str = DEFAULT_CATALOG_FILE):
+    """
+    搜索技能
+
+    Args:
+        query: 查询文本
+        deployed_dir: 已部署技能目录
+        limit: 最多返回的数量
+        phrase: 是否整体作为短语匹配
+        output_format: 输出格式（table / json / jsonl）
+        rebuild: 是否先完整重建索引
+        catalog_file: 技能目录文件路径
+    """
+    try:
+        deployer = SkillDeployer(deployed_dir, catalog_file=catalog_file)
+        catalog = deployer.sync_catalog(rebuild=rebuild)
+        results = catalog.search(query, limit=limit, phrase=phrase)
+
+        if output_format == 'json':
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+            return
+        if output_format == 'jsonl':
+            for result in results:
+                print(json.dumps(result, ensure_ascii=False))
+            return
+
+        if not results:
+            console.print(f"[yellow]没有找到匹配的技能: {query}[/yellow]")
+            return
+
+        table = Table(title=f"搜索结果: {query}", box=box.ROUNDED, show_header=True, header_style="bold magenta")
+        table.add_column("技能名称", style="cyan", width=25)
+        table.add_column("分类", width=15)
+        table.add_column("相关度", justify="right", width=8)
+        table.add_column("匹配内容", style="green")
+
+        for result in results:
+            table.add_row(
+                escape(result['name']),
+                escape(result['category']),
+                f"{-result['score']:.2f}",
+                escape(result['snippet'] or result['description'] or '')
+            )
+
+        console.print(table)
+
+    except Exception as e:
+        console.print(f"[bold red]错误: {e}[/bold red]")
+        sys.exit(1)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='全文搜索已部署的技能')
+    parser.add_argument('query', help='查询文本（支持 FTS5 语法，如 "tracked changes"、pdf OR docx、form*）')
+    parser.add_argument('--deployed-dir', default='deployed_skills', help='已部署技能目录')
+    parser.add_argument('--limit', type=int, default=10, help='最多返回的技能数量')
+    parser.add_argument('--phrase', action='store_true', help='将整个查询文本作为短语匹配')
+    parser.add_argument('--format', choices=('table', 'json', 'jsonl'), default='table', help='输出格式')
+    parser.add_argument('--rebuild', action='store_true', help='搜索前完整重建索引')
+
+    args = parser.parse_args()
+
+    search_skills(args.query, args.deployed_dir, args.limit, args.phrase, args.format, args.rebuild)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+技能验证脚本
+
+批量验证技能仓库中所有 SKILL.md 的格式与结构，适用于 CI
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from rich.console import Console
+
+# 添加 src 目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from skill_loader import SkillLoader
+from skill_discovery import discover_skill_dirs
+
+console = Console()
+
+
+def validate_skills(skills_dir: str, workers: int = None, chunk_size: int = None,
+                    output_json: bool = False) -> bool:
+    """
+    验证技能仓库中的全部技能
+
+    Args:
+        skills_dir: 技能仓库目录
+        workers: 进程数（默认 CPU 数）
+        chunk_size: 每次提交给工作进程的文件数
+        output_json: 是否以 JSON 输出汇总结果
+
+    Returns:
+        全部技能是否通过验证
+    """
+    loader = SkillLoader()
+    skill_files = [skill.skill_file for skill in discover_skill_dirs(skills_dir, max_depth=None, nested=True)]
+
+    results = loader.validate_many(skill_files, workers=workers, chunk_size=chunk_size)
+    summary = loader.summarize_validation(results)
+
+    if output_json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        return summary['invalid'] == 0
+
+    for failure in summary['failures']:
+        console.print(f"[bold red]✗ {failure['path']}[/bold red]")
+        for error_type, messages in failure['errors'].items():
+            for message in messages:
+                console.print(f"    [{error_type}] {message}", markup=False)
+
+    console.print(f"\n[bold]验证完成:[/bold] 共 {summary['total']} 个技能，"
+                  f"通过 {summary['valid']}，失败 {summary['invalid']}")
+    if summary['invalid']:
+        counts = ", ".join(f"{error_type}: {count}" for error_type, count in summary['error_counts'].items() if count)
+        console.print(f"错误统计: {counts}")
+
+    return summary['invalid'] == 0
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='批量验证技能仓库中的技能')
+    parser.add_argument('--skills-dir', default='skills', help='技能仓库目录')
+    parser.add_argument('--workers', '-j', type=int, help='验证进程数（默认 CPU 数，1 表示单进程）')
+    parser.add_argument('--chunk-size', type=int, help='每次提交给工作进程的文件数')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出汇总结果')
+
+    args = parser.parse_args()
+
+    if not Path(args.skills_dir).exists():
+        console.print(f"[bold red]技能仓库目录不存在: {args.skills_dir}[/bold red]")
+        sys.exit(1)
+
+    success = validate_skills(args.skills_dir, args.workers, args.chunk_size, args.json)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
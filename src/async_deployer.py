@@ -0,0 +1,276 @@
+"""
+异步部署器 - 基于 asyncio 的流水线部署
+
+部署按 发现 → 解析 → 复制 → 写入配置 → 更新索引 分为多个阶段，阶段之间通过有界队列连接
+（下游繁忙时上游自动暂停），阻塞的文件操作在有界线程池中执行。部署目录位于 NFS 等高延迟
+文件系统时，多个技能的 I/O 等待可以相互重叠；取消部署任务会停止所有阶段并丢弃尚未开始的操作
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Set
+from pathlib import Path
+
+try:
+    from .skill_record import SkillRecord
+    from .instrumentation import span
+except ImportError:
+    from skill_record import SkillRecord
+    from instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+# 阶段队列的结束标记
+_DONE = object()
+
+
+class AsyncSkillDeployer:
+    """异步技能部署器类"""
+
+    def __init__(self, manager, deployer, workers: int = 4, queue_size: Optional[int] = None,
+                 force: bool = False):
+        """
+        初始化异步部署器
+
+        Args:
+            manager: 技能管理器（SkillManager），负责发现与加载技能
+            deployer: 技能部署器（SkillDeployer）
+            workers: 执行阻塞文件操作的线程数，同时也是解析/复制/写入阶段的并发数
+            queue_size: 阶段之间队列的容量（默认为 workers 的两倍），队列满时上游阶段等待
+            force: 是否强制完整重建
+        """
+        self.manager = manager
+        self.deployer = deployer
+        self.workers = max(1, workers)
+        self.queue_size = queue_size if queue_size and queue_size > 0 else self.workers * 2
+        self.force = force
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Future] = set()
+        self._jobs: List[Dict[str, Any]] = []
+
+    def run(self, skill_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        同步执行部署（在新的事件循环中运行 deploy）
+
+        Args:
+            skill_names: 技能名称列表，为 None 时部署发现的所有技能
+
+        Returns:
+            部署结果列表，格式同 deploy
+        """
+        return asyncio.run(self.deploy(skill_names))
+
+    async def deploy(self, skill_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        异步部署一组技能
+
+        Args:
+            skill_names: 技能名称列表，为 None 时部署发现的所有技能
+
+        Returns:
+            部署结果列表（与输入顺序一致），每项包含 skill_name、success、
+            load_time、deploy_time、total_time、error
+        """
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="async-deploy")
+
+        try:
+            if skill_names is None:
+                skill_names = await self._run_blocking(self.manager.discover_skills)
+
+            jobs = [self._new_job(name) for name in skill_names]
+            self._jobs = jobs
+
+            parse_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+            copy_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+            write_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+            index_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+            stages = [
+                self._feed(jobs, parse_queue, self.workers),
+                self._run_stage(parse_queue, copy_queue, self._parse, self.workers, self.workers),
+                self._run_stage(copy_queue, write_queue, self._copy, self.workers, self.workers),
+                self._run_stage(write_queue, index_queue, self._write, self.workers, 1),
+                # 索引更新需要串行执行（SkillDeployer 内部也持有索引锁）
+                self._run_stage(index_queue, None, self._index, 1, 0),
+            ]
+            tasks = [asyncio.ensure_future(stage) for stage in stages]
+
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # 取消或异常：停止所有阶段
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+            return [job['result'] for job in jobs]
+
+        finally:
+            # 丢弃尚未开始的阻塞操作；已在执行的操作无法中断，会在后台完成，
+            # 完成后再释放被取消任务持有的技能锁
+            executor, self._executor = self._executor, None
+            locks = [job['lock'] for job in self._jobs if job['lock'] is not None]
+            self._jobs = []
+            # 逐个取消尚未开始的操作（shutdown 的 cancel_futures 参数需要 Python 3.9+）
+            for future in list(self._pending):
+                future.cancel()
+            self._pending.clear()
+            executor.shutdown(wait=False)
+            if locks:
+                threading.Thread(target=self._release_after, args=(executor, locks), daemon=True).start()
+
+    @staticmethod
+    def _release_after(executor: ThreadPoolExecutor, locks: list):
+        """等待线程池中的操作结束后释放技能锁"""
+        executor.shutdown(wait=True)
+        for lock in locks:
+            lock.release()
+
+    @staticmethod
+    def _new_job(skill_name: str) -> Dict[str, Any]:
+        """创建单个技能的部署任务状态"""
+        return {
+            'skill_name': skill_name,
+            'skill_info': None,
+            'deploy_path': None,
+            'manifest': None,
+            'config': None,
+            'start': None,
+            'deploy_start': None,
+            'lock': None,
+            'result': {
+                'skill_name': skill_name,
+                'success': False,
+                'load_time': 0.0,
+                'deploy_time': 0.0,
+                'total_time': 0.0,
+                'error': None
+            }
+        }
+
+    async def _run_blocking(self, func: Callable, *args):
+        """在线程池中执行阻塞操作（记录尚未完成的操作，以便取消部署时丢弃）"""
+        future = self._executor.submit(func, *args)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    async def _feed(jobs: List[Dict[str, Any]], outbox: asyncio.Queue, consumers: int):
+        """
+        向第一个阶段提交任务
+
+        Args:
+            jobs: 部署任务列表
+            outbox: 解析阶段的输入队列
+            consumers: 解析阶段的并发数（用于发送结束标记）
+        """
+        for job in jobs:
+            await outbox.put(job)
+        for _ in range(consumers):
+            await outbox.put(_DONE)
+
+    async def _run_stage(self, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue],
+                         handler: Callable, concurrency: int, consumers: int):
+        """
+        运行一个流水线阶段
+
+        每个任务由 handler 处理，成功后放入下游队列；失败的任务记录错误后不再传递
+
+        Args:
+            inbox: 输入队列
+            outbox: 输出队列（最后一个阶段为 None）
+            handler: 处理单个任务的协程函数
+            concurrency: 本阶段的并发数
+            consumers: 下游阶段的并发数（用于发送结束标记）
+        """
+        async def worker():
+            while True:
+                job = await inbox.get()
+                if job is _DONE:
+                    return
+
+                try:
+                    await handler(job)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._fail(job, str(e))
+                    logger.error(f"异步部署技能失败 {job['skill_name']}: {e}")
+                    continue
+
+                if job['result']['error'] is not None:
+                    self._finish(job)
+                elif outbox is not None:
+                    await outbox.put(job)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        if outbox is not None:
+            for _ in range(consumers):
+                await outbox.put(_DONE)
+
+    async def _parse(self, job: Dict[str, Any]):
+        """解析阶段：加载技能"""
+        job['start'] = time.perf_counter()
+        skill_info = await self._run_blocking(self.manager.load_skill, job['skill_name'])
+        job['result']['load_time'] = time.perf_counter() - job['start']
+
+        if not skill_info:
+            job['result']['error'] = "无法加载技能"
+            return
+
+        job['skill_info'] = skill_info
+
+    async def _copy(self, job: Dict[str, Any]):
+        """复制阶段：获取技能锁（持有到索引更新完成）后增量或完整复制技能文件"""
+        job['deploy_start'] = time.perf_counter()
+        job['lock'] = self.deployer.skill_lock(job['skill_info']['name'])
+        await self._run_blocking(job['lock'].acquire)
+        skill_path = Path(self.manager.skills_dir) / job['skill_name']
+        job['deploy_path'], job['manifest'] = await self._run_blocking(
+            self.deployer._deploy_files, skill_path, job['skill_info']['name'], self.force)
+
+    async def _write(self, job: Dict[str, Any]):
+        """写入阶段：生成部署配置与使用说明"""
+        job['config'] = await self._run_blocking(
+            self.deployer._write_deployment, job['deploy_path'], job['skill_info'], job['manifest'])
+
+    async def _index(self, job: Dict[str, Any]):
+        """索引阶段：增量更新技能索引与技能目录"""
+        skill_name = job['skill_info']['name']
+        record = SkillRecord.from_deployment_config(
+            job['config'], deploy_path=str(self.deployer.deployed_dir / skill_name))
+
+        def update():
+            with span('index_update', skill=skill_name):
+                self.deployer._update_index(skill_name, record)
+
+        await self._run_blocking(update)
+
+        job['result']['success'] = True
+        self._finish(job)
+        logger.info(f"技能部署成功: {skill_name}")
+
+    def _fail(self, job: Dict[str, Any], error: str):
+        """记录任务失败"""
+        job['result']['error'] = error
+        self._finish(job)
+
+    @staticmethod
+    def _finish(job: Dict[str, Any]):
+        """释放技能锁并记录任务耗时"""
+        if job['lock'] is not None:
+            job['lock'].release()
+            job['lock'] = None
+
+        now = time.perf_counter()
+        result = job['result']
+        if job['start'] is not None:
+            result['total_time'] = now - job['start']
+        if job['deploy_start'] is not None:
+            result['deploy_time'] = now - job['deploy_start']
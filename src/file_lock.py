@@ -0,0 +1,120 @@
+"""
+文件锁 - 跨进程的建议性锁
+
+基于 fcntl.flock（Windows 上退回到 msvcrt.locking，仅支持独占锁）。锁与打开的文件描述符
+绑定，进程退出时由操作系统自动释放，不会留下失效的锁；锁文件本身在释放后保留
+"""
+
+import os
+import time
+import logging
+from typing import Optional
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+
+class LockTimeout(TimeoutError):
+    """在超时时间内未能获得锁"""
+
+
+class FileLock:
+    """文件锁类"""
+
+    def __init__(self, path: str, shared: bool = False, timeout: Optional[float] = None,
+                 poll_interval: float = 0.05):
+        """
+        初始化文件锁（不立即加锁）
+
+        Args:
+            path: 锁文件路径（父目录不存在时自动创建）
+            shared: 是否为共享锁（多个持有者可同时持有，与独占锁互斥）
+            timeout: 等待锁的超时时间（秒），None 表示一直等待
+            poll_interval: 设置超时时重试加锁的间隔（秒）
+        """
+        self.path = Path(path)
+        self.shared = shared and fcntl is not None
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+
+    @property
+    def locked(self) -> bool:
+        """当前是否持有锁"""
+        return self._fd is not None
+
+    def acquire(self) -> 'FileLock':
+        """
+        获取锁
+
+        Returns:
+            文件锁本身
+
+        Raises:
+            LockTimeout: 超时仍未获得锁
+        """
+        if self._fd is not None:
+            raise RuntimeError(f"文件锁已被持有: {self.path}")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+
+        try:
+            if self.timeout is None and fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+            else:
+                self._acquire_polling(fd)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self._fd = fd
+        return self
+
+    def _acquire_polling(self, fd: int):
+        """非阻塞方式重试加锁，直到成功或超时"""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, (fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise LockTimeout(f"等待文件锁超时: {self.path}")
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        """释放锁（未持有时不做任何事）"""
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def __enter__(self) -> 'FileLock':
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+        return False
@@ -0,0 +1,330 @@
+"""
+文件传输 - 部署路径共用的文件复制原语
+
+按 reflink（FICLONE）→ copy_file_range → sendfile → 分块读写 的顺序选择平台支持的方式，
+数据尽量在内核中复制而不经过 Python 内存；分块读写只使用固定大小的缓冲区，
+内存占用与文件大小无关。复制的文件数、字节数与耗时累计在 TransferStats 中供调用方查看
+
+目标文件总是先写入同目录下的临时文件再原子替换，已存在的目标（可能是对象存储或其他版本的
+硬链接）不会被原地修改，读取方也不会看到写了一半的文件
+"""
+
+import os
+import time
+import errno
+import shutil
+import logging
+import tempfile
+import threading
+from typing import Dict, Any, Optional
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Linux FICLONE ioctl（btrfs/xfs 等支持 reflink 的文件系统）
+FICLONE = 0x40049409
+
+# 分块读写的缓冲区大小
+CHUNK_SIZE = 1024 * 1024
+
+# 复制方式（按优先级）
+TRANSFER_METHODS = ('reflink', 'copy_file_range', 'sendfile', 'chunked')
+
+# 表示平台或文件系统根本不支持该方式的错误码，出现后不再尝试
+_UNSUPPORTED_ERRNOS = {errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTTY}
+
+# 进程的 umask（不复制元数据时，新文件权限与普通创建的文件一致）
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# 当前进程中确认不可用的复制方式
+_unavailable = set()
+if fcntl is None:
+    _unavailable.add('reflink')
+if not hasattr(os, 'copy_file_range'):
+    _unavailable.add('copy_file_range')
+if not hasattr(os, 'sendfile'):
+    _unavailable.add('sendfile')
+
+
+class TransferStats:
+    """文件传输统计类（线程安全）"""
+
+    def __init__(self):
+        """初始化统计"""
+        self.files = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.methods: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, nbytes: int, seconds: float, method: str):
+        """
+        记录一次文件复制
+
+        Args:
+            nbytes: 复制的字节数
+            seconds: 耗时（秒）
+            method: 使用的复制方式
+        """
+        with self._lock:
+            self.files += 1
+            self.bytes += nbytes
+            self.seconds += seconds
+            self.methods[method] = self.methods.get(method, 0) + 1
+
+    @property
+    def throughput(self) -> float:
+        """平均吞吐量（字节/秒，按复制耗时累计计算）"""
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+    def reset(self):
+        """清空统计"""
+        with self._lock:
+            self.files = 0
+            self.bytes = 0
+            self.seconds = 0.0
+            self.methods = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        导出统计
+
+        Returns:
+            {files, bytes, seconds, throughput, methods}
+        """
+        with self._lock:
+            return {
+                'files': self.files,
+                'bytes': self.bytes,
+                'seconds': self.seconds,
+                'throughput': self.bytes / self.seconds if self.seconds > 0 else 0.0,
+                'methods': dict(self.methods)
+            }
+
+
+def _temp_file(dst: Path):
+    """在目标文件所在目录创建临时文件，返回 (文件对象, 临时文件路径)"""
+    fd, tmp_name = tempfile.mkstemp(dir=str(Path(dst).parent), prefix=f".{Path(dst).name}.")
+    return os.fdopen(fd, 'wb'), tmp_name
+
+
+def _discard(tmp_name: str):
+    """删除未完成的临时文件"""
+    try:
+        os.unlink(tmp_name)
+    except FileNotFoundError:
+        pass
+
+
+def reflink(src: Path, dst: Path):
+    """
+    通过 FICLONE 创建写时复制的副本（不复制元数据；写入临时文件后原子替换 dst）
+
+    Raises:
+        OSError: 平台或文件系统不支持 reflink
+    """
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink 不受支持")
+
+    fdst, tmp_name = _temp_file(dst)
+    try:
+        with open(src, 'rb') as fsrc, fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        os.chmod(tmp_name, 0o666 & ~_UMASK)
+        os.replace(tmp_name, dst)
+    except BaseException:
+        _discard(tmp_name)
+        raise
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> int:
+    """通过 copy_file_range 复制（数据不经过用户空间）"""
+    copied = 0
+    while True:
+        n = os.copy_file_range(src_fd, dst_fd, max(size - copied, CHUNK_SIZE))
+        if n == 0:
+            return copied
+        copied += n
+
+
+def _sendfile(src_fd: int, dst_fd: int, size: int) -> int:
+    """通过 sendfile 复制（目标为普通文件需要 Linux 2.6.33+）"""
+    copied = 0
+    while True:
+        n = os.sendfile(dst_fd, src_fd, copied, max(size - copied, CHUNK_SIZE))
+        if n == 0:
+            return copied
+        copied += n
+
+
+def _chunked(src_fd: int, dst_fd: int, chunk_size: int) -> int:
+    """使用固定大小的缓冲区分块复制"""
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    copied = 0
+    with open(src_fd, 'rb', buffering=0, closefd=False) as fsrc, \
+            open(dst_fd, 'wb', buffering=0, closefd=False) as fdst:
+        while True:
+            n = fsrc.readinto(buffer)
+            if not n:
+                return copied
+            written = 0
+            while written < n:
+                written += fdst.write(view[written:n])
+            copied += n
+
+
+def copy_file(src: Path, dst: Path, stats: Optional[TransferStats] = None,
+              use_reflink: bool = True, preserve_metadata: bool = True,
+              chunk_size: int = CHUNK_SIZE) -> str:
+    """
+    复制单个文件
+
+    目标文件已存在时被替换（写入临时文件后 os.replace，不修改原文件的 inode）；
+    内核复制方式在第一次调用即失败时退回到下一种方式，确认不受支持的方式在本进程中不再尝试
+
+    Args:
+        src: 源文件路径
+        dst: 目标文件路径（父目录需已存在）
+        stats: 传输统计（可选）
+        use_reflink: 是否优先尝试 reflink
+        preserve_metadata: 是否复制权限与时间戳（同 shutil.copy2）
+        chunk_size: 分块读写的缓冲区大小
+
+    Returns:
+        使用的复制方式（TRANSFER_METHODS 之一）
+    """
+    start = time.perf_counter()
+    size = os.stat(src).st_size
+    method = None
+
+    if use_reflink and 'reflink' not in _unavailable and size > 0:
+        try:
+            reflink(src, dst)
+            method = 'reflink'
+        except OSError as e:
+            _mark_unavailable('reflink', e)
+
+    if method is None:
+        fdst, tmp_name = _temp_file(dst)
+        try:
+            with open(src, 'rb') as fsrc, fdst:
+                src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+
+                for candidate, func in (('copy_file_range', _copy_file_range), ('sendfile', _sendfile)):
+                    if candidate in _unavailable or size == 0:
+                        continue
+                    try:
+                        func(src_fd, dst_fd, size)
+                        method = candidate
+                        break
+                    except OSError as e:
+                        # 已写入部分数据时无法安全地换用其他方式
+                        if os.lseek(dst_fd, 0, os.SEEK_END) > 0:
+                            raise
+                        _mark_unavailable(candidate, e)
+
+                if method is None:
+                    _chunked(src_fd, dst_fd, chunk_size)
+                    method = 'chunked'
+
+            # mkstemp 创建的文件权限为 0600
+            os.chmod(tmp_name, 0o666 & ~_UMASK)
+            if preserve_metadata:
+                shutil.copystat(src, tmp_name)
+            os.replace(tmp_name, dst)
+        except BaseException:
+            _discard(tmp_name)
+            raise
+    elif preserve_metadata:
+        shutil.copystat(src, dst)
+
+    if stats is not None:
+        stats.record(size, time.perf_counter() - start, method)
+
+    return method
+
+
+def append_file(src: Path, dst_fd: int, stats: Optional[TransferStats] = None,
+                chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    将文件内容追加到已打开文件的当前位置（用于打包等顺序写入场景）
+
+    Args:
+        src: 源文件路径
+        dst_fd: 目标文件描述符（写入后位置移动到末尾）
+        stats: 传输统计（可选）
+        chunk_size: 分块读写的缓冲区大小
+
+    Returns:
+        写入的字节数
+    """
+    start = time.perf_counter()
+    method = None
+
+    with open(src, 'rb') as fsrc:
+        src_fd = fsrc.fileno()
+        size = os.fstat(src_fd).st_size
+        dst_start = os.lseek(dst_fd, 0, os.SEEK_CUR)
+
+        for candidate, func in (('copy_file_range', _copy_file_range), ('sendfile', _sendfile)):
+            if candidate in _unavailable or size == 0:
+                continue
+            try:
+                copied = func(src_fd, dst_fd, size)
+                method = candidate
+                break
+            except OSError as e:
+                if os.lseek(dst_fd, 0, os.SEEK_CUR) != dst_start:
+                    raise
+                _mark_unavailable(candidate, e)
+
+        if method is None:
+            copied = _chunked(src_fd, dst_fd, chunk_size)
+            method = 'chunked'
+
+    if stats is not None:
+        stats.record(copied, time.perf_counter() - start, method)
+
+    return copied
+
+
+def copy_tree(src_dir: Path, dst_dir: Path, stats: Optional[TransferStats] = None, **options) -> int:
+    """
+    递归复制目录（已存在的目标目录会被合并，同名文件被覆盖）
+
+    Args:
+        src_dir: 源目录
+        dst_dir: 目标目录
+        stats: 传输统计（可选）
+        **options: 传给 copy_file 的选项
+
+    Returns:
+        复制的文件数量
+    """
+    count = 0
+    src_dir = Path(src_dir)
+    dst_dir = Path(dst_dir)
+
+    for root, _, filenames in os.walk(src_dir):
+        target_dir = dst_dir / Path(root).relative_to(src_dir)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for filename in filenames:
+            copy_file(Path(root) / filename, target_dir / filename, stats, **options)
+            count += 1
+
+    return count
+
+
+def _mark_unavailable(method: str, error: OSError):
+    """复制方式失败时，若错误表示根本不受支持则记录下来"""
+    if error.errno in _UNSUPPORTED_ERRNOS:
+        if method not in _unavailable:
+            logger.debug(f"文件复制方式不可用，改用后备方式: {method} ({error})")
+        _unavailable.add(method)
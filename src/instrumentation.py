@@ -0,0 +1,254 @@
+"""
+性能追踪 - 可选启用的分阶段耗时统计
+
+以上下文管理器记录各阶段（发现、加载、复制、配置、索引等）的耗时、复制字节数与文件数，
+可导出为 JSON 或 Chrome trace（chrome://tracing、Perfetto）格式；未启用时开销可以忽略
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """单个阶段的追踪记录"""
+
+    __slots__ = ('name', 'attrs', 'counters', 'start', 'end', 'thread_id')
+
+    enabled = True
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.counters: Dict[str, int] = {}
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.thread_id = threading.get_ident()
+
+    def add(self, **counters: int):
+        """累加计数（如 bytes=1024, files=1）"""
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    @property
+    def duration(self) -> float:
+        """耗时（秒）"""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class _NullSpan:
+    """未启用追踪时使用的空记录"""
+
+    __slots__ = ()
+
+    enabled = False
+
+    def add(self, **counters: int):
+        pass
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _SpanContext:
+    """记录一个阶段的上下文管理器"""
+
+    __slots__ = ('tracer', 'span')
+
+    def __init__(self, tracer: 'Tracer', name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.span = Span(name, attrs)
+
+    def __enter__(self) -> Span:
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.end = time.perf_counter()
+        if exc_type is not None:
+            self.span.attrs['error'] = exc_type.__name__
+        self.tracer._record(self.span)
+        return False
+
+
+class Tracer:
+    """追踪器类"""
+
+    def __init__(self):
+        """初始化追踪器"""
+        self.spans: List[Span] = []
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attrs: Any) -> _SpanContext:
+        """
+        记录一个阶段
+
+        Args:
+            name: 阶段名称
+            **attrs: 附加属性（如 skill='pdf'）
+
+        Returns:
+            上下文管理器，进入时返回 Span，可调用 span.add(bytes=..., files=...) 累加计数
+        """
+        return _SpanContext(self, name, attrs)
+
+    def _record(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        按阶段汇总
+
+        Returns:
+            {阶段名称: {count, total_ms, max_ms, 计数...}}
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+
+        with self._lock:
+            spans = list(self.spans)
+
+        for span in spans:
+            stage = stages.setdefault(span.name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            duration_ms = span.duration * 1000
+            stage['count'] += 1
+            stage['total_ms'] += duration_ms
+            stage['max_ms'] = max(stage['max_ms'], duration_ms)
+            for key, value in span.counters.items():
+                stage[key] = stage.get(key, 0) + value
+
+        return stages
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        导出为 JSON 可序列化的字典
+
+        Returns:
+            {spans: [{name, start_ms, duration_ms, thread_id, attrs, counters}], summary}
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+
+        return {
+            'spans': [
+                {
+                    'name': span.name,
+                    'start_ms': (span.start - self.origin) * 1000,
+                    'duration_ms': span.duration * 1000,
+                    'thread_id': span.thread_id,
+                    'attrs': span.attrs,
+                    'counters': span.counters
+                }
+                for span in spans
+            ],
+            'summary': self.summary()
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        导出为 Chrome trace 事件格式（完整事件 ph='X'，时间单位为微秒）
+
+        Returns:
+            {traceEvents: [...]}
+        """
+        pid = os.getpid()
+
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+
+        events = [
+            {
+                'name': span.name + (f" {span.attrs['skill']}" if 'skill' in span.attrs else ''),
+                'cat': span.name,
+                'ph': 'X',
+                'ts': (span.start - self.origin) * 1e6,
+                'dur': span.duration * 1e6,
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': dict(span.attrs, **span.counters)
+            }
+            for span in spans
+        ]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_json(self, path: str):
+        """
+        写入 JSON 报告
+
+        Args:
+            path: 输出文件路径
+        """
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False, default=str),
+                              encoding='utf-8')
+
+    def write_chrome_trace(self, path: str):
+        """
+        写入 Chrome trace 文件
+
+        Args:
+            path: 输出文件路径
+        """
+        Path(path).write_text(json.dumps(self.to_chrome_trace(), ensure_ascii=False, default=str),
+                              encoding='utf-8')
+
+
+# 当前启用的追踪器（None 表示未启用）
+_active_tracer: Optional[Tracer] = None
+
+
+def enable_tracing() -> Tracer:
+    """
+    启用追踪
+
+    Returns:
+        新的追踪器
+    """
+    global _active_tracer
+    _active_tracer = Tracer()
+    return _active_tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """
+    停用追踪
+
+    Returns:
+        停用前的追踪器（未启用时为 None）
+    """
+    global _active_tracer
+    tracer, _active_tracer = _active_tracer, None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """当前启用的追踪器（未启用时为 None）"""
+    return _active_tracer
+
+
+def span(name: str, **attrs: Any):
+    """
+    在当前追踪器中记录一个阶段；未启用追踪时返回空记录
+
+    Args:
+        name: 阶段名称
+        **attrs: 附加属性
+
+    Returns:
+        上下文管理器，进入时返回 Span（未启用时为空记录，add() 不做任何事）
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, **attrs)
@@ -0,0 +1,160 @@
+"""
+对象存储 - 按内容寻址的去重文件存储
+
+文件按 SHA-256 只保存一份，部署目录中的文件通过硬链接（不可用时依次退回到
+reflink 和普通复制）生成，减少重复资源的磁盘占用和部署时间
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+from typing import Optional
+from pathlib import Path
+
+try:
+    from .file_transfer import TransferStats, copy_file
+except ImportError:
+    from file_transfer import TransferStats, copy_file
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    计算文件的 SHA-256
+
+    Args:
+        file_path: 文件路径
+        chunk_size: 分块读取大小
+
+    Returns:
+        十六进制摘要
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ObjectStore:
+    """按内容寻址的对象存储类"""
+
+    def __init__(self, root: Path, transfer_stats: Optional[TransferStats] = None):
+        """
+        初始化对象存储
+
+        Args:
+            root: 存储根目录（如 deployed_dir/.objects）
+            transfer_stats: 文件传输统计（可选，与部署器共用）
+        """
+        self.root = Path(root)
+        self.transfer_stats = transfer_stats
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def object_path(self, digest: str) -> Path:
+        """
+        获取对象的存储路径
+
+        Args:
+            digest: SHA-256 十六进制摘要
+
+        Returns:
+            对象文件路径（root/ab/cdef...）
+        """
+        return self.root / digest[:2] / digest[2:]
+
+    def put(self, src: Path, digest: Optional[str] = None) -> str:
+        """
+        将文件存入对象存储（已存在则跳过）
+
+        Args:
+            src: 源文件路径
+            digest: 已知的 SHA-256（可选，省去重复计算）
+
+        Returns:
+            对象的 SHA-256 摘要
+        """
+        if digest is None:
+            digest = file_sha256(src)
+
+        target = self.object_path(digest)
+        if target.exists():
+            return digest
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        # 先写入临时文件再原子重命名，避免并发写入产生不完整对象
+        fd, tmp_name = tempfile.mkstemp(dir=str(target.parent), prefix=".tmp-")
+        os.close(fd)
+        try:
+            copy_file(src, Path(tmp_name), self.transfer_stats)
+            os.replace(tmp_name, target)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        return digest
+
+    def materialize(self, digest: str, dst: Path) -> str:
+        """
+        在目标位置生成对象的副本
+
+        依次尝试硬链接、reflink 和普通复制
+
+        Args:
+            digest: 对象摘要
+            dst: 目标文件路径
+
+        Returns:
+            使用的方式：'hardlink'、'reflink' 或 'copy'
+        """
+        src = self.object_path(digest)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if dst.exists() or dst.is_symlink():
+            dst.unlink()
+
+        try:
+            os.link(src, dst)
+            return 'hardlink'
+        except OSError:
+            pass
+
+        method = copy_file(src, dst, self.transfer_stats)
+        return 'reflink' if method == 'reflink' else 'copy'
+
+    def verify(self, digest: str) -> bool:
+        """
+        校验对象内容是否与摘要一致
+
+        Args:
+            digest: 对象摘要
+
+        Returns:
+            对象存在且内容完整时返回 True
+        """
+        target = self.object_path(digest)
+        return target.exists() and file_sha256(target) == digest
+
+    def gc(self) -> int:
+        """
+        删除不再被任何部署硬链接引用的对象
+
+        Returns:
+            删除的对象数量
+        """
+        removed = 0
+
+        for prefix_dir in self.root.iterdir():
+            if not prefix_dir.is_dir():
+                continue
+            for entry in os.scandir(prefix_dir):
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_nlink <= 1:
+                    os.unlink(entry.path)
+                    removed += 1
+
+        if removed:
+            logger.info(f"对象存储清理完成，删除 {removed} 个未引用对象")
+        return removed
@@ -0,0 +1,147 @@
+"""
+并行部署器 - 使用线程池/进程池并行部署多个技能
+
+文件复制等 I/O 操作在线程池中执行，可选的进程池负责 YAML 解析等 CPU 密集工作，
+结果按输入顺序返回并附带每个技能的耗时明细
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+from typing import Dict, List, Any, Optional
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 进程池中每个工作进程各自持有的技能管理器
+_worker_manager = None
+
+
+def _init_parse_worker(skills_dir: str, deployed_dir: str):
+    """进程池初始化：在工作进程中创建技能管理器"""
+    global _worker_manager
+
+    try:
+        from .skill_manager import SkillManager
+    except ImportError:
+        from skill_manager import SkillManager
+
+    _worker_manager = SkillManager(skills_dir, deployed_dir)
+
+
+def _parse_in_worker(skill_name: str) -> Optional[Dict[str, Any]]:
+    """在工作进程中加载技能"""
+    return _worker_manager.load_skill(skill_name)
+
+
+class ParallelDeployer:
+    """并行部署器类"""
+
+    def __init__(self, manager, deployer=None, jobs: int = 1, parse_processes: int = 0,
+                 force: bool = False):
+        """
+        初始化并行部署器
+
+        Args:
+            manager: 技能管理器（SkillManager），负责发现与加载技能
+            deployer: 技能部署器（SkillDeployer），为 None 时使用 manager.deploy_skill 部署
+            jobs: 部署线程数
+            parse_processes: 解析进程数（0 表示在部署线程中解析）
+            force: 是否强制完整重建（仅对 SkillDeployer 生效）
+        """
+        self.manager = manager
+        self.deployer = deployer
+        self.jobs = max(1, jobs)
+        self.parse_processes = max(0, parse_processes)
+        self.force = force
+
+    def deploy(self, skill_names: List[str]) -> List[Dict[str, Any]]:
+        """
+        部署一组技能
+
+        Args:
+            skill_names: 技能名称列表
+
+        Returns:
+            部署结果列表（与输入顺序一致），每项包含 skill_name、success、
+            load_time、deploy_time、total_time、error
+        """
+        parse_pool = None
+        parse_futures: Dict[str, Future] = {}
+
+        if self.parse_processes > 0 and len(skill_names) > 1:
+            parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_processes,
+                initializer=_init_parse_worker,
+                initargs=(str(self.manager.skills_dir), str(self.manager.deployed_dir))
+            )
+            for skill_name in skill_names:
+                parse_futures[skill_name] = parse_pool.submit(_parse_in_worker, skill_name)
+
+        try:
+            if self.jobs == 1 or len(skill_names) <= 1:
+                results = [self._deploy_one(name, parse_futures.get(name)) for name in skill_names]
+            else:
+                with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="deploy") as pool:
+                    futures = [pool.submit(self._deploy_one, name, parse_futures.get(name))
+                               for name in skill_names]
+                    results = [future.result() for future in futures]
+        finally:
+            if parse_pool:
+                parse_pool.shutdown()
+
+        return results
+
+    def _deploy_one(self, skill_name: str, parse_future: Optional[Future] = None) -> Dict[str, Any]:
+        """
+        加载并部署单个技能
+
+        Args:
+            skill_name: 技能名称
+            parse_future: 进程池中的解析任务（可选）
+
+        Returns:
+            单个技能的部署结果
+        """
+        result = {
+            'skill_name': skill_name,
+            'success': False,
+            'load_time': 0.0,
+            'deploy_time': 0.0,
+            'total_time': 0.0,
+            'error': None
+        }
+        start = time.perf_counter()
+
+        try:
+            # 加载技能
+            if parse_future is not None:
+                skill_info = parse_future.result()
+            else:
+                skill_info = self.manager.load_skill(skill_name)
+            loaded = time.perf_counter()
+            result['load_time'] = loaded - start
+
+            if not skill_info:
+                result['error'] = "无法加载技能"
+                return result
+
+            # 部署技能
+            if self.deployer is not None:
+                success = self.deployer.deploy_skill(Path(self.manager.skills_dir) / skill_name, skill_info,
+                                                     force=self.force)
+            else:
+                success = self.manager.deploy_skill(skill_name, skill_info)
+            result['deploy_time'] = time.perf_counter() - loaded
+            result['success'] = success
+            if not success:
+                result['error'] = "部署失败"
+
+        except Exception as e:
+            logger.error(f"并行部署技能失败 {skill_name}: {e}")
+            result['error'] = str(e)
+
+        finally:
+            result['total_time'] = time.perf_counter() - start
+
+        return result
@@ -0,0 +1,352 @@
+"""
+技能包 - 单文件技能打包格式
+
+多个已部署技能打包为一个文件：固定长度的文件头记录目录（TOC）的位置，数据区依次存放
+各文件内容，目录（JSON）记录每个技能的部署配置与每个文件的偏移、大小和 SHA-256。
+读取方通过 mmap 打开，只解析目录即可按需读取 SKILL.md、元数据或单个资源，无需解包
+
+文件布局：
+    [文件头 32 字节: magic(8) version(4) flags(4) toc_offset(8) toc_size(8)]
+    [文件数据 ...]
+    [目录 JSON]
+"""
+
+import os
+import json
+import mmap
+import struct
+import hashlib
+import logging
+import tempfile
+from typing import Dict, List, Any, Optional, Iterator
+from pathlib import Path
+
+try:
+    from .file_transfer import TransferStats, append_file
+    from .object_store import file_sha256
+    from .skill_record import SkillRecord
+except ImportError:
+    from file_transfer import TransferStats, append_file
+    from object_store import file_sha256
+    from skill_record import SkillRecord
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_MAGIC = b"SKBUNDLE"
+BUNDLE_VERSION = 1
+
+# 文件头：magic、格式版本、标志位（保留）、目录偏移、目录长度（小端）
+_HEADER = struct.Struct('<8sIIQQ')
+
+
+class BundleError(ValueError):
+    """技能包格式错误"""
+
+
+def _is_safe_path(rel_path: Any) -> bool:
+    """是否为安全的相对路径（posix 分隔符，非绝对路径，不含空、. 或 .. 组成部分）"""
+    if not isinstance(rel_path, str) or not rel_path or '\\' in rel_path or '\0' in rel_path:
+        return False
+    if rel_path.startswith('/') or (len(rel_path) > 1 and rel_path[1] == ':'):
+        return False
+    return all(part not in ('', '.', '..') for part in rel_path.split('/'))
+
+
+class SkillBundleWriter:
+    """技能包写入器类"""
+
+    def __init__(self, path: str, stats: Optional[TransferStats] = None):
+        """
+        初始化写入器（先写入同目录下的临时文件，close() 时原子替换为目标文件）
+
+        Args:
+            path: 技能包文件路径
+            stats: 文件传输统计（可选）
+        """
+        self.path = Path(path)
+        self.stats = stats
+        self._skills: Dict[str, Dict[str, Any]] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_name = tempfile.mkstemp(dir=str(self.path.parent), prefix=f".{self.path.name}.")
+        self._file = os.fdopen(fd, 'wb')
+        self._file.write(b'\0' * _HEADER.size)
+        self._file.flush()
+
+    def add_skill(self, skill_name: str, files: Dict[str, Path], config: Optional[Dict[str, Any]] = None,
+                  digests: Optional[Dict[str, str]] = None):
+        """
+        添加一个技能
+
+        Args:
+            skill_name: 技能名称
+            files: {相对路径(posix): 源文件路径}
+            config: 部署配置（deployment.json 的内容，读取时用于生成技能记录）
+            digests: 已知的文件 SHA-256（如部署清单中的记录），缺失的文件现场计算
+        """
+        if skill_name in self._skills:
+            raise ValueError(f"技能已存在于技能包中: {skill_name}")
+        unsafe = [path for path in [skill_name, *files] if not _is_safe_path(path)]
+        if unsafe or '/' in skill_name:
+            raise ValueError(f"技能名称或文件路径不安全: {(unsafe or [skill_name])[0]!r}")
+
+        fd = self._file.fileno()
+        digests = digests or {}
+        entries = {}
+
+        for rel_path, src in sorted(files.items()):
+            offset = os.lseek(fd, 0, os.SEEK_CUR)
+            size = append_file(src, fd, self.stats)
+            entries[rel_path] = [offset, size, digests.get(rel_path) or file_sha256(src)]
+
+        self._skills[skill_name] = {'config': config or {}, 'files': entries}
+
+    def close(self):
+        """写入目录与文件头并发布技能包"""
+        if self._file.closed:
+            return
+
+        try:
+            toc = json.dumps({'version': BUNDLE_VERSION, 'skills': self._skills},
+                             ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            toc_offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(toc)
+            self._file.seek(0)
+            self._file.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, 0, toc_offset, len(toc)))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.chmod(self._tmp_name, 0o644)
+            os.replace(self._tmp_name, self.path)
+            logger.debug(f"技能包已写入: {self.path} ({len(self._skills)} 个技能)")
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self):
+        """放弃写入并删除临时文件"""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_name):
+            os.unlink(self._tmp_name)
+
+    def __enter__(self) -> 'SkillBundleWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class SkillBundle:
+    """技能包读取器类（mmap 随机访问）"""
+
+    def __init__(self, path: str):
+        """
+        打开技能包（只解析文件头与目录）
+
+        Args:
+            path: 技能包文件路径
+
+        Raises:
+            BundleError: 文件不是有效的技能包
+        """
+        self.path = Path(path)
+
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise BundleError(f"技能包文件过短: {self.path}")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, _, toc_offset, toc_size = _HEADER.unpack_from(self._mmap, 0)
+            if magic != BUNDLE_MAGIC:
+                raise BundleError(f"不是技能包文件: {self.path}")
+            if version > BUNDLE_VERSION:
+                raise BundleError(f"不支持的技能包版本 {version}: {self.path}")
+            if toc_offset < _HEADER.size or toc_offset + toc_size > size:
+                raise BundleError(f"技能包已截断: {self.path}")
+
+            toc = json.loads(self._mmap[toc_offset:toc_offset + toc_size].decode('utf-8'))
+            self._skills: Dict[str, Dict[str, Any]] = toc['skills']
+            self._validate_toc(toc_offset)
+        except (BundleError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self._mmap.close()
+            raise e if isinstance(e, BundleError) else BundleError(f"技能包目录无效 {self.path}: {e}")
+
+    def _validate_toc(self, toc_offset: int):
+        """
+        校验目录（技能包可能来自其他机器，目录内容不可信）
+
+        技能名称必须是单个路径组成部分，文件路径必须是不含 .. 的相对路径，
+        每个文件的数据必须位于文件头与目录之间
+
+        Args:
+            toc_offset: 目录偏移（数据区结尾）
+
+        Raises:
+            BundleError: 目录中存在不安全的路径或越界的数据范围
+        """
+        for skill_name, skill in self._skills.items():
+            if not _is_safe_path(skill_name) or '/' in skill_name:
+                raise BundleError(f"技能包中的技能名称不安全: {skill_name!r}")
+            if not isinstance(skill.get('config', {}), dict):
+                raise BundleError(f"技能包中的部署配置无效: {skill_name}")
+
+            for rel_path, entry in skill['files'].items():
+                if not _is_safe_path(rel_path):
+                    raise BundleError(f"技能包中的文件路径不安全: {skill_name}/{rel_path!r}")
+                offset, size, _ = entry
+                if not (isinstance(offset, int) and isinstance(size, int)
+                        and offset >= _HEADER.size and size >= 0 and offset + size <= toc_offset):
+                    raise BundleError(f"技能包中的文件数据越界: {skill_name}/{rel_path}")
+
+    def skills(self) -> List[str]:
+        """技能包中的技能名称（按名称排序）"""
+        return sorted(self._skills)
+
+    def __contains__(self, skill_name: str) -> bool:
+        return skill_name in self._skills
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def _skill(self, skill_name: str) -> Dict[str, Any]:
+        try:
+            return self._skills[skill_name]
+        except KeyError:
+            raise KeyError(f"技能包中没有技能: {skill_name}") from None
+
+    def _entry(self, skill_name: str, rel_path: str) -> List[Any]:
+        files = self._skill(skill_name)['files']
+        try:
+            return files[rel_path]
+        except KeyError:
+            raise KeyError(f"技能包中没有文件: {skill_name}/{rel_path}") from None
+
+    def config(self, skill_name: str) -> Dict[str, Any]:
+        """技能的部署配置（打包时的 deployment.json）"""
+        return self._skill(skill_name)['config']
+
+    def metadata(self, skill_name: str) -> Dict[str, Any]:
+        """技能元数据"""
+        return self.config(skill_name).get('metadata', {})
+
+    def record(self, skill_name: str) -> SkillRecord:
+        """
+        技能记录（与已部署技能的记录格式相同）
+
+        Args:
+            skill_name: 技能名称
+
+        Returns:
+            技能记录，deploy_path 为 技能包路径#技能名称
+        """
+        return SkillRecord.from_deployment_config(
+            self.config(skill_name),
+            files_exist={rel_path: True for rel_path in self.files(skill_name)},
+            deploy_path=f"{self.path}#{skill_name}"
+        )
+
+    def records(self) -> Iterator[SkillRecord]:
+        """按名称顺序逐个生成全部技能记录"""
+        for skill_name in self.skills():
+            yield self.record(skill_name)
+
+    def files(self, skill_name: str) -> List[str]:
+        """技能包含的文件（相对路径）"""
+        return sorted(self._skill(skill_name)['files'])
+
+    def view(self, skill_name: str, rel_path: str) -> memoryview:
+        """
+        文件内容的只读视图（不复制数据，技能包关闭前有效）
+
+        Args:
+            skill_name: 技能名称
+            rel_path: 文件相对路径
+
+        Returns:
+            memoryview
+        """
+        offset, size, _ = self._entry(skill_name, rel_path)
+        return memoryview(self._mmap)[offset:offset + size]
+
+    def read(self, skill_name: str, rel_path: str) -> bytes:
+        """读取文件内容"""
+        offset, size, _ = self._entry(skill_name, rel_path)
+        return self._mmap[offset:offset + size]
+
+    def read_text(self, skill_name: str, rel_path: str, encoding: str = 'utf-8') -> str:
+        """读取文本文件"""
+        return self.read(skill_name, rel_path).decode(encoding)
+
+    def skill_md(self, skill_name: str) -> str:
+        """读取技能的 SKILL.md"""
+        return self.read_text(skill_name, "SKILL.md")
+
+    def verify(self, skill_name: Optional[str] = None) -> Dict[str, bool]:
+        """
+        按目录中的 SHA-256 校验文件内容
+
+        Args:
+            skill_name: 技能名称，为 None 时校验全部技能
+
+        Returns:
+            {技能名称/相对路径: 是否完整}
+        """
+        names = [skill_name] if skill_name else self.skills()
+        results = {}
+        for name in names:
+            for rel_path, (offset, size, digest) in self._skill(name)['files'].items():
+                with self.view(name, rel_path) as data:
+                    results[f"{name}/{rel_path}"] = hashlib.sha256(data).hexdigest() == digest
+        return results
+
+    def extract(self, skill_name: str, target_dir: str) -> Path:
+        """
+        解包单个技能
+
+        Args:
+            skill_name: 技能名称
+            target_dir: 目标目录（技能解包到 target_dir/技能名称）
+
+        Returns:
+            解包后的技能目录
+        """
+        skill_dir = Path(target_dir) / skill_name
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        root = str(skill_dir.resolve())
+
+        for rel_path in self.files(skill_name):
+            target = skill_dir / rel_path
+            # 目录已在打开时校验；创建父目录前再确认解析符号链接后仍位于技能目录内
+            parent = str(target.parent.resolve())
+            if os.path.commonpath([root, parent]) != root:
+                raise BundleError(f"解包路径超出技能目录: {skill_name}/{rel_path}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.is_symlink() or target.exists():
+                target.unlink()
+            with self.view(skill_name, rel_path) as data, open(target, 'wb') as f:
+                f.write(data)
+
+        config_file = skill_dir / "deployment.json"
+        if config_file.is_symlink():
+            config_file.unlink()
+        config_file.write_text(
+            json.dumps(self.config(skill_name), indent=2, ensure_ascii=False), encoding='utf-8')
+        return skill_dir
+
+    def close(self):
+        """关闭技能包（之前返回的 memoryview 之后不可再使用）"""
+        self._mmap.close()
+
+    def __enter__(self) -> 'SkillBundle':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -0,0 +1,220 @@
+"""
+技能缓存 - 持久化的技能解析结果缓存
+
+以 SQLite 文件保存 SKILL.md 的解析结果（元数据、正文偏移、资源列表），
+通过 (mtime_ns, size, sha256) 校验缓存是否仍然有效
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 默认缓存文件位置
+DEFAULT_CACHE_FILE = "config/skill_cache.db"
+
+# 缓存结构版本，结构变化时递增以自动丢弃旧缓存
+SCHEMA_VERSION = 1
+
+
+class SkillCache:
+    """技能解析缓存类"""
+
+    def __init__(self, cache_file: str = DEFAULT_CACHE_FILE):
+        """
+        初始化技能缓存
+
+        Args:
+            cache_file: 缓存文件路径
+        """
+        self.cache_file = Path(cache_file)
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_file), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+        logger.debug(f"技能缓存已打开: {self.cache_file}")
+
+    def _init_schema(self):
+        """初始化缓存表结构，版本不一致时重建"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS skills")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS skills (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                body_offset INTEGER NOT NULL,
+                resources TEXT NOT NULL,
+                directories TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _key(skill_path: Path) -> str:
+        """缓存键：技能目录的绝对路径（不访问文件系统）"""
+        return os.path.abspath(str(skill_path))
+
+    @staticmethod
+    def _directories_unchanged(directories: List[List[Any]]) -> bool:
+        """
+        检查资源目录的 mtime 是否未变化
+
+        目录的 mtime 会在其中文件增删或重命名时更新，因此可以用来判断资源列表是否仍然有效
+        """
+        for dir_path, mtime_ns in directories:
+            try:
+                if os.stat(dir_path).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def get(self, skill_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        获取仍然有效的缓存条目
+
+        Args:
+            skill_path: 技能目录路径
+
+        Returns:
+            缓存条目 {metadata, body_offset, resources}，缓存缺失或失效时返回 None
+        """
+        skill_file = skill_path / "SKILL.md"
+        key = self._key(skill_path)
+
+        try:
+            st = os.stat(skill_file)
+        except OSError:
+            return None
+
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT mtime_ns, size, sha256, metadata, body_offset, resources, directories "
+                    "FROM skills WHERE path = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"读取技能缓存失败 {key}: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        mtime_ns, size, sha256, metadata, body_offset, resources, directories = row
+        if size != st.st_size:
+            return None
+
+        directories = json.loads(directories)
+        if not self._directories_unchanged(directories):
+            return None
+
+        if mtime_ns != st.st_mtime_ns:
+            # mtime 变化但大小相同：比较内容哈希，内容未变则仅刷新 mtime
+            if not sha256 or hashlib.sha256(skill_file.read_bytes()).hexdigest() != sha256:
+                return None
+            self._touch(key, st.st_mtime_ns)
+
+        return {
+            'metadata': json.loads(metadata),
+            'body_offset': body_offset,
+            'resources': json.loads(resources)
+        }
+
+    def put(self, skill_path: Path, st: os.stat_result, metadata: Dict[str, Any],
+            resources: List[str], directories: List[Path], body_offset: int, sha256: Optional[str] = None):
+        """
+        写入缓存条目
+
+        Args:
+            skill_path: 技能目录路径
+            st: 读取前获取的 SKILL.md stat 结果
+            metadata: 解析后的元数据
+            resources: 资源文件列表
+            directories: 资源发现时遍历过的目录（含技能目录本身）
+            body_offset: 正文起始字节偏移
+            sha256: SKILL.md 内容哈希（只读取头部时为 None，此时 mtime 变化即视为失效）
+        """
+        try:
+            metadata_json = json.dumps(metadata, ensure_ascii=False)
+        except (TypeError, ValueError):
+            # 元数据包含 JSON 无法表示的类型（如日期），不缓存以保证结果一致
+            logger.debug(f"技能元数据无法序列化，跳过缓存: {skill_path}")
+            return
+
+        dir_mtimes = []
+        for dir_path in directories:
+            try:
+                dir_mtimes.append([os.path.abspath(str(dir_path)), os.stat(dir_path).st_mtime_ns])
+            except OSError:
+                return
+
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO skills "
+                    "(path, mtime_ns, size, sha256, metadata, body_offset, resources, directories) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self._key(skill_path),
+                        st.st_mtime_ns,
+                        st.st_size,
+                        sha256 or '',
+                        metadata_json,
+                        body_offset,
+                        json.dumps(resources, ensure_ascii=False),
+                        json.dumps(dir_mtimes, ensure_ascii=False)
+                    )
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"写入技能缓存失败 {skill_path}: {e}")
+
+    def _touch(self, key: str, mtime_ns: int):
+        """刷新缓存条目的 mtime"""
+        try:
+            with self._lock:
+                self._conn.execute("UPDATE skills SET mtime_ns = ? WHERE path = ?", (mtime_ns, key))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"更新技能缓存失败 {key}: {e}")
+
+    def invalidate(self, skill_path: Path):
+        """
+        删除单个技能的缓存条目
+
+        Args:
+            skill_path: 技能目录路径
+        """
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM skills WHERE path = ?", (self._key(skill_path),))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"删除技能缓存失败 {skill_path}: {e}")
+
+    def clear(self):
+        """清空全部缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM skills")
+            self._conn.commit()
+
+    def close(self):
+        """关闭缓存连接"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,450 @@
+"""
+技能目录 - 基于 SQLite 的已部署技能目录
+
+按名称、分类、标签、作者、版本和部署时间建立索引，
+按条件查询和分类统计无需读取 skill_index.json 或任何 deployment.json；
+同时维护 FTS5 全文索引（描述、章节、正文、命令），支持 BM25 排序与短语查询
+"""
+
+import json
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Any, Iterable, Optional
+from pathlib import Path
+
+try:
+    from .skill_frontmatter import read_frontmatter, read_body
+    from .skill_loader import SkillLoader
+    from .skill_markdown import section_text
+except ImportError:
+    from skill_frontmatter import read_frontmatter, read_body
+    from skill_loader import SkillLoader
+    from skill_markdown import section_text
+
+logger = logging.getLogger(__name__)
+
+# 默认目录文件位置
+DEFAULT_CATALOG_FILE = "config/skill_catalog.db"
+
+# 目录结构版本，结构变化时递增以自动重建
+SCHEMA_VERSION = 2
+
+# 全文索引各列的 BM25 权重：name, description, headings, body, commands
+SEARCH_WEIGHTS = (10.0, 5.0, 3.0, 1.0, 2.0)
+
+_loader = SkillLoader()
+
+
+def normalize_tags(tags: Any) -> List[str]:
+    """
+    规范化元数据中的标签
+
+    Args:
+        tags: 标签列表或逗号分隔的字符串
+
+    Returns:
+        去重、去空白后的标签列表
+    """
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    elif not isinstance(tags, (list, tuple)):
+        return []
+
+    result = []
+    for tag in tags:
+        tag = str(tag).strip()
+        if tag and tag not in result:
+            result.append(tag)
+    return result
+
+
+def _to_timestamp(value: Any) -> Optional[float]:
+    """部署时间（deployment.json 中为字符串）转换为浮点时间戳"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_search_document(skill: Any, loader: Optional[SkillLoader] = None) -> Dict[str, str]:
+    """
+    为技能生成全文索引文档
+
+    章节与命令来自 SkillLoader._parse_markdown_content 的单遍解析（命令由加载器的命令提取引擎提取）；
+    技能记录没有 deploy_path 或 SKILL.md 不可读时只索引名称和描述
+
+    Args:
+        skill: 技能记录（SkillRecord）
+        loader: 技能加载器（默认使用内置命令模式的加载器）
+
+    Returns:
+        {name, description, headings, body, commands}
+    """
+    metadata = skill.metadata or {}
+    document = {
+        'name': skill.name,
+        'description': str(metadata.get('description') or ''),
+        'headings': '',
+        'body': '',
+        'commands': ''
+    }
+
+    if not skill.deploy_path:
+        return document
+
+    skill_file = Path(skill.deploy_path) / "SKILL.md"
+    try:
+        frontmatter = read_frontmatter(skill_file)
+        if frontmatter is None:
+            return document
+        content = read_body(skill_file, frontmatter[1])
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"读取技能正文失败 {skill_file}: {e}")
+        return document
+
+    parsed = (loader or _loader)._parse_markdown_content(content)
+    sections = parsed['sections']
+    document['headings'] = '\n'.join(section['title'] for section in sections)
+    document['body'] = '\n'.join(section_text(content, section) for section in sections)
+    document['commands'] = '\n'.join(parsed['commands'])
+    return document
+
+
+def _to_fts_query(text: str, phrase: bool = False) -> str:
+    """
+    将查询文本转换为 FTS5 查询
+
+    Args:
+        text: 查询文本（非短语模式下按 FTS5 语法解析，支持 "短语"、OR、前缀*）
+        phrase: 是否整体作为短语匹配
+
+    Returns:
+        FTS5 查询字符串
+    """
+    if phrase:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _quote_terms(text: str) -> str:
+    """将每个词作为独立短语（全部匹配），用于 FTS5 语法错误时的回退"""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+class SkillCatalog:
+    """技能目录类"""
+
+    def __init__(self, catalog_file: str = DEFAULT_CATALOG_FILE, loader: Optional[SkillLoader] = None):
+        """
+        初始化技能目录
+
+        Args:
+            catalog_file: 目录数据库文件路径
+            loader: 生成全文索引时解析正文的技能加载器（其命令提取引擎决定 commands 列，默认使用内置命令模式）
+        """
+        self.catalog_file = Path(catalog_file)
+        self.loader = loader or _loader
+        self.catalog_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.catalog_file), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._init_schema()
+
+        logger.debug(f"技能目录已打开: {self.catalog_file}")
+
+    def _init_schema(self):
+        """初始化目录表结构，版本不一致时重建"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.executescript("""
+                DROP TABLE IF EXISTS skill_tags;
+                DROP TABLE IF EXISTS skills;
+                DROP TABLE IF EXISTS catalog_meta;
+                DROP TABLE IF EXISTS skill_search;
+            """)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS skills (
+                name TEXT PRIMARY KEY,
+                category TEXT NOT NULL,
+                author TEXT,
+                version TEXT,
+                description TEXT,
+                deployed_at REAL,
+                metadata TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_skills_category ON skills(category, name);
+            CREATE INDEX IF NOT EXISTS idx_skills_author ON skills(author, name);
+            CREATE INDEX IF NOT EXISTS idx_skills_version ON skills(version);
+            CREATE INDEX IF NOT EXISTS idx_skills_deployed_at ON skills(deployed_at);
+
+            CREATE TABLE IF NOT EXISTS skill_tags (
+                tag TEXT NOT NULL,
+                name TEXT NOT NULL REFERENCES skills(name) ON DELETE CASCADE,
+                PRIMARY KEY (tag, name)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_skill_tags_name ON skill_tags(name);
+
+            CREATE TABLE IF NOT EXISTS catalog_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+        try:
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS skill_search USING fts5(
+                    name, description, headings, body, commands,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
+            self._conn.commit()
+            self.search_enabled = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"当前 SQLite 不支持 FTS5，全文搜索不可用: {e}")
+            self.search_enabled = False
+
+    @staticmethod
+    def _row_values(skill: Any) -> tuple:
+        """从技能记录提取 skills 表的列值"""
+        metadata = skill.metadata or {}
+        try:
+            metadata_json = json.dumps(metadata, ensure_ascii=False)
+        except (TypeError, ValueError):
+            metadata_json = json.dumps(metadata, ensure_ascii=False, default=str)
+
+        def text(key):
+            value = metadata.get(key)
+            return None if value is None else str(value)
+
+        return (
+            skill.name,
+            text('category') or 'uncategorized',
+            text('author'),
+            text('version'),
+            text('description'),
+            _to_timestamp(skill.deployed_at),
+            metadata_json
+        )
+
+    def _upsert(self, skill: Any):
+        """写入单个技能（调用方负责加锁和提交）"""
+        self._delete(skill.name)
+        cursor = self._conn.execute(
+            "INSERT INTO skills (name, category, author, version, description, deployed_at, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            self._row_values(skill)
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO skill_tags (tag, name) VALUES (?, ?)",
+            [(tag, skill.name) for tag in normalize_tags((skill.metadata or {}).get('tags'))]
+        )
+
+        if self.search_enabled:
+            # 全文索引行与 skills 行共用 rowid，删除时无需扫描全文索引
+            document = build_search_document(skill, self.loader)
+            self._conn.execute(
+                "INSERT INTO skill_search (rowid, name, description, headings, body, commands) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cursor.lastrowid, document['name'], document['description'], document['headings'],
+                 document['body'], document['commands'])
+            )
+
+    def _delete(self, skill_name: str):
+        """删除单个技能及其标签、全文索引（调用方负责加锁和提交）"""
+        if self.search_enabled:
+            self._conn.execute(
+                "DELETE FROM skill_search WHERE rowid = (SELECT rowid FROM skills WHERE name = ?)", (skill_name,)
+            )
+        self._conn.execute("DELETE FROM skills WHERE name = ?", (skill_name,))
+
+    def upsert(self, skill: Any, generation: Optional[int] = None):
+        """
+        新增或更新单个技能
+
+        Args:
+            skill: 技能记录（SkillRecord）
+            generation: 更新后的部署代数（可选）
+        """
+        with self._lock, self._conn:
+            self._upsert(skill)
+            if generation is not None:
+                self._set_meta('generation', str(generation))
+
+    def remove(self, skill_name: str, generation: Optional[int] = None):
+        """
+        删除单个技能
+
+        Args:
+            skill_name: 技能名称
+            generation: 更新后的部署代数（可选）
+        """
+        with self._lock, self._conn:
+            self._delete(skill_name)
+            if generation is not None:
+                self._set_meta('generation', str(generation))
+
+    def replace_all(self, skills: Iterable[Any], generation: Optional[int] = None):
+        """
+        在一个事务中用给定技能替换全部内容
+
+        Args:
+            skills: 技能记录
+            generation: 对应的部署代数（可选）
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM skills")
+            if self.search_enabled:
+                self._conn.execute("DELETE FROM skill_search")
+            for skill in skills:
+                self._upsert(skill)
+            if generation is not None:
+                self._set_meta('generation', str(generation))
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def generation(self) -> Optional[int]:
+        """目录对应的部署代数（从未同步时为 None）"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM catalog_meta WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else None
+
+    def query(self, category: Optional[str] = None, tag: Optional[str] = None,
+              author: Optional[str] = None, name_prefix: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        按条件查询技能（条件之间为“与”关系，结果按名称排序）
+
+        Args:
+            category: 分类
+            tag: 标签
+            author: 作者
+            name_prefix: 名称前缀
+            limit: 最多返回的数量
+
+        Returns:
+            技能列表 [{name, category, author, version, description, deployed_at, tags, metadata}]
+        """
+        clauses = []
+        params = []
+
+        if category is not None:
+            clauses.append("s.category = ?")
+            params.append(category)
+        if author is not None:
+            clauses.append("s.author = ?")
+            params.append(author)
+        if tag is not None:
+            clauses.append("s.name IN (SELECT name FROM skill_tags WHERE tag = ?)")
+            params.append(tag)
+        if name_prefix:
+            # 范围条件可以使用主键索引（LIKE 受大小写与转义规则影响无法保证走索引）
+            clauses.append("s.name >= ? AND s.name < ?")
+            params.extend([name_prefix, name_prefix + '\U0010ffff'])
+
+        sql = ("SELECT s.*, (SELECT group_concat(tag, char(31)) FROM skill_tags t WHERE t.name = s.name) AS tags "
+               "FROM skills s")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY s.name"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            {
+                'name': row['name'],
+                'category': row['category'],
+                'author': row['author'],
+                'version': row['version'],
+                'description': row['description'],
+                'deployed_at': row['deployed_at'],
+                'tags': sorted(row['tags'].split('\x1f')) if row['tags'] else [],
+                'metadata': json.loads(row['metadata'])
+            }
+            for row in rows
+        ]
+
+    def search(self, text: str, limit: Optional[int] = 10, phrase: bool = False) -> List[Dict[str, Any]]:
+        """
+        全文搜索技能，按 BM25 相关度排序
+
+        Args:
+            text: 查询文本（默认按 FTS5 语法解析，如 'fillable form'、'"tracked changes"'、'pdf OR docx'、'form*'）
+            limit: 最多返回的数量
+            phrase: 是否将整个查询文本作为短语匹配
+
+        Returns:
+            搜索结果 [{name, category, description, score, snippet}]，score 越小越相关
+
+        Raises:
+            RuntimeError: SQLite 不支持 FTS5
+        """
+        if not self.search_enabled:
+            raise RuntimeError("当前 SQLite 不支持 FTS5，无法进行全文搜索")
+        if not text.strip():
+            return []
+
+        weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+        sql = (
+            f"SELECT s.name, s.category, s.description, bm25(skill_search, {weights}) AS score, "
+            "snippet(skill_search, -1, '[', ']', '…', 12) AS snippet "
+            "FROM skill_search JOIN skills s ON s.rowid = skill_search.rowid "
+            "WHERE skill_search MATCH ? ORDER BY score"
+        )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        query = _to_fts_query(text, phrase)
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, (query,)).fetchall()
+            except sqlite3.OperationalError:
+                # 查询文本不符合 FTS5 语法（如包含未配对的引号或运算符），按普通词语重新查询
+                rows = self._conn.execute(sql, (_quote_terms(text),)).fetchall()
+
+        return [
+            {
+                'name': row['name'],
+                'category': row['category'],
+                'description': row['description'],
+                'score': row['score'],
+                'snippet': row['snippet']
+            }
+            for row in rows
+        ]
+
+    def category_counts(self) -> Dict[str, int]:
+        """
+        按分类统计技能数量
+
+        Returns:
+            {分类: 技能数量}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category, COUNT(*) FROM skills GROUP BY category ORDER BY category"
+            ).fetchall()
+        return {category: count for category, count in rows}
+
+    def count(self) -> int:
+        """技能总数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM skills").fetchone()[0]
+
+    def close(self):
+        """关闭目录连接"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,237 @@
+"""
+技能命令提取 - 基于预编译正则的命令提取引擎
+
+每个模式单独预编译并扫描，结果按出现位置合并；忽略大小写的模式先用字面量前缀预检，
+正文中不含前缀时跳过整遍扫描，否则只在折叠正文中前缀出现的位置尝试匹配。支持注册自定义模式，结果包含命令文本、位置与模式类型，
+并可批量处理大量技能
+"""
+
+import re
+import logging
+from operator import itemgetter
+from typing import Dict, List, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 默认命令模式 (类型, 正则)，正则中的第一个捕获组为命令文本（没有捕获组时取整个匹配）
+# 每个模式以字面量开头，同一类型可注册多个模式
+DEFAULT_COMMAND_PATTERNS = [
+    ('command', r'命令:\s*(.+)'),
+    ('command', r'Command:\s*(.+)'),
+    ('usage', r'Usage:\s*(.+)'),
+    ('usage', r'用法:\s*(.+)'),
+]
+
+# 可选模式：以 `$ ` 开头的 shell 提示符行
+SHELL_PROMPT_PATTERN = r'^[ \t]*\$[ \t]+(.+)'
+
+# 可选模式：bash/sh/shell/console 围栏代码块的内容
+FENCED_SHELL_PATTERN = r'^[ \t]*```(?:bash|sh|shell|console|zsh)[ \t]*\n((?s:.*?))\n?^[ \t]*```[ \t]*$'
+
+# 正则元字符：字面量前缀在遇到这些字符时结束
+_REGEX_METACHARS = set('\\.^$*+?{}[]|()')
+
+
+def _literal_prefix(pattern: str, flags: int) -> Optional[str]:
+    """
+    计算忽略大小写模式的字面量前缀（折叠后），用于扫描前的预检
+
+    只对 ASCII 前缀生效：任何能被该模式匹配的正文，经 _fold 折叠后都必然包含此前缀
+
+    Args:
+        pattern: 正则
+        flags: 编译标志
+
+    Returns:
+        折叠后的前缀，无法安全预检时返回 None
+    """
+    if not flags & re.IGNORECASE or flags & re.VERBOSE or '|' in pattern:
+        return None
+
+    prefix = []
+    for char in pattern:
+        if char in _REGEX_METACHARS:
+            # 后接可选量词的字符不是必需的
+            if char in '*?{' and prefix:
+                prefix.pop()
+            break
+        prefix.append(char)
+
+    literal = ''.join(prefix)
+    if not literal or not literal.isascii():
+        return None
+    return literal.casefold()
+
+
+def _fold(content: str) -> Tuple[str, bool]:
+    """
+    折叠正文大小写，供字面量前缀预检
+
+    忽略大小写匹配时 İ 与 ı 都等价于 i，但 casefold 后分别为 i + U+0307 与 ı，需另行归一
+
+    Args:
+        content: 正文
+
+    Returns:
+        (折叠后的正文, 折叠结果与正文是否逐字符对齐)
+    """
+    folded = content.casefold()
+    aligned = len(folded) == len(content)
+    if '\u0131' in folded:
+        folded = folded.replace('\u0131', 'i')
+    if '\u0307' in folded:
+        folded = folded.replace('\u0307', '')
+        aligned = False
+    return folded, aligned
+
+
+def _scan(compiled, content: str, folded: str, prefix: str) -> Iterator[Any]:
+    """
+    只在折叠正文中出现前缀的位置尝试匹配（等价于 compiled.finditer(content)）
+
+    要求折叠正文与正文逐字符对齐：模式以该字面量开头，匹配只可能从前缀出现处开始
+
+    Args:
+        compiled: 预编译的模式
+        content: 正文
+        folded: 对齐的折叠正文
+        prefix: 折叠后的字面量前缀
+
+    Yields:
+        匹配对象
+    """
+    find = folded.find
+    match_at = compiled.match
+    pos = find(prefix)
+    while pos >= 0:
+        match = match_at(content, pos)
+        if match:
+            yield match
+            pos = find(prefix, max(match.end(), pos + 1))
+        else:
+            pos = find(prefix, pos + 1)
+
+
+class CommandMatch(NamedTuple):
+    """命令匹配结果"""
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+class CommandExtractor:
+    """命令提取引擎类"""
+
+    def __init__(self, patterns: Optional[Iterable[Tuple[str, str]]] = None,
+                 flags: int = re.IGNORECASE | re.MULTILINE):
+        """
+        初始化命令提取引擎
+
+        Args:
+            patterns: 命令模式 [(类型, 正则)]，默认为 DEFAULT_COMMAND_PATTERNS
+            flags: 各模式的编译标志
+        """
+        self.flags = flags
+        self._patterns: List[Tuple[str, str]] = []
+        self._compiled: List[Tuple[str, Any, Optional[str]]] = []
+
+        for kind, pattern in (DEFAULT_COMMAND_PATTERNS if patterns is None else patterns):
+            self.register(kind, pattern)
+
+    @property
+    def patterns(self) -> List[Tuple[str, str]]:
+        """已注册的命令模式 [(类型, 正则)]"""
+        return list(self._patterns)
+
+    def register(self, kind: str, pattern: str):
+        """
+        注册命令模式
+
+        Args:
+            kind: 模式类型（出现在 CommandMatch.kind 中）
+            pattern: 正则，第一个捕获组为命令文本（没有捕获组时取整个匹配）
+
+        Raises:
+            ValueError: 正则无效
+        """
+        try:
+            compiled = re.compile(pattern, self.flags)
+        except re.error as e:
+            raise ValueError(f"无效的命令模式 {kind}: {e}")
+
+        self._patterns.append((kind, pattern))
+        self._compiled.append((kind, compiled, _literal_prefix(pattern, self.flags)))
+
+    def extract(self, content: str) -> List[CommandMatch]:
+        """
+        提取命令（按出现顺序）
+
+        各模式分别扫描后按匹配起点合并；与先出现（同一起点时先注册）的匹配重叠的结果被丢弃，
+        因此每段文本只归属一个模式
+
+        Args:
+            content: 技能正文
+
+        Returns:
+            命令匹配结果列表
+        """
+        found = []
+        folded = None
+        for order, (kind, compiled, prefix) in enumerate(self._compiled):
+            scan = compiled.finditer(content)
+            if prefix is not None:
+                if folded is None:
+                    folded, aligned = _fold(content)
+                if prefix not in folded:
+                    continue
+                if aligned:
+                    scan = _scan(compiled, content, folded, prefix)
+
+            group = 1 if compiled.groups else 0
+            for match in scan:
+                found.append((match.start(), order, match.end(), kind, match, group))
+
+        if len(self._compiled) > 1:
+            found.sort(key=itemgetter(0, 1))
+
+        matches = []
+        last_end = -1
+        for start, _, end, kind, match, group in found:
+            if start < last_end:
+                continue
+            last_end = end
+            if group and match.group(group) is None:
+                group = 0
+            matches.append(CommandMatch(kind, match.group(group), match.start(group), match.end(group)))
+
+        return matches
+
+    def extract_many(self, skills: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, List[CommandMatch]]]:
+        """
+        批量提取命令（逐个产出，不在内存中累积）
+
+        Args:
+            skills: [(技能名称, 技能正文)]
+
+        Yields:
+            (技能名称, 命令匹配结果列表)
+        """
+        for name, content in skills:
+            yield name, self.extract(content or '')
+
+    def command_catalog(self, skills: Iterable[Tuple[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        构建命令目录
+
+        Args:
+            skills: [(技能名称, 技能正文)]
+
+        Returns:
+            {技能名称: [{kind, text, start, end}]}（没有命令的技能不出现）
+        """
+        catalog = {}
+        for name, matches in self.extract_many(skills):
+            if matches:
+                catalog[name] = [match._asdict() for match in matches]
+        return catalog
@@ -6,72 +6,752 @@
 
 import os
 import json
+import time
+import bisect
 import shutil
+import string
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+import tempfile
+import threading
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .object_store import ObjectStore, file_sha256
+    from .file_transfer import TransferStats, copy_file, copy_tree
+    from .file_lock import FileLock
+    from .skill_bundle import SkillBundleWriter
+    from .skill_record import SkillRecord
+    from .skill_catalog import SkillCatalog
+    from .instrumentation import span
+except ImportError:
+    from object_store import ObjectStore, file_sha256
+    from file_transfer import TransferStats, copy_file, copy_tree
+    from file_lock import FileLock
+    from skill_bundle import SkillBundleWriter
+    from skill_record import SkillRecord
+    from skill_catalog import SkillCatalog
+    from instrumentation import span
 
 logger = logging.getLogger(__name__)
 
+# 需要随技能一起部署的资源目录
+RESOURCE_DIRS = ['scripts', 'resources', 'examples', 'templates']
+
+# 部署状态检查级别：
+#   quick  - 只读取 deployment.json 中的文件清单，不访问已部署文件
+#   stat   - 每个目录一次 scandir，按清单比较文件大小与部署时的 mtime
+#   verify - 在 stat 基础上并行计算 SHA-256 校验文件内容
+STATUS_LEVELS = ('quick', 'stat', 'verify')
+
+# 部署代数计数文件（位于 deployed_dir），每次部署/卸载递增，用于发现索引与部署目录不同步
+GENERATION_FILE = ".generation"
+
+# 分阶段部署的版本目录（deployed_dir/.releases/<技能>/<版本号>），deployed_dir/<技能> 为指向当前版本的符号链接
+RELEASES_DIR = ".releases"
+
+# 跨进程文件锁目录（deployed_dir/.locks）：每个技能一个锁，另有索引锁与对象存储锁
+LOCKS_DIR = ".locks"
+
+# 使用说明模板（模块加载时构造一次；技能内容作为替换值插入，其中的 $ 不会被解析）
+USAGE_TEMPLATE = string.Template("""# $title 使用指南
+
+## 技能描述
+$description
+
+## 版本信息
+- 版本: $version
+- 作者: $author
+- 部署时间: $deployed_at
+
+## 技能内容
+$content
+
+## 使用方法
+
+1. 确保已安装必要的依赖
+2. 按照技能说明进行操作
+3. 如有问题，请参考技能文档
+
+## 文件结构
+
+```
+$skill_name/
+├── SKILL.md          # 技能主文件
+├── deployment.json   # 部署配置
+└── [其他资源文件]     # 技能相关资源
+```
+""")
+
 
 class SkillDeployer:
     """技能部署器类"""
     
-    def __init__(self, deployed_dir: str = "deployed_skills", config_dir: str = "config"):
+    def __init__(self, deployed_dir: str = "deployed_skills", config_dir: str = "config",
+                 use_object_store: bool = False, catalog_file: Optional[str] = None,
+                 staged: bool = False, keep_releases: int = 2, lock_timeout: Optional[float] = None):
         """
         初始化技能部署器
         
         Args:
             deployed_dir: 已部署技能目录
             config_dir: 配置目录
+            use_object_store: 是否使用按内容寻址的对象存储（deployed_dir/.objects）去重部署文件
+            catalog_file: SQLite 技能目录文件路径，为 None 时不维护技能目录
+            staged: 是否分阶段部署（在新版本目录中完成部署后通过符号链接原子切换，读取方不会看到不完整的技能）
+            keep_releases: 分阶段部署时除当前版本外保留的历史版本数（用于回滚）
+            lock_timeout: 等待其他部署进程释放文件锁的超时时间（秒），None 表示一直等待
         """
         self.deployed_dir = Path(deployed_dir)
         self.config_dir = Path(config_dir)
+        self.staged = staged
+        self.keep_releases = max(0, keep_releases)
+        self.lock_timeout = lock_timeout
         
         # 创建必要的目录
         self.deployed_dir.mkdir(exist_ok=True)
         self.config_dir.mkdir(exist_ok=True)
         
+        # 文件复制统计（文件数、字节数、吞吐量）
+        self.transfer_stats = TransferStats()
+        
+        self.object_store = ObjectStore(self.deployed_dir / ".objects", self.transfer_stats) if use_object_store else None
+        
+        self.index_file = self.config_dir / "skill_index.json"
+        self._index_lock = threading.Lock()
+        
+        self.catalog = SkillCatalog(catalog_file) if catalog_file else None
+        
         logger.info(f"技能部署器初始化完成")
     
-    def deploy_skill(self, skill_path: Path, skill_info: Dict[str, Any]) -> bool:
+    @property
+    def store_mode(self) -> str:
+        """部署文件的存储方式（记录在 deployment.json 中）：objects - 对象存储硬链接，copy - 普通复制"""
+        return 'objects' if self.object_store else 'copy'
+    
+    def deploy_skill(self, skill_path: Path, skill_info: Dict[str, Any], force: bool = False) -> bool:
         """
         部署单个技能
         
+        默认进行增量部署：根据 deployment.json 中的文件清单只复制新增/变更的文件并删除已移除的文件；
+        首次部署、清单缺失或 force=True 时执行完整重建
+        
         Args:
             skill_path: 技能源路径
             skill_info: 技能信息
+            force: 是否强制完整重建（删除旧部署后重新复制）
             
         Returns:
             部署是否成功
         """
         skill_name = skill_info['name']
+        
+        with span('deploy', skill=skill_name) as deploy_span:
+            try:
+                # 持有技能锁直到索引更新完成，避免其他进程的部署交错或用旧记录覆盖索引
+                with self.skill_lock(skill_name):
+                    deploy_path, manifest = self._deploy_files(skill_path, skill_name, force)
+                    config = self._write_deployment(deploy_path, skill_info, manifest)
+                    
+                    # 增量更新技能索引
+                    with span('index_update', skill=skill_name):
+                        self._update_index(skill_name, SkillRecord.from_deployment_config(
+                            config, deploy_path=str(self.deployed_dir / skill_name)))
+                
+                logger.info(f"技能部署成功: {skill_name}")
+                return True
+                
+            except Exception as e:
+                deploy_span.add(failures=1)
+                logger.error(f"技能部署失败 {skill_name}: {e}")
+                return False
+    
+    def _deploy_files(self, skill_path: Path, skill_name: str,
+                      force: bool = False) -> Tuple[Path, Dict[str, Dict[str, Any]]]:
+        """
+        部署技能文件（增量或完整重建）并记录已部署文件的 mtime
+        
+        Args:
+            skill_path: 技能源路径
+            skill_name: 技能名称
+            force: 是否强制完整重建
+            
+        Returns:
+            (部署路径, 新的文件清单)；分阶段部署时部署路径为尚未发布的新版本目录
+        """
         deploy_path = self.deployed_dir / skill_name
         
-        try:
-            # 清理旧的部署（如果存在）
-            if deploy_path.exists():
-                shutil.rmtree(deploy_path)
+        if self.staged:
+            return self._stage_files(skill_path, skill_name, force)
+        
+        if deploy_path.is_symlink():
+            # 之前使用分阶段部署：版本目录之间共享硬链接，不能原地修改，改为完整重建
+            self._remove_deployment(skill_name)
+        
+        with span('plan', skill=skill_name):
+            plan = None if force else self.plan_deployment(skill_path, skill_name)
+        
+        with span('copy', skill=skill_name) as copy_span:
+            if plan is None or plan['mode'] == 'full':
+                # 清理旧的部署（如果存在）
+                if deploy_path.exists():
+                    shutil.rmtree(deploy_path)
+                
+                # 创建部署目录
+                deploy_path.mkdir(parents=True, exist_ok=True)
+                
+                # 复制技能文件
+                manifest = self._build_manifest(skill_path, self._scan_source_files(skill_path))
+                if self.object_store:
+                    self._materialize_files(skill_path, deploy_path, manifest)
+                else:
+                    self._copy_skill_files(skill_path, deploy_path)
+                copied = list(manifest)
+            else:
+                manifest = self._apply_plan(skill_path, deploy_path, plan)
+                copied = plan['added'] + plan['changed']
+                logger.debug(
+                    f"增量部署 {skill_name}: 新增 {len(plan['added'])}, 变更 {len(plan['changed'])}, "
+                    f"删除 {len(plan['removed'])}, 未变 {len(plan['unchanged'])}"
+                )
             
-            # 创建部署目录
-            deploy_path.mkdir(parents=True, exist_ok=True)
+            if copy_span.enabled:
+                copy_span.add(files=len(copied), bytes=sum(manifest[rel_path]['size'] for rel_path in copied))
+        
+        # 记录已部署文件的 mtime，供 stat 级别的状态检查使用
+        self._record_deployed_mtimes(deploy_path, manifest)
+        
+        return deploy_path, manifest
+    
+    def _write_deployment(self, deploy_path: Path, skill_info: Dict[str, Any],
+                          manifest: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        写入部署配置与使用说明
+        
+        Args:
+            deploy_path: 部署路径
+            skill_info: 技能信息
+            manifest: 文件清单
             
-            # 复制技能文件
-            self._copy_skill_files(skill_path, deploy_path)
+        Returns:
+            写入 deployment.json 的配置
+        """
+        skill_name = skill_info['name']
+        
+        # 生成部署配置
+        with span('config', skill=skill_name):
+            config = self._generate_deployment_config(deploy_path, skill_info, manifest)
+        
+        # 生成使用说明
+        with span('usage_guide', skill=skill_name):
+            self._generate_usage_guide(deploy_path, skill_info, config['deployed_at'])
+        
+        # 分阶段部署：新版本目录已完整，原子切换为当前版本（沿用当前版本时无需切换）
+        if self.staged and deploy_path != self._current_release(skill_name):
+            with span('publish', skill=skill_name):
+                self._publish_release(skill_name, deploy_path)
+        
+        return config
+    
+    def _stage_files(self, skill_path: Path, skill_name: str,
+                     force: bool = False) -> Tuple[Path, Dict[str, Dict[str, Any]]]:
+        """
+        在新的版本目录中准备部署（分阶段部署）
+        
+        先在 .staging-<版本号> 中写入，完成后重命名为版本目录；未变文件从当前版本硬链接，
+        新增和变更的文件从源复制。当前版本在发布前保持不变。没有任何文件变化时不创建新版本，
+        沿用当前版本（重复部署不会把历史版本挤出保留范围）
+        
+        Args:
+            skill_path: 技能源路径
+            skill_name: 技能名称
+            force: 是否强制完整复制
             
-            # 生成部署配置
-            self._generate_deployment_config(deploy_path, skill_info)
+        Returns:
+            (版本目录, 新的文件清单)；没有变化时版本目录为当前版本
+        """
+        releases_dir = self.deployed_dir / RELEASES_DIR / skill_name
+        releases_dir.mkdir(parents=True, exist_ok=True)
+        
+        # 清理中断的部署留下的临时目录
+        for entry in os.scandir(releases_dir):
+            if entry.name.startswith('.staging-'):
+                shutil.rmtree(entry.path, ignore_errors=True)
+        
+        self._migrate_legacy_deployment(skill_name)
+        current = self._current_release(skill_name)
+        
+        with span('plan', skill=skill_name):
+            plan = None if force or current is None else self.plan_deployment(skill_path, skill_name)
+        
+        if plan is not None and plan['mode'] == 'incremental' and \
+                not (plan['added'] or plan['changed'] or plan['removed']):
+            _, manifest = self._plan_manifests(skill_path, plan)
+            self._record_deployed_mtimes(current, manifest)
+            logger.debug(f"技能未变化，沿用当前版本: {skill_name} -> {current.name}")
+            return current, manifest
+        
+        release_ids = self._release_ids(skill_name)
+        release_id = f"{int(release_ids[-1]) + 1 if release_ids else 1:06d}"
+        staging = releases_dir / f".staging-{release_id}"
+        staging.mkdir()
+        
+        with span('copy', skill=skill_name) as copy_span:
+            if plan is None or plan['mode'] == 'full':
+                manifest = self._build_manifest(skill_path, self._scan_source_files(skill_path))
+                copied_manifest = manifest
+                if self.object_store:
+                    self._materialize_files(skill_path, staging, manifest)
+                else:
+                    self._copy_skill_files(skill_path, staging)
+            else:
+                copied_manifest, manifest = self._plan_manifests(skill_path, plan)
+                for rel_path in plan['unchanged']:
+                    target = staging / rel_path
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    try:
+                        os.link(current / rel_path, target)
+                    except OSError:
+                        # 源文件与清单一致，从源复制（当前版本中的文件可能已丢失）
+                        copy_file(skill_path / rel_path, target, self.transfer_stats)
+                self._copy_planned_files(skill_path, staging, copied_manifest)
             
-            # 生成使用说明
-            self._generate_usage_guide(deploy_path, skill_info)
+            if copy_span.enabled:
+                copy_span.add(files=len(copied_manifest),
+                              bytes=sum(entry['size'] for entry in copied_manifest.values()))
+        
+        release = releases_dir / release_id
+        os.rename(staging, release)
+        
+        self._record_deployed_mtimes(release, manifest)
+        return release, manifest
+    
+    def _migrate_legacy_deployment(self, skill_name: str):
+        """将原地部署的技能目录转为第一个版本并改为符号链接（仅分阶段部署首次执行时）"""
+        deploy_path = self.deployed_dir / skill_name
+        if deploy_path.is_symlink() or not deploy_path.is_dir():
+            return
+        
+        release = self.deployed_dir / RELEASES_DIR / skill_name / f"{0:06d}"
+        os.rename(deploy_path, release)
+        self._publish_release(skill_name, release)
+        logger.info(f"已将技能转为分阶段部署: {skill_name}")
+    
+    def _release_ids(self, skill_name: str) -> List[str]:
+        """技能的全部版本号（从旧到新）"""
+        releases_dir = self.deployed_dir / RELEASES_DIR / skill_name
+        if not releases_dir.is_dir():
+            return []
+        return sorted(entry.name for entry in os.scandir(releases_dir)
+                      if entry.is_dir() and entry.name.isdigit())
+    
+    def _current_release(self, skill_name: str) -> Optional[Path]:
+        """技能当前发布的版本目录（未使用分阶段部署时为 None）"""
+        deploy_path = self.deployed_dir / skill_name
+        if not deploy_path.is_symlink():
+            return None
+        release = self.deployed_dir / os.readlink(deploy_path)
+        return release if release.is_dir() else None
+    
+    def _publish_release(self, skill_name: str, release: Path, prune: bool = True):
+        """
+        原子切换技能的当前版本（新建临时符号链接后 rename 覆盖）
+        
+        Args:
+            skill_name: 技能名称
+            release: 版本目录
+            prune: 切换后是否删除超出保留数量的旧版本
+        """
+        deploy_path = self.deployed_dir / skill_name
+        tmp_link = self.deployed_dir / f".{skill_name}.publish-{os.getpid()}-{threading.get_ident()}"
+        if tmp_link.is_symlink():
+            tmp_link.unlink()
+        
+        os.symlink(os.path.relpath(release, self.deployed_dir), tmp_link)
+        try:
+            os.replace(tmp_link, deploy_path)
+        except OSError:
+            tmp_link.unlink()
+            raise
+        
+        if prune:
+            self._prune_releases(skill_name)
+    
+    def _prune_releases(self, skill_name: str):
+        """删除超出保留数量的旧版本（当前版本始终保留）"""
+        current = self._current_release(skill_name)
+        others = [release_id for release_id in self._release_ids(skill_name)
+                  if current is None or release_id != current.name]
+        
+        releases_dir = self.deployed_dir / RELEASES_DIR / skill_name
+        for release_id in others[:max(0, len(others) - self.keep_releases)]:
+            shutil.rmtree(releases_dir / release_id, ignore_errors=True)
+    
+    def _remove_deployment(self, skill_name: str):
+        """删除技能的部署（包括分阶段部署的全部版本）"""
+        deploy_path = self.deployed_dir / skill_name
+        if deploy_path.is_symlink():
+            deploy_path.unlink()
+        elif deploy_path.exists():
+            shutil.rmtree(deploy_path)
+        
+        releases_dir = self.deployed_dir / RELEASES_DIR / skill_name
+        if releases_dir.exists():
+            shutil.rmtree(releases_dir)
+    
+    def list_releases(self, skill_name: str) -> List[Dict[str, Any]]:
+        """
+        列出技能的部署版本
+        
+        Args:
+            skill_name: 技能名称
             
-            logger.info(f"技能部署成功: {skill_name}")
-            return True
+        Returns:
+            版本列表（从旧到新），每项包含 release、current、deployed_at
+        """
+        current = self._current_release(skill_name)
+        releases = []
+        
+        for release_id in self._release_ids(skill_name):
+            config_file = self.deployed_dir / RELEASES_DIR / skill_name / release_id / "deployment.json"
+            try:
+                deployed_at = json.loads(config_file.read_text(encoding='utf-8')).get('deployed_at')
+            except (OSError, ValueError):
+                deployed_at = None
+            releases.append({
+                'release': release_id,
+                'current': current is not None and current.name == release_id,
+                'deployed_at': deployed_at
+            })
+        
+        return releases
+    
+    def rollback(self, skill_name: str, release_id: Optional[str] = None) -> bool:
+        """
+        回滚技能到之前的版本（仅分阶段部署）
+        
+        Args:
+            skill_name: 技能名称
+            release_id: 目标版本号，为 None 时回滚到当前版本的上一个版本
+            
+        Returns:
+            回滚是否成功
+        """
+        current = self._current_release(skill_name)
+        release_ids = self._release_ids(skill_name)
+        
+        if release_id is None:
+            older = [rid for rid in release_ids if current is not None and rid < current.name]
+            if not older:
+                logger.error(f"没有可回滚的版本: {skill_name}")
+                return False
+            release_id = older[-1]
+        elif release_id not in release_ids:
+            logger.error(f"版本不存在: {skill_name} {release_id}")
+            return False
+        
+        release = self.deployed_dir / RELEASES_DIR / skill_name / release_id
+        try:
+            config = json.loads((release / "deployment.json").read_text(encoding='utf-8'))
             
+            with self.skill_lock(skill_name):
+                # 回滚时不清理旧版本，保留被替换的版本以便再次切换
+                self._publish_release(skill_name, release, prune=False)
+                
+                self._update_index(skill_name, SkillRecord.from_deployment_config(
+                    config, deploy_path=str(self.deployed_dir / skill_name)))
+            logger.info(f"技能已回滚: {skill_name} -> {release_id}")
+            return True
+        
         except Exception as e:
-            logger.error(f"技能部署失败 {skill_name}: {e}")
+            logger.error(f"技能回滚失败 {skill_name}: {e}")
             return False
     
+    def skill_lock(self, skill_name: str) -> FileLock:
+        """
+        技能的跨进程独占锁（部署、卸载、回滚同一技能时互斥；读取部署状态不需要加锁）
+        
+        Args:
+            skill_name: 技能名称
+            
+        Returns:
+            尚未加锁的文件锁，可用作上下文管理器
+        """
+        return FileLock(self.deployed_dir / LOCKS_DIR / f"{skill_name}.lock", timeout=self.lock_timeout)
+    
+    def _lock(self, name: str, shared: bool = False) -> FileLock:
+        """部署目录级别的文件锁（index：索引与代数计数；objects：对象存储）"""
+        return FileLock(self.deployed_dir / LOCKS_DIR / f".{name}.lock", shared=shared, timeout=self.lock_timeout)
+    
+    def plan_deployment(self, skill_path: Path, skill_name: str) -> Dict[str, Any]:
+        """
+        计算增量部署计划（不修改任何文件，可用于预演）
+        
+        源文件与清单一致、但已部署文件缺失或大小/mtime 与清单记录不一致（被删除或修改）时，
+        同样计为变更，增量部署会重新复制该文件
+        
+        Args:
+            skill_path: 技能源路径
+            skill_name: 技能名称
+            
+        Returns:
+            部署计划 {mode: 'incremental'|'full', added, changed, removed, unchanged, manifest}，
+            其中 manifest 为已有部署的文件清单
+        """
+        source_files = self._scan_source_files(skill_path)
+        deploy_path = self.deployed_dir / skill_name
+        manifest = self._load_manifest(deploy_path)
+        
+        plan = {
+            'mode': 'incremental',
+            'added': [],
+            'changed': [],
+            'removed': [],
+            'unchanged': [],
+            'manifest': manifest or {}
+        }
+        
+        if manifest is None:
+            # 没有可用的文件清单，只能完整重建
+            plan['mode'] = 'full'
+            plan['added'] = sorted(source_files)
+            return plan
+        
+        deployed_files = self._scan_deployed_files(deploy_path)
+        
+        for rel_path, st in sorted(source_files.items()):
+            entry = manifest.get(rel_path)
+            if entry is None:
+                plan['added'].append(rel_path)
+            elif entry['size'] != st.st_size:
+                plan['changed'].append(rel_path)
+            elif not self._compare_stats({rel_path: entry}, deployed_files)[rel_path]:
+                # 已部署文件被删除或修改，需要修复
+                plan['changed'].append(rel_path)
+            elif entry['mtime_ns'] == st.st_mtime_ns:
+                plan['unchanged'].append(rel_path)
+            elif file_sha256(skill_path / rel_path) == entry['sha256']:
+                # 仅 mtime 变化，内容相同
+                plan['unchanged'].append(rel_path)
+            else:
+                plan['changed'].append(rel_path)
+        
+        plan['removed'] = sorted(rel_path for rel_path in manifest if rel_path not in source_files)
+        return plan
+    
+    def _apply_plan(self, skill_path: Path, deploy_path: Path, plan: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        执行增量部署计划
+        
+        Args:
+            skill_path: 技能源路径
+            deploy_path: 部署路径
+            plan: plan_deployment 返回的部署计划
+            
+        Returns:
+            新的文件清单
+        """
+        # 删除源中已不存在的文件
+        for rel_path in plan['removed']:
+            target = deploy_path / rel_path
+            if target.exists():
+                target.unlink()
+            self._prune_empty_dirs(target.parent, deploy_path)
+        
+        copied_manifest, manifest = self._plan_manifests(skill_path, plan)
+        self._copy_planned_files(skill_path, deploy_path, copied_manifest)
+        return manifest
+    
+    def _plan_manifests(self, skill_path: Path,
+                        plan: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        计算增量部署计划对应的清单
+        
+        Args:
+            skill_path: 技能源路径
+            plan: plan_deployment 返回的部署计划
+            
+        Returns:
+            (需要复制的文件清单, 部署后的完整清单)
+        """
+        old_manifest = plan['manifest']
+        copied = plan['added'] + plan['changed']
+        source_files = {rel_path: (skill_path / rel_path).stat() for rel_path in copied + plan['unchanged']}
+        copied_manifest = self._build_manifest(skill_path, {rel_path: source_files[rel_path] for rel_path in copied})
+        
+        manifest = {rel_path: old_manifest[rel_path] for rel_path in plan['unchanged']}
+        
+        # 未变文件若 mtime 变化（内容相同），刷新清单中的 mtime
+        for rel_path in plan['unchanged']:
+            manifest[rel_path] = dict(manifest[rel_path], mtime_ns=source_files[rel_path].st_mtime_ns)
+        
+        manifest.update(copied_manifest)
+        return copied_manifest, dict(sorted(manifest.items()))
+    
+    def _copy_planned_files(self, skill_path: Path, deploy_path: Path, copied_manifest: Dict[str, Dict[str, Any]]):
+        """
+        复制新增和变更的文件
+        
+        Args:
+            skill_path: 技能源路径
+            deploy_path: 部署路径
+            copied_manifest: 需要复制的文件清单
+        """
+        if self.object_store:
+            self._materialize_files(skill_path, deploy_path, copied_manifest)
+        else:
+            for rel_path in copied_manifest:
+                target = deploy_path / rel_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                # 先删除旧文件：它可能是对象存储或其他版本的硬链接，不能原地覆盖共享的 inode
+                if target.exists() or target.is_symlink():
+                    target.unlink()
+                copy_file(skill_path / rel_path, target, self.transfer_stats)
+    
+    def _materialize_files(self, skill_path: Path, deploy_path: Path, manifest: Dict[str, Dict[str, Any]]):
+        """
+        通过对象存储部署文件（存入对象后以硬链接/reflink/复制方式生成）
+        
+        Args:
+            skill_path: 技能源路径
+            deploy_path: 部署路径
+            manifest: 需要部署的文件清单
+        """
+        # 共享锁：对象存入后到生成硬链接之前引用计数为 1，期间不能被清理
+        with self._lock("objects", shared=True):
+            for rel_path, entry in manifest.items():
+                digest = self.object_store.put(skill_path / rel_path, entry['sha256'])
+                self.object_store.materialize(digest, deploy_path / rel_path)
+    
+    @staticmethod
+    def _prune_empty_dirs(directory: Path, stop_at: Path):
+        """删除空目录，逐级向上直到 stop_at（不含）"""
+        while directory != stop_at and directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+            directory = directory.parent
+    
+    def _scan_source_files(self, skill_path: Path) -> Dict[str, os.stat_result]:
+        """
+        收集需要部署的源文件
+        
+        Args:
+            skill_path: 技能源路径
+            
+        Returns:
+            {相对路径(posix): stat 结果}
+        """
+        files = {}
+        
+        skill_file = skill_path / "SKILL.md"
+        if skill_file.exists():
+            files["SKILL.md"] = skill_file.stat()
+        
+        for resource_dir in RESOURCE_DIRS:
+            resource_src = skill_path / resource_dir
+            if not resource_src.is_dir():
+                continue
+            for root, _, filenames in os.walk(resource_src):
+                for filename in filenames:
+                    full_path = Path(root) / filename
+                    files[full_path.relative_to(skill_path).as_posix()] = full_path.stat()
+        
+        return files
+    
+    def _build_manifest(self, skill_path: Path, source_files: Dict[str, os.stat_result]) -> Dict[str, Dict[str, Any]]:
+        """
+        为源文件生成清单条目
+        
+        Args:
+            skill_path: 技能源路径
+            source_files: {相对路径: stat 结果}
+            
+        Returns:
+            {相对路径: {size, mtime_ns, sha256}}
+        """
+        return {
+            rel_path: {
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'sha256': file_sha256(skill_path / rel_path)
+            }
+            for rel_path, st in sorted(source_files.items())
+        }
+    
+    @staticmethod
+    def _scan_deployed_files(deploy_path: Path) -> Dict[str, Tuple[int, int]]:
+        """
+        扫描已部署目录中的文件（每个目录一次 scandir，不对单个文件额外 stat）
+        
+        Args:
+            deploy_path: 部署路径
+            
+        Returns:
+            {相对路径(posix): (size, mtime_ns)}
+        """
+        files = {}
+        pending = [(str(deploy_path), '')]
+        
+        while pending:
+            directory, prefix = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        rel_path = prefix + entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append((entry.path, rel_path + '/'))
+                        elif entry.is_file():
+                            st = entry.stat()
+                            files[rel_path] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                continue
+        
+        return files
+    
+    def _record_deployed_mtimes(self, deploy_path: Path, manifest: Dict[str, Dict[str, Any]]):
+        """
+        在清单中记录已部署文件的 mtime（deployed_mtime_ns）
+        
+        对象存储中的硬链接共享同一 inode，已部署文件的 mtime 不一定等于源文件 mtime，因此单独记录
+        
+        Args:
+            deploy_path: 部署路径
+            manifest: 文件清单（原地更新）
+        """
+        deployed_files = self._scan_deployed_files(deploy_path)
+        for rel_path, entry in manifest.items():
+            if rel_path in deployed_files:
+                entry['deployed_mtime_ns'] = deployed_files[rel_path][1]
+    
+    def _load_manifest(self, deploy_path: Path) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        读取已有部署的文件清单
+        
+        Args:
+            deploy_path: 部署路径
+            
+        Returns:
+            文件清单；不存在、无法读取或部署时的文件存储方式与当前不同
+            （对象存储硬链接与普通复制之间切换，需要完整重建）时返回 None
+        """
+        config_file = deploy_path / "deployment.json"
+        if not config_file.exists():
+            return None
+        
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取部署清单失败 {config_file}: {e}")
+            return None
+        
+        if config.get('store') != self.store_mode:
+            logger.debug(f"文件存储方式变化 ({config.get('store')} -> {self.store_mode})，完整重建: {deploy_path}")
+            return None
+        
+        return config.get('manifest')
+    
     def _copy_skill_files(self, src_path: Path, dst_path: Path):
         """
         复制技能文件
@@ -83,36 +763,65 @@ class SkillDeployer:
         # 复制 SKILL.md 文件
         skill_file = src_path / "SKILL.md"
         if skill_file.exists():
-            shutil.copy2(skill_file, dst_path / "SKILL.md")
+            copy_file(skill_file, dst_path / "SKILL.md", self.transfer_stats)
         
         # 复制资源文件
-        resource_dirs = ['scripts', 'resources', 'examples', 'templates']
-        
-        for resource_dir in resource_dirs:
+        for resource_dir in RESOURCE_DIRS:
             resource_src = src_path / resource_dir
             if resource_src.exists() and resource_src.is_dir():
-                resource_dst = dst_path / resource_dir
-                shutil.copytree(resource_src, resource_dst, dirs_exist_ok=True)
+                copy_tree(resource_src, dst_path / resource_dir, self.transfer_stats)
     
-    def _generate_deployment_config(self, deploy_path: Path, skill_info: Dict[str, Any]):
+    def _generate_deployment_config(self, deploy_path: Path, skill_info: Dict[str, Any],
+                                    manifest: Optional[Dict[str, Dict[str, Any]]] = None):
         """
         生成部署配置
         
+        内容除部署时间外与现有 deployment.json 相同时沿用原部署时间且不重写文件，
+        重复部署未变更的技能不会改变 deployment.json 与 USAGE.md 的 mtime
+        
         Args:
             deploy_path: 部署路径
             skill_info: 技能信息
+            manifest: 部署文件清单 {相对路径: {size, mtime_ns, sha256}}
+            
+        Returns:
+            写入 deployment.json 的配置
         """
+        config_file = deploy_path / "deployment.json"
         config = {
             'skill_name': skill_info['name'],
             'metadata': skill_info.get('metadata', {}),
-            'deployed_at': str(Path(deploy_path).stat().st_ctime),
+            'deployed_at': str(time.time()),
             'source': skill_info.get('source', 'unknown'),
-            'resources': self._discover_deployed_resources(deploy_path)
+            'resources': self._discover_deployed_resources(deploy_path),
+            'store': self.store_mode,
+            'manifest': manifest or {}
         }
         
-        config_file = deploy_path / "deployment.json"
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        previous_deployed_at = self._read_deployed_at(config_file)
+        if previous_deployed_at is not None:
+            unchanged = dict(config, deployed_at=previous_deployed_at)
+            if self._same_content(config_file, self._render_config(unchanged)):
+                return unchanged
+        
+        # 原子替换：不加锁的读取方只会看到旧的或新的完整清单
+        self._atomic_write(config_file, self._render_config(config))
+        
+        return config
+    
+    @staticmethod
+    def _render_config(config: Dict[str, Any]) -> str:
+        """序列化部署配置"""
+        return json.dumps(config, indent=2, ensure_ascii=False)
+    
+    @staticmethod
+    def _read_deployed_at(config_file: Path) -> Optional[str]:
+        """读取现有部署配置中的部署时间，不存在或无法读取时返回 None"""
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('deployed_at')
+        except (OSError, ValueError, AttributeError):
+            return None
     
     def _discover_deployed_resources(self, deploy_path: Path) -> List[str]:
         """
@@ -124,106 +833,157 @@ class SkillDeployer:
         Returns:
             资源文件列表
         """
-        resources = []
-        
-        for file_path in deploy_path.rglob('*'):
-            if file_path.is_file() and file_path.name != "deployment.json":
-                relative_path = file_path.relative_to(deploy_path)
-                resources.append(str(relative_path))
+        # USAGE.md 在部署配置之后生成，首次部署时也列入，保证重复部署时资源列表不变
+        resources = sorted(set(self._scan_deployed_files(deploy_path)) - {"deployment.json"} | {"USAGE.md"})
         
         return resources
     
-    def _generate_usage_guide(self, deploy_path: Path, skill_info: Dict[str, Any]):
+    def _generate_usage_guide(self, deploy_path: Path, skill_info: Dict[str, Any],
+                              deployed_at: Optional[str] = None):
         """
-        生成使用说明文件
+        生成使用说明文件（内容与现有文件相同时不重写）
         
         Args:
             deploy_path: 部署路径
             skill_info: 技能信息
+            deployed_at: 部署时间（deployment.json 中的时间戳），为 None 时使用当前时间
         """
         metadata = skill_info.get('metadata', {})
-        content = skill_info.get('content', '')
         
-        usage_content = f"""# {metadata.get('name', 'Unknown Skill')} 使用指南
-
-## 技能描述
-{metadata.get('description', '暂无描述')}
-
-## 版本信息
-- 版本: {metadata.get('version', '1.0.0')}
-- 作者: {metadata.get('author', '未知')}
-- 部署时间: {Path(deploy_path).stat().st_ctime}
-
-## 技能内容
-{content}
-
-## 使用方法
-
-1. 确保已安装必要的依赖
-2. 按照技能说明进行操作
-3. 如有问题，请参考技能文档
-
-## 文件结构
-
-```
-{deploy_path.name}/
-├── SKILL.md          # 技能主文件
-├── deployment.json   # 部署配置
-└── [其他资源文件]     # 技能相关资源
-```
-"""
+        usage_content = USAGE_TEMPLATE.substitute(
+            title=metadata.get('name', 'Unknown Skill'),
+            description=metadata.get('description', '暂无描述'),
+            version=metadata.get('version', '1.0.0'),
+            author=metadata.get('author', '未知'),
+            deployed_at=time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(
+                float(deployed_at) if deployed_at is not None else time.time())),
+            content=skill_info.get('content', ''),
+            skill_name=skill_info['name']
+        )
         
-        usage_file = deploy_path / "USAGE.md"
-        usage_file.write_text(usage_content, encoding='utf-8')
+        if not self._same_content(deploy_path / "USAGE.md", usage_content):
+            self._atomic_write(deploy_path / "USAGE.md", usage_content)
     
-    def get_deployment_status(self, skill_name: str) -> Optional[Dict[str, Any]]:
+    def get_deployment_status(self, skill_name: str, verify: bool = False,
+                              level: str = 'stat') -> Optional[SkillRecord]:
         """
         获取技能的部署状态
         
         Args:
             skill_name: 技能名称
+            verify: 是否按清单中的 SHA-256 校验已部署文件的内容（等同于 level='verify'）
+            level: 检查级别（见 STATUS_LEVELS）
             
         Returns:
-            部署状态信息
+            部署状态记录（stat/verify 级别额外包含 integrity 与 intact 字段）
         """
+        if verify:
+            level = 'verify'
+        if level not in STATUS_LEVELS:
+            raise ValueError(f"未知的状态检查级别: {level}")
+        
         deploy_path = self.deployed_dir / skill_name
         config_file = deploy_path / "deployment.json"
         
-        if not config_file.exists():
-            return None
-        
         try:
             with open(config_file, 'r', encoding='utf-8') as f:
                 config = json.load(f)
-            
-            # 检查文件完整性
-            config['files_exist'] = self._check_files_exist(deploy_path, config.get('resources', []))
-            config['deploy_path'] = str(deploy_path)
-            
-            return config
-            
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.error(f"读取部署状态失败 {skill_name}: {e}")
             return None
+        
+        manifest = config.get('manifest') or {}
+        # 没有清单的旧部署按资源列表检查
+        expected_files = list(manifest) or [Path(r).as_posix() for r in config.get('resources', [])]
+        
+        if level == 'quick':
+            return SkillRecord.from_deployment_config(
+                config,
+                files_exist={rel_path: True for rel_path in expected_files},
+                deploy_path=str(deploy_path)
+            )
+        
+        deployed_files = self._scan_deployed_files(deploy_path)
+        status = SkillRecord.from_deployment_config(
+            config,
+            files_exist={rel_path: rel_path in deployed_files for rel_path in expected_files},
+            deploy_path=str(deploy_path)
+        )
+        
+        if level == 'verify':
+            status.integrity = self._verify_files(deploy_path, manifest)
+        else:
+            status.integrity = self._compare_stats(manifest, deployed_files)
+        status.intact = all(status.files_exist.values()) and all(status.integrity.values())
+        
+        return status
+    
+    @staticmethod
+    def _compare_stats(manifest: Dict[str, Dict[str, Any]],
+                       deployed_files: Dict[str, Tuple[int, int]]) -> Dict[str, bool]:
+        """
+        按清单比较已部署文件的大小和 mtime
+        
+        Args:
+            manifest: 文件清单
+            deployed_files: _scan_deployed_files 的结果
+            
+        Returns:
+            {相对路径: 大小与 mtime 是否与部署时一致}
+        """
+        result = {}
+        
+        for rel_path, entry in manifest.items():
+            stat = deployed_files.get(rel_path)
+            if stat is None or stat[0] != entry['size']:
+                result[rel_path] = False
+            else:
+                # 旧清单没有记录部署时的 mtime，只能比较大小
+                deployed_mtime_ns = entry.get('deployed_mtime_ns')
+                result[rel_path] = deployed_mtime_ns is None or stat[1] == deployed_mtime_ns
+        
+        return result
     
-    def _check_files_exist(self, deploy_path: Path, expected_files: List[str]) -> Dict[str, bool]:
+    def _verify_files(self, deploy_path: Path, manifest: Dict[str, Dict[str, Any]],
+                      max_workers: Optional[int] = None) -> Dict[str, bool]:
         """
-        检查文件是否存在
+        按清单并行校验已部署文件的内容
         
         Args:
             deploy_path: 部署路径
-            expected_files: 期望的文件列表
+            manifest: 文件清单
+            max_workers: 校验线程数（默认 min(32, CPU 数 + 4)）
             
         Returns:
-            文件存在状态字典
+            {相对路径: 内容是否与清单摘要一致}
         """
-        file_status = {}
+        def check(item):
+            rel_path, entry = item
+            try:
+                return rel_path, file_sha256(deploy_path / rel_path) == entry['sha256']
+            except OSError:
+                return rel_path, False
         
-        for file_path in expected_files:
-            full_path = deploy_path / file_path
-            file_status[file_path] = full_path.exists()
+        if len(manifest) <= 1:
+            return dict(map(check, manifest.items()))
         
-        return file_status
+        # hashlib 在计算大块数据时会释放 GIL，线程池即可并行
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(executor.map(check, manifest.items()))
+    
+    def collect_garbage(self) -> int:
+        """
+        清理对象存储中不再被引用的对象
+        
+        Returns:
+            删除的对象数量（未启用对象存储时为 0）
+        """
+        if not self.object_store:
+            return 0
+        with self._lock("objects"):
+            return self.object_store.gc()
     
     def undeploy_skill(self, skill_name: str) -> bool:
         """
@@ -237,12 +997,15 @@ class SkillDeployer:
         """
         deploy_path = self.deployed_dir / skill_name
         
-        if not deploy_path.exists():
+        if not deploy_path.exists() and not deploy_path.is_symlink():
             logger.warning(f"技能未部署: {skill_name}")
             return True
         
         try:
-            shutil.rmtree(deploy_path)
+            with self.skill_lock(skill_name):
+                self._remove_deployment(skill_name)
+                self._update_index(skill_name, None)
+            self.collect_garbage()
             logger.info(f"技能卸载成功: {skill_name}")
             return True
             
@@ -250,64 +1013,331 @@ class SkillDeployer:
             logger.error(f"技能卸载失败 {skill_name}: {e}")
             return False
     
-    def list_deployed_skills(self) -> List[Dict[str, Any]]:
+    def list_deployed_skills(self, level: str = 'quick') -> List[SkillRecord]:
         """
         列出所有已部署的技能
         
+        Args:
+            level: 状态检查级别（见 STATUS_LEVELS，默认只读取清单）
+        
         Returns:
-            已部署技能信息列表
+            已部署技能记录列表
         """
         deployed_skills = []
         
         if not self.deployed_dir.exists():
             return deployed_skills
         
-        for item in self.deployed_dir.iterdir():
-            if item.is_dir():
-                status = self.get_deployment_status(item.name)
-                if status:
-                    deployed_skills.append(status)
+        with os.scandir(self.deployed_dir) as entries:
+            names = sorted(entry.name for entry in entries
+                           if entry.is_dir() and not entry.name.startswith('.'))
+        
+        for name in names:
+            status = self.get_deployment_status(name, level=level)
+            if status:
+                deployed_skills.append(status)
         
         return deployed_skills
     
-    def generate_skill_index(self) -> Dict[str, Any]:
+    def export_bundle(self, bundle_path: str, skill_names: Optional[List[str]] = None) -> List[str]:
+        """
+        将已部署技能打包为单个技能包文件（见 skill_bundle）
+        
+        deployment.json 写入技能包目录，其余已部署文件写入数据区；大小与 mtime 和清单一致的
+        文件直接使用清单中的 SHA-256，不重新计算
+        
+        Args:
+            bundle_path: 技能包文件路径
+            skill_names: 要打包的技能，为 None 时打包全部已部署技能
+        
+        Returns:
+            已打包的技能名称列表
+        """
+        if skill_names is None:
+            skill_names = [skill['name'] for skill in self.list_deployed_skills()]
+        
+        packed = []
+        with SkillBundleWriter(bundle_path, self.transfer_stats) as writer:
+            for skill_name in skill_names:
+                deploy_path = self.deployed_dir / skill_name
+        
+                # 持有技能锁，避免打包到一半的技能被重新部署
+                with self.skill_lock(skill_name):
+                    try:
+                        with open(deploy_path / "deployment.json", 'r', encoding='utf-8') as f:
+                            config = json.load(f)
+                    except FileNotFoundError:
+                        logger.warning(f"技能未部署，跳过打包: {skill_name}")
+                        continue
+        
+                    manifest = config.get('manifest') or {}
+                    deployed_files = self._scan_deployed_files(deploy_path)
+                    deployed_files.pop("deployment.json", None)
+                    unchanged = self._compare_stats(manifest, deployed_files)
+        
+                    writer.add_skill(
+                        skill_name,
+                        {rel_path: deploy_path / rel_path for rel_path in deployed_files},
+                        config=config,
+                        digests={rel_path: manifest[rel_path]['sha256']
+                                 for rel_path, same in unchanged.items() if same}
+                    )
+                packed.append(skill_name)
+        
+        logger.info(f"已打包 {len(packed)} 个技能: {bundle_path}")
+        return packed
+    
+    def generate_skill_index(self, rebuild: bool = False) -> Dict[str, Any]:
         """
-        生成技能索引
+        获取技能索引
         
+        索引由 deploy_skill/undeploy_skill 增量维护；仅在 rebuild=True、索引文件缺失或损坏、
+        或索引记录的代数与部署目录的代数计数不一致时完整重建
+        
+        Args:
+            rebuild: 是否强制完整重建
+            
         Returns:
             技能索引信息
         """
-        deployed_skills = self.list_deployed_skills()
+        with span('index', rebuild=rebuild) as index_span:
+            with self._index_lock:
+                generation = self._read_generation()
+                index = None if rebuild else self._load_index()
+                
+                # 索引是最新的：不需要文件锁
+                if index is not None and index.get('generation') == generation:
+                    return index
+                
+                with self._lock("index"):
+                    # 加锁后重新读取，其他进程可能已经完成了重建
+                    generation = self._read_generation()
+                    index = None if rebuild else self._load_index()
+                    if index is not None and index.get('generation') == generation:
+                        return index
+                    
+                    if not rebuild:
+                        logger.info(f"技能索引与部署目录不同步，完整重建")
+                    index = self._build_index(generation)
+                    self._write_index(index)
+                    index_span.add(skills=index['total_skills'])
+            
+            if rebuild:
+                self.sync_catalog(rebuild=True)
+            return index
+    
+    def sync_catalog(self, rebuild: bool = False) -> Optional[SkillCatalog]:
+        """
+        确保技能目录与部署目录同步（代数不一致或 rebuild=True 时完整重建）
         
+        Args:
+            rebuild: 是否强制完整重建
+            
+        Returns:
+            技能目录，未启用时返回 None
+        """
+        if not self.catalog:
+            return None
+        
+        with self._index_lock, self._lock("index"):
+            generation = self._read_generation()
+            if rebuild or self.catalog.generation != generation:
+                self.catalog.replace_all(self.list_deployed_skills(), generation)
+        
+        return self.catalog
+    
+    def _build_index(self, generation: int) -> Dict[str, Any]:
+        """
+        读取全部 deployment.json 完整构建技能索引
+        
+        Args:
+            generation: 索引对应的部署代数
+            
+        Returns:
+            技能索引信息
+        """
         index = {
-            'total_skills': len(deployed_skills),
+            'total_skills': 0,
             'skills': [],
             'categories': {},
-            'last_updated': str(Path(self.deployed_dir).stat().st_mtime)
+            'generation': generation,
+            'last_updated': str(time.time())
         }
         
-        for skill in deployed_skills:
-            skill_info = {
-                'name': skill.get('skill_name'),
-                'metadata': skill.get('metadata', {}),
-                'deployed_at': skill.get('deployed_at'),
-                'files_exist': skill.get('files_exist', {})
+        # 一次遍历生成全部条目并统计分类（list_deployed_skills 已按名称排序，只需排序一次兜底）
+        skills = index['skills']
+        categories = index['categories']
+        for skill in self.list_deployed_skills():
+            skills.append(self._index_entry(skill.name, skill))
+            category = skill.metadata.get('category', 'uncategorized')
+            categories[category] = categories.get(category, 0) + 1
+        
+        skills.sort(key=lambda entry: entry['name'])
+        index['total_skills'] = len(skills)
+        return index
+    
+    @staticmethod
+    def _index_entry(skill_name: str, skill: SkillRecord) -> Dict[str, Any]:
+        """生成技能的索引条目"""
+        return {
+            'name': skill_name,
+            'metadata': skill.metadata,
+            'deployed_at': skill.deployed_at,
+            'files_exist': skill.files_exist or {
+                rel_path: True for rel_path in (skill.manifest or skill.resources or [])
             }
-            
-            index['skills'].append(skill_info)
+        }
+    
+    @staticmethod
+    def _apply_index_delta(index: Dict[str, Any], skill_name: str, skill: Optional[SkillRecord]):
+        """
+        对索引应用单个技能的变更（新增/更新或删除），同步调整分类计数
+        
+        索引条目按名称排序，用二分查找定位，不重新排序
+        
+        Args:
+            index: 技能索引（原地修改）
+            skill_name: 技能名称
+            skill: 技能记录，为 None 时表示删除
+        """
+        skills = index['skills']
+        categories = index['categories']
+        
+        position = bisect.bisect_left([entry['name'] for entry in skills], skill_name)
+        
+        # 移除旧条目
+        if position < len(skills) and skills[position]['name'] == skill_name:
+            category = skills[position]['metadata'].get('category', 'uncategorized')
+            categories[category] -= 1
+            if categories[category] <= 0:
+                del categories[category]
+            del skills[position]
+        
+        if skill is not None:
+            skills.insert(position, SkillDeployer._index_entry(skill_name, skill))
             
             # 按分类统计
-            category = skill.get('metadata', {}).get('category', 'uncategorized')
-            if category not in index['categories']:
-                index['categories'][category] = 0
-            index['categories'][category] += 1
+            category = skill.metadata.get('category', 'uncategorized')
+            categories[category] = categories.get(category, 0) + 1
         
-        # 保存索引文件
-        index_file = self.config_dir / "skill_index.json"
-        with open(index_file, 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2, ensure_ascii=False)
+        index['total_skills'] = len(skills)
+    
+    def _update_index(self, skill_name: str, skill: Optional[SkillRecord]):
+        """
+        部署或卸载后递增部署代数并增量更新索引
+        
+        索引代数与更新前的部署代数不一致时说明索引已不同步，改为完整重建
+        
+        Args:
+            skill_name: 技能名称
+            skill: 技能记录，为 None 时表示已卸载
+        """
+        try:
+            with self._index_lock, self._lock("index"):
+                generation = self._read_generation()
+                index = self._load_index()
+                self._write_generation(generation + 1)
+                
+                if index is None or index.get('generation') != generation:
+                    index = self._build_index(generation + 1)
+                else:
+                    self._apply_index_delta(index, skill_name, skill)
+                    index['generation'] = generation + 1
+                    index['last_updated'] = str(time.time())
+                
+                self._write_index(index)
+                self._update_catalog(skill_name, skill, generation)
+        except Exception as e:
+            # 索引更新失败不影响部署结果，下次读取时会因代数不一致而重建
+            logger.warning(f"更新技能索引失败 {skill_name}: {e}")
+    
+    def _update_catalog(self, skill_name: str, skill: Optional[SkillRecord], generation: int):
+        """
+        增量更新技能目录（调用方持有索引锁）
         
+        Args:
+            skill_name: 技能名称
+            skill: 技能记录，为 None 时表示已卸载
+            generation: 更新前的部署代数
+        """
+        if not self.catalog:
+            return
+        
+        if self.catalog.generation != generation:
+            self.catalog.replace_all(self.list_deployed_skills(), generation + 1)
+        elif skill is None:
+            self.catalog.remove(skill_name, generation + 1)
+        else:
+            self.catalog.upsert(skill, generation + 1)
+    
+    def _read_generation(self) -> int:
+        """读取部署代数计数（不存在或无法解析时为 0）"""
+        try:
+            return int((self.deployed_dir / GENERATION_FILE).read_text(encoding='utf-8').strip())
+        except (OSError, ValueError):
+            return 0
+    
+    def _write_generation(self, generation: int):
+        """写入部署代数计数"""
+        self._atomic_write(self.deployed_dir / GENERATION_FILE, str(generation))
+    
+    def _load_index(self) -> Optional[Dict[str, Any]]:
+        """读取已有的技能索引，不存在或无法读取时返回 None"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取技能索引失败 {self.index_file}: {e}")
+            return None
+        
+        if not isinstance(index, dict) or not {'skills', 'categories'} <= index.keys():
+            return None
         return index
+    
+    def _write_index(self, index: Dict[str, Any]):
+        """保存技能索引"""
+        self._atomic_write(self.index_file, json.dumps(index, indent=2, ensure_ascii=False))
+    
+    @staticmethod
+    def _same_content(path: Path, text: str) -> bool:
+        """
+        判断文件内容是否与给定文本相同（先比较大小，再比较 SHA-256）
+        
+        Args:
+            path: 文件路径
+            text: 将要写入的文本
+            
+        Returns:
+            文件存在且内容相同时返回 True
+        """
+        data = text.encode('utf-8')
+        try:
+            if os.stat(path).st_size != len(data):
+                return False
+            return file_sha256(path) == hashlib.sha256(data).hexdigest()
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _atomic_write(path: Path, text: str):
+        """先写入临时文件再原子替换，避免读取到写了一半的文件"""
+        fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+        try:
+            # mkstemp 创建的文件权限为 0600，改为与原文件一致（新文件为 0644）
+            try:
+                mode = os.stat(path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(tmp_name, mode)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
 
 
 def main():
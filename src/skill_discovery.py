@@ -0,0 +1,100 @@
+"""
+技能发现 - 基于 os.scandir 的单次遍历技能发现引擎
+
+SkillManager.discover_skills 与 generate_skill_list.scan_skills_directory 共用此模块
+"""
+
+import os
+import fnmatch
+import logging
+from typing import List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 默认忽略的目录
+DEFAULT_IGNORE = ('.git', 'node_modules', '__pycache__', '.objects')
+
+
+class DiscoveredSkill(NamedTuple):
+    """发现的技能记录"""
+    name: str          # 相对于根目录的路径（posix 格式），深度为 1 时即目录名
+    path: str          # 技能目录路径
+    skill_file: str    # SKILL.md 路径
+    mtime_ns: int      # SKILL.md 修改时间
+    size: int          # SKILL.md 大小
+
+
+def _is_ignored(name: str, ignore: Sequence[str]) -> bool:
+    """判断目录名是否匹配忽略模式"""
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in ignore)
+
+
+def discover_skill_dirs(root: str, max_depth: Optional[int] = 1,
+                        ignore: Sequence[str] = DEFAULT_IGNORE,
+                        nested: bool = False) -> List[DiscoveredSkill]:
+    """
+    发现根目录下所有包含 SKILL.md 的技能目录
+
+    每个目录只 scandir 一次，并复用 DirEntry 缓存的类型信息；
+    处于最大深度的目录不再展开，只对其 SKILL.md 做一次 stat
+
+    Args:
+        root: 根目录
+        max_depth: 技能目录相对根目录的最大深度（None 表示不限）
+        ignore: 忽略的目录名模式（fnmatch 语法）
+        nested: 是否继续在技能目录内部查找嵌套技能
+
+    Returns:
+        按名称排序的技能记录列表
+    """
+    skills: List[DiscoveredSkill] = []
+    root = os.fspath(root)
+
+    if not os.path.isdir(root):
+        logger.warning(f"技能目录不存在: {root}")
+        return skills
+
+    # 栈元素：(目录路径, 相对路径, 深度)
+    stack = [(root, '', 0)]
+
+    while stack:
+        dir_path, rel_path, depth = stack.pop()
+        at_leaf = max_depth is not None and depth >= max_depth
+
+        if at_leaf:
+            # 最大深度：无需展开目录，直接检查 SKILL.md
+            skill_file = os.path.join(dir_path, "SKILL.md")
+            try:
+                st = os.stat(skill_file)
+            except OSError:
+                continue
+            skills.append(DiscoveredSkill(rel_path, dir_path, skill_file, st.st_mtime_ns, st.st_size))
+            continue
+
+        subdirs = []
+        skill_entry = None
+
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.name == "SKILL.md":
+                        skill_entry = entry
+                    elif entry.is_dir() and not _is_ignored(entry.name, ignore):
+                        subdirs.append(entry)
+        except OSError as e:
+            logger.debug(f"无法读取目录 {dir_path}: {e}")
+            continue
+
+        is_skill = depth > 0 and skill_entry is not None and skill_entry.is_file()
+        if is_skill:
+            st = skill_entry.stat()
+            skills.append(DiscoveredSkill(rel_path, dir_path, skill_entry.path, st.st_mtime_ns, st.st_size))
+            if not nested:
+                continue
+
+        for entry in subdirs:
+            child_rel = f"{rel_path}/{entry.name}" if rel_path else entry.name
+            stack.append((entry.path, child_rel, depth + 1))
+
+    skills.sort(key=lambda skill: skill.name)
+    return skills
@@ -0,0 +1,166 @@
+"""
+技能头部读取 - SKILL.md 的 YAML 头部流式读取、快速解析与正文按偏移读取
+
+只读取到 YAML 头部结束的 `---` 为止，Markdown 正文在真正访问时才读取
+"""
+
+import re
+import yaml
+import logging
+from typing import Dict, Any, Optional, Tuple
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 优先使用 libyaml 实现的 CSafeLoader
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# 扁平 `key: value` 行
+_FLAT_LINE_RE = re.compile(r'([A-Za-z_][A-Za-z0-9_-]*):(?:[ ]+(.*))?$')
+
+# 不能作为普通标量开头的 YAML 指示符
+_INDICATORS = frozenset('-?:,[]{}#&*!|>\'"%@`')
+
+# SafeLoader 的隐式类型解析规则 {首字符: [(tag, regexp)]}
+_IMPLICIT_RESOLVERS = yaml.SafeLoader.yaml_implicit_resolvers
+
+
+def _is_plain_string(value: str) -> bool:
+    """
+    判断文本作为 YAML 普通标量时是否一定解析为相同的字符串
+
+    任何可能被解析为其他类型（数字、布尔、日期、null）或包含特殊语法的值都返回 False
+    """
+    if not value or value[0] in _INDICATORS:
+        return False
+    if ': ' in value or ' #' in value or value.endswith(':') or '\t' in value:
+        return False
+    if not value.isprintable():
+        return False
+    for _, regexp in _IMPLICIT_RESOLVERS.get(value[0], ()):
+        if regexp.match(value):
+            return False
+    return True
+
+
+def _parse_flat_frontmatter(yaml_text: str) -> Optional[Dict[str, str]]:
+    """
+    快速解析只包含扁平 `key: value` 字符串的头部
+
+    Returns:
+        解析结果，遇到任何无法确定与 YAML 语义一致的行时返回 None
+    """
+    result = {}
+
+    for line in yaml_text.split('\n'):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+
+        match = _FLAT_LINE_RE.match(line.rstrip())
+        if not match:
+            return None
+
+        key, value = match.groups()
+        if value is None or not _is_plain_string(key) or not _is_plain_string(value):
+            return None
+
+        result[key] = value
+
+    return result or None
+
+
+def parse_frontmatter(yaml_text: str) -> Any:
+    """
+    解析 YAML 头部
+
+    扁平 `key: value` 头部走手写快速路径，其余情况交给 CSafeLoader（不可用时为 SafeLoader），
+    结果与 yaml.safe_load 一致
+
+    Args:
+        yaml_text: YAML 文本
+
+    Returns:
+        解析结果（与 yaml.safe_load 相同）
+
+    Raises:
+        yaml.YAMLError: YAML 格式错误
+    """
+    result = _parse_flat_frontmatter(yaml_text)
+    if result is not None:
+        return result
+    return yaml.load(yaml_text, Loader=YAML_LOADER)
+
+
+def compute_body_offset(raw: bytes) -> Optional[int]:
+    """
+    计算 SKILL.md 中 Markdown 正文的字节偏移
+
+    Args:
+        raw: SKILL.md 原始字节内容
+
+    Returns:
+        正文起始字节偏移，格式不正确时返回 None
+    """
+    if not raw.startswith(b'---'):
+        return None
+
+    end = raw.find(b'---', 3)
+    if end < 0:
+        return None
+
+    return end + 3
+
+
+def read_frontmatter(file_path: Path) -> Optional[Tuple[str, int]]:
+    """
+    逐行读取 SKILL.md 的 YAML 头部，读到结束标记即停止
+
+    与 content.split('---', 2) 的切分规则一致
+
+    Args:
+        file_path: SKILL.md 路径
+
+    Returns:
+        (YAML 文本, 正文起始字节偏移)，格式不正确时返回 None
+    """
+    chunks = []
+    offset = 0
+
+    with open(file_path, 'rb') as f:
+        first = f.readline()
+        if not first.startswith(b'---'):
+            return None
+
+        line = first[3:]
+        offset = 3
+        while line:
+            end = line.find(b'---')
+            if end >= 0:
+                chunks.append(line[:end])
+                yaml_text = b''.join(chunks).decode('utf-8')
+                return yaml_text.replace('\r\n', '\n').replace('\r', '\n'), offset + end + 3
+            chunks.append(line)
+            offset += len(line)
+            line = f.readline()
+
+    return None
+
+
+def read_body(skill_file: Path, offset: int) -> str:
+    """
+    从指定偏移读取 Markdown 正文
+
+    Args:
+        skill_file: SKILL.md 路径
+        offset: 正文起始字节偏移
+
+    Returns:
+        去除首尾空白后的正文（换行符已统一为 \\n）
+    """
+    with open(skill_file, 'rb') as f:
+        f.seek(offset)
+        body = f.read().decode('utf-8')
+
+    return body.replace('\r\n', '\n').replace('\r', '\n').strip()
+
@@ -4,41 +4,130 @@
 处理 SKILL.md 文件的 YAML 头部解析、Markdown 内容处理等
 """
 
-import re
+import os
 import yaml
 import logging
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple
 from pathlib import Path
 
+try:
+    from .skill_frontmatter import parse_frontmatter, read_body, read_frontmatter
+    from .skill_record import SkillRecord
+    from .skill_markdown import parse_markdown
+    from .skill_commands import CommandExtractor, CommandMatch
+except ImportError:
+    from skill_frontmatter import parse_frontmatter, read_body, read_frontmatter
+    from skill_record import SkillRecord
+    from skill_markdown import parse_markdown
+    from skill_commands import CommandExtractor, CommandMatch
+
 logger = logging.getLogger(__name__)
 
+# 验证错误类型（validate_skill 返回的键）
+VALIDATION_ERROR_TYPES = ('metadata', 'content', 'structure')
+
+# 进程池中每个工作进程各自持有的技能加载器
+_worker_loader = None
+
+
+def _init_loader_worker(patterns: List[Tuple[str, str]], flags: int):
+    """
+    进程池初始化：在工作进程中创建技能加载器
+
+    Args:
+        patterns: 主进程加载器的命令模式 [(类型, 正则)]
+        flags: 命令模式的编译标志
+    """
+    global _worker_loader
+    _worker_loader = SkillLoader(CommandExtractor(patterns, flags))
+
+
+def _parse_chunk(paths: List[str]) -> List[Tuple[str, Optional['SkillRecord']]]:
+    """在工作进程中解析一批技能文件"""
+    return [(path, _worker_loader.parse_skill_file(Path(path))) for path in paths]
+
+
+def _validate_chunk(paths: List[str]) -> List[Dict[str, Any]]:
+    """在工作进程中解析并验证一批技能文件"""
+    return [_worker_loader._validate_file(Path(path)) for path in paths]
+
 
 class SkillLoader:
     """技能加载器类"""
     
-    def __init__(self):
-        """初始化技能加载器"""
+    def __init__(self, command_extractor: Optional[CommandExtractor] = None):
+        """
+        初始化技能加载器
+        
+        Args:
+            command_extractor: 命令提取引擎（默认使用内置命令模式）
+        """
         self.required_metadata = ['name', 'description']
         self.optional_metadata = ['version', 'author', 'tags', 'category']
+        self.command_extractor = command_extractor or CommandExtractor()
     
-    def parse_skill_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
+    def parse_skill_file(self, file_path: Path, metadata_only: bool = False) -> Optional[SkillRecord]:
         """
         解析技能文件
         
         Args:
             file_path: 技能文件路径
+            metadata_only: 只读取 YAML 头部，content 与 parsed_content 在首次访问时才加载
             
         Returns:
             解析后的技能信息
         """
         try:
+            if metadata_only:
+                return self._parse_skill_metadata(Path(file_path))
             content = file_path.read_text(encoding='utf-8')
             return self.parse_skill_content(content, str(file_path))
         except Exception as e:
             logger.error(f"解析技能文件失败 {file_path}: {e}")
             return None
     
-    def parse_skill_content(self, content: str, source: str = "unknown") -> Optional[Dict[str, Any]]:
+    def _parse_skill_metadata(self, file_path: Path) -> Optional[SkillRecord]:
+        """
+        只解析技能文件的 YAML 头部
+        
+        Args:
+            file_path: 技能文件路径
+            
+        Returns:
+            延迟加载正文的技能记录
+        """
+        source = str(file_path)
+        frontmatter = read_frontmatter(file_path)
+        if frontmatter is None:
+            logger.warning(f"技能内容格式不正确: {source}")
+            return None
+        
+        yaml_content, body_offset = frontmatter
+        try:
+            metadata = parse_frontmatter(yaml_content.strip()) or {}
+        except yaml.YAMLError as e:
+            logger.error(f"YAML 解析错误 {source}: {e}")
+            return None
+        
+        # 验证必需字段
+        missing_fields = [field for field in self.required_metadata if field not in metadata]
+        if missing_fields:
+            logger.warning(f"技能缺少必需字段 {missing_fields}: {source}")
+            return None
+        
+        skill_info = SkillRecord(
+            metadata.get('name', 'unknown'), metadata,
+            source=source,
+            loaders={
+                'content': lambda: read_body(file_path, body_offset),
+                'parsed_content': lambda: self._parse_markdown_content(skill_info.content)
+            }
+        )
+        
+        return skill_info
+    
+    def parse_skill_content(self, content: str, source: str = "unknown") -> Optional[SkillRecord]:
         """
         解析技能内容
         
@@ -65,7 +154,7 @@ class SkillLoader:
             markdown_content = parts[2].strip()
             
             # 解析 YAML 元数据
-            metadata = yaml.safe_load(yaml_content) or {}
+            metadata = parse_frontmatter(yaml_content) or {}
             
             # 验证必需字段
             missing_fields = [field for field in self.required_metadata if field not in metadata]
@@ -79,13 +168,12 @@ class SkillLoader:
             # 解析 Markdown 内容
             parsed_content = self._parse_markdown_content(markdown_content)
             
-            skill_info = {
-                'name': skill_name,
-                'metadata': metadata,
-                'content': markdown_content,
-                'parsed_content': parsed_content,
-                'source': source
-            }
+            skill_info = SkillRecord(
+                skill_name, metadata,
+                content=markdown_content,
+                parsed_content=parsed_content,
+                source=source
+            )
             
             logger.info(f"成功解析技能: {skill_name}")
             return skill_info
@@ -105,51 +193,10 @@ class SkillLoader:
             content: Markdown 内容
             
         Returns:
-            结构化信息字典
+            结构化信息字典（见 skill_markdown.parse_markdown，章节以偏移表示，
+            可用 skill_markdown.section_text 获取章节正文；命令由 self.command_extractor 提取）
         """
-        parsed = {
-            'sections': [],
-            'examples': [],
-            'guidelines': [],
-            'commands': []
-        }
-        
-        lines = content.split('\n')
-        current_section = None
-        
-        for line in lines:
-            # 检测章节标题
-            if line.startswith('#'):
-                level = len(line) - len(line.lstrip('#'))
-                title = line.lstrip('#').strip()
-                
-                current_section = {
-                    'level': level,
-                    'title': title,
-                    'content': []
-                }
-                parsed['sections'].append(current_section)
-            
-            # 检测示例
-            elif line.strip().startswith('- Example:'):
-                example = line.replace('- Example:', '').strip()
-                parsed['examples'].append(example)
-            
-            # 检测指南
-            elif line.strip().startswith('- Guideline:'):
-                guideline = line.replace('- Guideline:', '').strip()
-                parsed['guidelines'].append(guideline)
-            
-            # 检测代码块
-            elif line.strip().startswith('```'):
-                # 这里可以进一步解析代码块内容
-                pass
-            
-            # 添加到当前章节内容
-            elif current_section and line.strip():
-                current_section['content'].append(line.strip())
-        
-        return parsed
+        return parse_markdown(content, self.command_extractor)
     
     def validate_skill(self, skill_info: Dict[str, Any]) -> Dict[str, List[str]]:
         """
@@ -185,6 +232,143 @@ class SkillLoader:
         
         return errors
     
+    def parse_many(self, paths: Iterable[Path], workers: Optional[int] = None,
+                   chunk_size: Optional[int] = None) -> Iterator[Tuple[Path, Optional[SkillRecord]]]:
+        """
+        批量解析技能文件，按完成顺序逐个产出结果
+        
+        workers > 1 时在进程池中解析（YAML/Markdown 解析为 CPU 密集型），
+        文件按块提交以减少进程间通信次数
+        
+        Args:
+            paths: 技能文件路径
+            workers: 进程数（默认 CPU 数，1 表示在当前进程中顺序解析）
+            chunk_size: 每次提交给工作进程的文件数（默认按文件数与进程数自动计算）
+            
+        Yields:
+            (技能文件路径, 技能记录)，解析失败时技能记录为 None
+        """
+        for path, result in self._run_batch(paths, workers, chunk_size, _parse_chunk,
+                                            lambda path: self.parse_skill_file(path)):
+            yield path, result
+    
+    def validate_many(self, paths: Iterable[Path], workers: Optional[int] = None,
+                      chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        批量解析并验证技能文件，按完成顺序逐个产出结果
+        
+        Args:
+            paths: 技能文件路径
+            workers: 进程数（默认 CPU 数，1 表示在当前进程中顺序验证）
+            chunk_size: 每次提交给工作进程的文件数
+            
+        Yields:
+            验证结果 {path, name, valid, errors}，errors 的结构与 validate_skill 相同
+        """
+        for _, result in self._run_batch(paths, workers, chunk_size, _validate_chunk, self._validate_file,
+                                         keyed=False):
+            yield result
+    
+    def _validate_file(self, path: Path) -> Dict[str, Any]:
+        """
+        解析并验证单个技能文件
+        
+        Args:
+            path: 技能文件路径
+            
+        Returns:
+            验证结果 {path, name, valid, errors}
+        """
+        skill_info = self.parse_skill_file(path)
+        
+        if skill_info is None:
+            errors = {error_type: [] for error_type in VALIDATION_ERROR_TYPES}
+            errors['structure'].append("技能文件解析失败（缺少 YAML 头部、格式错误或缺少必需字段）")
+            name = None
+        else:
+            errors = self.validate_skill(skill_info)
+            name = skill_info.name
+        
+        return {
+            'path': str(path),
+            'name': name,
+            'valid': not any(errors.values()),
+            'errors': errors
+        }
+    
+    def _run_batch(self, paths: Iterable[Path], workers: Optional[int], chunk_size: Optional[int],
+                   chunk_func, single_func, keyed: bool = True) -> Iterator[Tuple[Path, Any]]:
+        """
+        按块分发到进程池执行，按完成顺序产出结果
+        
+        工作进程中的加载器使用与当前加载器相同的命令模式
+        
+        Args:
+            paths: 文件路径
+            workers: 进程数
+            chunk_size: 块大小
+            chunk_func: 工作进程中处理一块路径的函数
+            single_func: 顺序执行时处理单个路径的函数
+            keyed: chunk_func 的结果是否为 (路径, 结果) 元组
+        """
+        paths = [Path(path) for path in paths]
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        
+        if workers <= 1:
+            for path in paths:
+                yield path, single_func(path)
+            return
+        
+        if not chunk_size:
+            # 每个进程约分到 4 块，兼顾负载均衡与通信开销
+            chunk_size = max(1, min(256, len(paths) // (workers * 4)))
+        
+        chunks = [[str(path) for path in paths[i:i + chunk_size]] for i in range(0, len(paths), chunk_size)]
+        
+        initargs = (self.command_extractor.patterns, self.command_extractor.flags)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_loader_worker, initargs=initargs) as pool:
+            futures = [pool.submit(chunk_func, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                for item in future.result():
+                    if keyed:
+                        yield Path(item[0]), item[1]
+                    else:
+                        yield Path(item['path']), item
+    
+    @staticmethod
+    def summarize_validation(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        汇总批量验证结果
+        
+        Args:
+            results: validate_many 的结果
+            
+        Returns:
+            {total, valid, invalid, error_counts: {错误类型: 数量}, failures: [{path, name, errors}]}
+        """
+        summary = {
+            'total': 0,
+            'valid': 0,
+            'invalid': 0,
+            'error_counts': {error_type: 0 for error_type in VALIDATION_ERROR_TYPES},
+            'failures': []
+        }
+        
+        for result in results:
+            summary['total'] += 1
+            if result['valid']:
+                summary['valid'] += 1
+                continue
+            
+            summary['invalid'] += 1
+            errors = {error_type: messages for error_type, messages in result['errors'].items() if messages}
+            for error_type, messages in errors.items():
+                summary['error_counts'][error_type] = summary['error_counts'].get(error_type, 0) + len(messages)
+            summary['failures'].append({'path': result['path'], 'name': result['name'], 'errors': errors})
+        
+        summary['failures'].sort(key=lambda failure: failure['path'])
+        return summary
+    
     def extract_skill_commands(self, skill_info: Dict[str, Any]) -> List[str]:
         """
         从技能内容中提取命令模式
@@ -193,24 +377,35 @@ class SkillLoader:
             skill_info: 技能信息
             
         Returns:
-            命令模式列表
+            命令模式列表（按出现顺序）
         """
-        commands = []
-        content = skill_info.get('content', '')
-        
-        # 查找命令模式（以 "命令:" 或 "Command:" 开头的行）
-        command_patterns = [
-            r'命令:\s*(.+)',
-            r'Command:\s*(.+)',
-            r'Usage:\s*(.+)',
-            r'用法:\s*(.+)'
-        ]
+        return [match.text for match in self.extract_commands(skill_info)]
+    
+    def extract_commands(self, skill_info: Dict[str, Any]) -> List[CommandMatch]:
+        """
+        从技能内容中提取命令（含位置与模式类型）
         
-        for pattern in command_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE)
-            commands.extend(matches)
+        Args:
+            skill_info: 技能信息
+            
+        Returns:
+            命令匹配结果列表
+        """
+        return self.command_extractor.extract(skill_info.get('content') or '')
+    
+    def extract_commands_many(self, skills: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, List[CommandMatch]]]:
+        """
+        批量提取多个技能的命令
         
-        return commands
+        Args:
+            skills: 技能信息列表
+            
+        Yields:
+            (技能名称, 命令匹配结果列表)
+        """
+        return self.command_extractor.extract_many(
+            (skill.get('name'), skill.get('content')) for skill in skills
+        )
 
 
 def main():
@@ -5,11 +5,28 @@
 """
 
 import os
-import yaml
+import hashlib
 import logging
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+try:
+    from .skill_cache import SkillCache
+    from .skill_frontmatter import compute_body_offset, parse_frontmatter, read_body, read_frontmatter
+    from .parallel_deployer import ParallelDeployer
+    from .skill_discovery import discover_skill_dirs
+    from .skill_record import SkillRecord
+    from .instrumentation import span
+    from .file_transfer import TransferStats, copy_file
+except ImportError:
+    from skill_cache import SkillCache
+    from skill_frontmatter import compute_body_offset, parse_frontmatter, read_body, read_frontmatter
+    from parallel_deployer import ParallelDeployer
+    from skill_discovery import discover_skill_dirs
+    from skill_record import SkillRecord
+    from instrumentation import span
+    from file_transfer import TransferStats, copy_file
+
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -18,17 +35,23 @@ logger = logging.getLogger(__name__)
 class SkillManager:
     """技能管理器类"""
     
-    def __init__(self, skills_dir: str = "skills", deployed_dir: str = "deployed_skills"):
+    def __init__(self, skills_dir: str = "skills", deployed_dir: str = "deployed_skills",
+                 cache_file: Optional[str] = None):
         """
         初始化技能管理器
         
         Args:
             skills_dir: 技能仓库目录
             deployed_dir: 已部署技能目录
+            cache_file: 技能解析缓存文件路径（为 None 时不启用缓存）
         """
         self.skills_dir = Path(skills_dir)
         self.deployed_dir = Path(deployed_dir)
         self.skills: Dict[str, Dict[str, Any]] = {}
+        self.cache = SkillCache(cache_file) if cache_file else None
+        
+        # 文件复制统计（文件数、字节数、吞吐量）
+        self.transfer_stats = TransferStats()
         
         # 创建必要的目录
         self.skills_dir.mkdir(exist_ok=True)
@@ -36,50 +59,79 @@ class SkillManager:
         
         logger.info(f"技能管理器初始化完成 - 技能目录: {self.skills_dir}")
     
-    def discover_skills(self) -> List[str]:
+    def discover_skills(self, max_depth: Optional[int] = 1, nested: bool = False) -> List[str]:
         """
         发现技能仓库中的所有技能
         
+        Args:
+            max_depth: 技能目录的最大深度（None 表示不限），深度大于 1 时技能名为相对路径
+            nested: 是否在技能目录内部继续查找嵌套技能
+        
         Returns:
             技能名称列表
         """
-        skills = []
-        
         if not self.skills_dir.exists():
             logger.warning(f"技能目录不存在: {self.skills_dir}")
-            return skills
+            return []
         
-        # 遍历技能目录，寻找包含 SKILL.md 的文件夹
-        for item in self.skills_dir.iterdir():
-            if item.is_dir():
-                skill_file = item / "SKILL.md"
-                if skill_file.exists():
-                    skills.append(item.name)
-                    logger.debug(f"发现技能: {item.name}")
+        # 单次 scandir 遍历，寻找包含 SKILL.md 的文件夹
+        with span('discover') as discover_span:
+            skills = [skill.name for skill in discover_skill_dirs(self.skills_dir, max_depth=max_depth, nested=nested)]
+            discover_span.add(skills=len(skills))
         
         logger.info(f"共发现 {len(skills)} 个技能")
         return skills
     
-    def load_skill(self, skill_name: str) -> Optional[Dict[str, Any]]:
+    def load_skill(self, skill_name: str, metadata_only: bool = False) -> Optional[SkillRecord]:
         """
         加载单个技能的信息
         
         Args:
             skill_name: 技能名称
+            metadata_only: 只读取 YAML 头部，content（以及未缓存时的 resources）在首次访问时才加载
             
         Returns:
-            技能信息字典，包含元数据和内容
+            技能记录，包含元数据、内容和资源列表
         """
+        with span('load', skill=skill_name, metadata_only=metadata_only):
+            return self._load_skill(skill_name, metadata_only)
+    
+    def _load_skill(self, skill_name: str, metadata_only: bool = False) -> Optional[SkillRecord]:
+        """load_skill 的实现（不含追踪）"""
         skill_path = self.skills_dir / skill_name
         skill_file = skill_path / "SKILL.md"
         
+        # 优先使用缓存（仅需一次 stat 即可校验）
+        if self.cache:
+            cached = self.cache.get(skill_path)
+            if cached:
+                try:
+                    body_offset = cached['body_offset']
+                    skill_info = SkillRecord(
+                        skill_name, cached['metadata'],
+                        path=str(skill_path),
+                        resources=cached['resources'],
+                        loaders={'content': lambda: read_body(skill_file, body_offset)}
+                    )
+                    logger.debug(f"从缓存加载技能: {skill_name}")
+                    if not metadata_only:
+                        skill_info.materialize()
+                    return skill_info
+                except (OSError, UnicodeDecodeError) as e:
+                    logger.debug(f"缓存内容读取失败，重新解析 {skill_name}: {e}")
+        
         if not skill_file.exists():
             logger.error(f"技能文件不存在: {skill_file}")
             return None
         
         try:
+            if metadata_only:
+                return self._load_skill_metadata(skill_name, skill_path, skill_file)
+            
             # 读取技能文件
-            content = skill_file.read_text(encoding='utf-8')
+            st = skill_file.stat()
+            raw = skill_file.read_bytes()
+            content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
             
             # 解析 YAML 头部和 Markdown 内容
             if content.startswith('---'):
@@ -89,15 +141,19 @@ class SkillManager:
                     markdown_content = parts[2].strip()
                     
                     # 解析 YAML
-                    metadata = yaml.safe_load(yaml_content) or {}
+                    metadata = parse_frontmatter(yaml_content) or {}
+                    
+                    directories = [skill_path]
+                    skill_info = SkillRecord(
+                        skill_name, metadata,
+                        path=str(skill_path),
+                        content=markdown_content,
+                        resources=self._discover_resources(skill_path, directories)
+                    )
                     
-                    skill_info = {
-                        'name': skill_name,
-                        'metadata': metadata,
-                        'content': markdown_content,
-                        'path': str(skill_path),
-                        'resources': self._discover_resources(skill_path)
-                    }
+                    if self.cache:
+                        self.cache.put(skill_path, st, metadata, skill_info.resources, directories,
+                                       compute_body_offset(raw), hashlib.sha256(raw).hexdigest())
                     
                     logger.info(f"成功加载技能: {skill_name}")
                     return skill_info
@@ -109,12 +165,49 @@ class SkillManager:
             logger.error(f"加载技能失败 {skill_name}: {e}")
             return None
     
-    def _discover_resources(self, skill_path: Path) -> List[str]:
+    def _load_skill_metadata(self, skill_name: str, skill_path: Path, skill_file: Path) -> Optional[SkillRecord]:
+        """
+        只读取 YAML 头部加载技能，正文延迟读取
+        
+        Args:
+            skill_name: 技能名称
+            skill_path: 技能路径
+            skill_file: SKILL.md 路径
+            
+        Returns:
+            延迟加载正文的技能记录，格式不正确时返回 None
+        """
+        st = skill_file.stat()
+        frontmatter = read_frontmatter(skill_file)
+        if frontmatter is None:
+            logger.warning(f"技能文件格式不正确: {skill_file}")
+            return None
+        
+        yaml_content, body_offset = frontmatter
+        metadata = parse_frontmatter(yaml_content.strip()) or {}
+        
+        loaders = {'content': lambda: read_body(skill_file, body_offset)}
+        if not self.cache:
+            loaders['resources'] = lambda: self._discover_resources(skill_path)
+        
+        skill_info = SkillRecord(skill_name, metadata, path=str(skill_path), loaders=loaders)
+        
+        if self.cache:
+            # 启用缓存时立即收集资源，以便下次直接命中缓存
+            directories = [skill_path]
+            skill_info.resources = self._discover_resources(skill_path, directories)
+            self.cache.put(skill_path, st, metadata, skill_info.resources, directories, body_offset)
+        
+        logger.info(f"成功加载技能头部: {skill_name}")
+        return skill_info
+    
+    def _discover_resources(self, skill_path: Path, directories: Optional[List[Path]] = None) -> List[str]:
         """
         发现技能的资源文件
         
         Args:
             skill_path: 技能路径
+            directories: 若提供，收集遍历过的目录（供缓存校验资源列表）
             
         Returns:
             资源文件列表
@@ -127,25 +220,32 @@ class SkillManager:
         for resource_dir in resource_dirs:
             resource_path = skill_path / resource_dir
             if resource_path.exists() and resource_path.is_dir():
+                if directories is not None:
+                    directories.append(resource_path)
+                
                 # 递归收集所有文件
                 for file_path in resource_path.rglob('*'):
                     if file_path.is_file():
                         relative_path = file_path.relative_to(skill_path)
                         resources.append(str(relative_path))
+                    elif directories is not None and file_path.is_dir():
+                        directories.append(file_path)
         
         return resources
     
-    def deploy_skill(self, skill_name: str) -> bool:
+    def deploy_skill(self, skill_name: str, skill_info: Optional[SkillRecord] = None) -> bool:
         """
         部署单个技能到已部署目录
         
         Args:
             skill_name: 技能名称
+            skill_info: 已加载的技能信息（为 None 时自动加载）
             
         Returns:
             部署是否成功
         """
-        skill_info = self.load_skill(skill_name)
+        if skill_info is None:
+            skill_info = self.load_skill(skill_name)
         if not skill_info:
             logger.error(f"无法加载技能，部署失败: {skill_name}")
             return False
@@ -160,18 +260,18 @@ class SkillManager:
             deploy_file = deploy_path / "SKILL.md"
             
             # 复制主文件
-            deploy_file.write_text(skill_file.read_text(encoding='utf-8'), encoding='utf-8')
+            copy_file(skill_file, deploy_file, self.transfer_stats)
             
             # 复制资源文件
-            for resource in skill_info['resources']:
+            for resource in skill_info.resources:
                 src_path = self.skills_dir / skill_name / resource
                 dst_path = deploy_path / resource
                 
                 # 创建目标目录
                 dst_path.parent.mkdir(parents=True, exist_ok=True)
                 
-                # 复制文件
-                dst_path.write_bytes(src_path.read_bytes())
+                # 复制文件（内核复制或分块流式复制，内存占用与文件大小无关）
+                copy_file(src_path, dst_path, self.transfer_stats)
             
             # 创建部署标记文件
             deploy_marker = deploy_path / ".deployed"
@@ -184,20 +284,22 @@ class SkillManager:
             logger.error(f"技能部署失败 {skill_name}: {e}")
             return False
     
-    def deploy_all_skills(self) -> Dict[str, bool]:
+    def deploy_all_skills(self, jobs: int = 1) -> Dict[str, bool]:
         """
         部署所有发现的技能
         
+        Args:
+            jobs: 并行部署线程数
+        
         Returns:
-            部署结果字典 {技能名: 是否成功}
+            部署结果字典 {技能名: 是否成功}（按发现顺序）
         """
         skills = self.discover_skills()
-        results = {}
         
         logger.info(f"开始部署 {len(skills)} 个技能")
         
-        for skill_name in skills:
-            results[skill_name] = self.deploy_skill(skill_name)
+        reports = ParallelDeployer(self, jobs=jobs).deploy(skills)
+        results = {report['skill_name']: report['success'] for report in reports}
         
         # 统计结果
         success_count = sum(1 for result in results.values() if result)
@@ -205,7 +307,7 @@ class SkillManager:
         
         return results
     
-    def list_deployed_skills(self) -> List[Dict[str, Any]]:
+    def list_deployed_skills(self) -> List[SkillRecord]:
         """
         列出所有已部署的技能
         
@@ -217,13 +319,10 @@ class SkillManager:
         if not self.deployed_dir.exists():
             return deployed_skills
         
-        for item in self.deployed_dir.iterdir():
-            if item.is_dir():
-                skill_file = item / "SKILL.md"
-                if skill_file.exists():
-                    skill_info = self.load_skill(item.name)
-                    if skill_info:
-                        deployed_skills.append(skill_info)
+        for skill in discover_skill_dirs(self.deployed_dir):
+            skill_info = self.load_skill(skill.name)
+            if skill_info:
+                deployed_skills.append(skill_info)
         
         return deployed_skills
 
@@ -0,0 +1,146 @@
+"""
+技能 Markdown 解析 - SKILL.md 正文的单遍结构解析
+
+一次遍历得到章节、示例、指南和代码块，命令由 skill_commands 的命令提取引擎提取；
+章节与代码块只记录在正文中的偏移，需要文本时再用 section_text / block_text 切片，避免为每一行复制字符串
+"""
+
+import re
+from typing import Dict, List, Any, Optional
+
+try:
+    from .skill_commands import CommandExtractor
+except ImportError:
+    from skill_commands import CommandExtractor
+
+# ATX 标题：1-6 个 # 后跟空白或行尾
+_HEADING_RE = re.compile(r'(#{1,6})(?:[ \t]+|$)')
+
+# 围栏代码块开始：``` 或 ~~~（至少 3 个），后面可跟语言标识
+_FENCE_RE = re.compile(r'(`{3,}|~{3,})[ \t]*([^`\s]*)')
+
+# 未指定命令提取引擎时使用的默认引擎（DEFAULT_COMMAND_PATTERNS）
+_default_extractor = CommandExtractor()
+
+_EXAMPLE_PREFIX = '- Example:'
+_GUIDELINE_PREFIX = '- Guideline:'
+
+
+def parse_markdown(content: str, command_extractor: Optional[CommandExtractor] = None) -> Dict[str, Any]:
+    """
+    单遍解析 Markdown 正文
+
+    围栏代码块内的 `#` 行不会被识别为标题，示例/指南行也只在代码块外识别；
+    命令由命令提取引擎在整个正文（含代码块）中按文档顺序提取，与
+    SkillLoader.extract_commands 使用同一套模式
+
+    Args:
+        content: Markdown 正文（换行符为 \\n）
+        command_extractor: 命令提取引擎（默认使用内置命令模式）
+
+    Returns:
+        {
+            'sections': [{level, title, start, end}],  章节正文在 content 中的偏移 [start, end)
+            'examples': [str],
+            'guidelines': [str],
+            'commands': [str],
+            'code_blocks': [{language, start, end}]    代码内容（不含围栏行）的偏移 [start, end)
+        }
+    """
+    sections: List[Dict[str, Any]] = []
+    examples: List[str] = []
+    guidelines: List[str] = []
+    code_blocks: List[Dict[str, Any]] = []
+
+    heading_match = _HEADING_RE.match
+    fence_match = _FENCE_RE.match
+
+    fence = None
+    block = None
+    pos = 0
+
+    for line in content.split('\n'):
+        line_start = pos
+        pos += len(line) + 1
+        text = line.lstrip()
+
+        if not text:
+            continue
+
+        first = text[0]
+
+        if fence is not None:
+            # 代码块内：只检查是否为结束围栏
+            if first == fence[0]:
+                closing = text.rstrip()
+                if len(closing) >= len(fence) and closing.count(first) == len(closing):
+                    block['end'] = line_start
+                    code_blocks.append(block)
+                    fence = block = None
+            continue
+
+        if first == '#' and len(line) - len(text) < 4:
+            match = heading_match(text)
+            if match:
+                if sections:
+                    sections[-1]['end'] = line_start
+                sections.append({
+                    'level': len(match.group(1)),
+                    'title': text[match.end():].strip(),
+                    'start': min(pos, len(content)),
+                    'end': len(content)
+                })
+                continue
+
+        if first in '`~' and len(line) - len(text) < 4:
+            match = fence_match(text)
+            if match and not (first == '`' and '`' in text[match.end():]):
+                fence = match.group(1)
+                block = {'language': match.group(2), 'start': min(pos, len(content)), 'end': len(content)}
+                continue
+
+        if first == '-':
+            if text.startswith(_EXAMPLE_PREFIX):
+                examples.append(text[len(_EXAMPLE_PREFIX):].strip())
+            elif text.startswith(_GUIDELINE_PREFIX):
+                guidelines.append(text[len(_GUIDELINE_PREFIX):].strip())
+
+    # 未闭合的代码块延续到正文结尾
+    if block is not None:
+        code_blocks.append(block)
+
+    return {
+        'sections': sections,
+        'examples': examples,
+        'guidelines': guidelines,
+        'commands': [match.text for match in (command_extractor or _default_extractor).extract(content)],
+        'code_blocks': code_blocks
+    }
+
+
+def section_text(content: str, section: Dict[str, Any]) -> str:
+    """
+    获取章节正文（不含标题行）
+
+    Args:
+        content: 解析时使用的 Markdown 正文
+        section: parse_markdown 返回的章节
+
+    Returns:
+        章节正文
+    """
+    return content[section['start']:section['end']].strip()
+
+
+def block_text(content: str, block: Dict[str, Any]) -> str:
+    """
+    获取代码块内容（不含围栏行）
+
+    Args:
+        content: 解析时使用的 Markdown 正文
+        block: parse_markdown 返回的代码块
+
+    Returns:
+        代码内容
+    """
+    return content[block['start']:block['end']].rstrip('\n')
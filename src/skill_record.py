@@ -0,0 +1,173 @@
+"""
+技能记录 - 管理器、加载器、部署器与脚本共用的技能数据模型
+
+使用 __slots__ 降低单个技能的内存占用，元数据键名经过 intern，
+正文、解析结果、资源列表等较重的字段可以延迟到首次访问时才加载
+"""
+
+import sys
+from typing import Dict, List, Any, Callable, Optional
+
+# 全部字段（顺序即 to_dict 的输出顺序）
+FIELDS = (
+    'name', 'metadata', 'path', 'source', 'content', 'parsed_content', 'resources',
+    'deployed_at', 'deploy_path', 'manifest', 'files_exist', 'integrity', 'intact'
+)
+
+# 兼容旧字典结构的键名别名（deployment.json 使用 skill_name）
+ALIASES = {'skill_name': 'name'}
+
+
+def intern_keys(metadata: Any) -> Any:
+    """
+    intern 元数据的字符串键，使大量技能共享同一份键对象
+
+    Args:
+        metadata: 元数据（非字典时原样返回）
+
+    Returns:
+        键已 intern 的元数据
+    """
+    if not isinstance(metadata, dict):
+        return metadata
+    return {sys.intern(key) if isinstance(key, str) else key: value for key, value in metadata.items()}
+
+
+class SkillRecord:
+    """
+    技能记录类
+
+    字段可通过属性访问（未设置时为 None），也可像字典一样通过 record['name']、
+    record.get('skill_name')、'content' in record 访问，兼容原先各处返回的字典
+    """
+
+    __slots__ = FIELDS + ('_loaders',)
+
+    def __init__(self, name: str, metadata: Optional[Dict[str, Any]] = None,
+                 loaders: Optional[Dict[str, Callable[[], Any]]] = None, **fields):
+        """
+        初始化技能记录
+
+        Args:
+            name: 技能名称
+            metadata: 技能元数据
+            loaders: 延迟字段 {字段名: 加载函数}
+            **fields: 其他字段（见 FIELDS）
+        """
+        self.name = name
+        self.metadata = intern_keys(metadata) if metadata is not None else {}
+        self._loaders = dict(loaders) if loaders else {}
+
+        for field, value in fields.items():
+            if field not in FIELDS:
+                raise TypeError(f"未知的技能字段: {field}")
+            setattr(self, field, value)
+
+    @classmethod
+    def from_deployment_config(cls, config: Dict[str, Any], **fields) -> 'SkillRecord':
+        """
+        从 deployment.json 内容创建记录
+
+        Args:
+            config: 部署配置
+            **fields: 额外字段（如 deploy_path、files_exist）
+
+        Returns:
+            技能记录
+        """
+        values = {field: config[field] for field in ('source', 'resources', 'deployed_at', 'manifest')
+                  if field in config}
+        values.update(fields)
+        return cls(config.get('skill_name'), config.get('metadata', {}), **values)
+
+    def __getattr__(self, attr: str) -> Any:
+        # 仅在槽位尚未赋值时调用
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+
+        loaders = self._loaders
+        if attr in loaders:
+            value = loaders.pop(attr)()
+            setattr(self, attr, value)
+            return value
+        if attr in FIELDS:
+            return None
+        raise AttributeError(f"'SkillRecord' 没有字段 '{attr}'")
+
+    def is_loaded(self, field: str) -> bool:
+        """判断字段是否已赋值（延迟字段在加载前返回 False）"""
+        try:
+            object.__getattribute__(self, field)
+            return True
+        except AttributeError:
+            return False
+
+    def _is_set(self, field: str) -> bool:
+        return self.is_loaded(field) or field in self._loaders
+
+    def materialize(self) -> 'SkillRecord':
+        """加载所有延迟字段"""
+        for field in list(self._loaders):
+            getattr(self, field)
+        return self
+
+    # ---- 字典兼容接口 ----
+
+    def __getitem__(self, key: str) -> Any:
+        field = ALIASES.get(key, key)
+        if field in FIELDS and self._is_set(field):
+            return getattr(self, field)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        field = ALIASES.get(key, key)
+        if field not in FIELDS:
+            raise KeyError(key)
+        self._loaders.pop(field, None)
+        setattr(self, field, value)
+
+    def __contains__(self, key: str) -> bool:
+        field = ALIASES.get(key, key)
+        return field in FIELDS and self._is_set(field)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        """已设置（含未加载的延迟字段）的字段名"""
+        return [field for field in FIELDS if self._is_set(field)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为普通字典（会加载全部延迟字段）
+
+        Returns:
+            {字段名: 值}
+        """
+        return {field: getattr(self, field) for field in self.keys()}
+
+    # ---- 其他协议 ----
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, SkillRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 延迟字段的加载函数无法序列化，序列化前先全部加载
+        return self.to_dict()
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self._loaders = {}
+        for field, value in state.items():
+            setattr(self, field, value)
+
+    def __repr__(self) -> str:
+        return f"SkillRecord(name={self.name!r}, fields={self.keys()!r})"
@@ -0,0 +1,311 @@
+"""
+技能监视器 - 监视技能仓库并报告发生变更的技能
+
+Linux 上通过 ctypes 调用 inotify（每个目录一个监视，新建目录自动加入），其他平台或
+inotify 不可用时退回到定期扫描比较文件大小与 mtime。一段时间内的连续变更会被合并
+（去抖）后按所属技能一次性报告
+"""
+
+import os
+import time
+import errno
+import struct
+import select
+import ctypes
+import ctypes.util
+import fnmatch
+import logging
+import threading
+from typing import Dict, Set, Optional, Callable, Tuple
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 编辑器临时文件等不触发重新部署的文件名
+IGNORED_PATTERNS = ('*.swp', '*.swx', '*~', '.#*', '4913', '*.tmp')
+
+# inotify 常量（linux/inotify.h）
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _is_ignored(name: str) -> bool:
+    """文件名是否应被忽略"""
+    return any(fnmatch.fnmatch(name, pattern) for pattern in IGNORED_PATTERNS)
+
+
+def _skill_names(skills_dir: Path) -> Set[str]:
+    """技能仓库中的全部技能目录名"""
+    try:
+        with os.scandir(skills_dir) as entries:
+            return {entry.name for entry in entries
+                    if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.')}
+    except OSError:
+        return set()
+
+
+class _InotifyBackend:
+    """inotify 事件源"""
+
+    name = 'inotify'
+
+    def __init__(self, skills_dir: Path):
+        """
+        初始化 inotify 并为技能仓库中的所有目录添加监视
+
+        Raises:
+            OSError: 平台不支持 inotify 或初始化失败
+        """
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError(errno.ENOSYS, "找不到 libc")
+
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify 不受支持")
+
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        self.skills_dir = skills_dir
+        self._watches: Dict[int, Path] = {}
+        self._add_tree(skills_dir)
+
+    def _add_watch(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err not in (errno.ENOENT, errno.ENOTDIR):
+                logger.warning(f"无法监视目录 {directory}: {os.strerror(err)}")
+            return
+        self._watches[wd] = directory
+
+    def _add_tree(self, directory: Path):
+        """为目录及其所有子目录添加监视"""
+        for root, dirnames, _ in os.walk(directory):
+            dirnames[:] = [name for name in dirnames if not name.startswith('.')]
+            self._add_watch(Path(root))
+
+    def read(self, timeout: float) -> Set[str]:
+        """
+        等待并读取事件
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            发生变更的技能名称
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # 事件队列溢出：无法确定变更范围，报告全部技能
+                logger.warning("inotify 事件队列溢出，重新检查全部技能")
+                return _skill_names(self.skills_dir)
+
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+
+            path = directory / name if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_tree(path)
+
+            if name and _is_ignored(name):
+                continue
+
+            if directory == self.skills_dir and not mask & IN_ISDIR:
+                # 仓库根目录下的普通文件（如 README.md）不属于任何技能
+                continue
+
+            skill_name = self._owner(path)
+            if skill_name:
+                changed.add(skill_name)
+
+        return changed
+
+    def _owner(self, path: Path) -> Optional[str]:
+        """事件路径所属的技能（仓库根目录下的第一级目录）"""
+        try:
+            parts = path.relative_to(self.skills_dir).parts
+        except ValueError:
+            return None
+        if not parts or parts[0].startswith('.'):
+            return None
+        return parts[0]
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollingBackend:
+    """定期扫描的事件源（inotify 不可用时使用）"""
+
+    name = 'polling'
+
+    def __init__(self, skills_dir: Path, poll_interval: float, stop_event: threading.Event):
+        self.skills_dir = skills_dir
+        self.poll_interval = poll_interval
+        self._stop_event = stop_event
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple]:
+        """
+        扫描所有技能的文件状态
+
+        Returns:
+            {技能名称: ((相对路径, size, mtime_ns), ...)}
+        """
+        snapshot = {}
+        for skill_name in _skill_names(self.skills_dir):
+            files = []
+            pending = [(os.path.join(str(self.skills_dir), skill_name), '')]
+            while pending:
+                directory, prefix = pending.pop()
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.name.startswith('.') or _is_ignored(entry.name):
+                                continue
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append((entry.path, prefix + entry.name + '/'))
+                            else:
+                                st = entry.stat()
+                                files.append((prefix + entry.name, st.st_size, st.st_mtime_ns))
+                except OSError:
+                    continue
+            snapshot[skill_name] = tuple(sorted(files))
+        return snapshot
+
+    def read(self, timeout: float) -> Set[str]:
+        """
+        等待一个扫描周期并比较文件状态
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            发生变更的技能名称
+        """
+        if self._stop_event.wait(min(timeout, self.poll_interval)):
+            return set()
+
+        snapshot = self._scan()
+        changed = {name for name in snapshot.keys() | self._snapshot.keys()
+                   if snapshot.get(name) != self._snapshot.get(name)}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class SkillWatcher:
+    """技能监视器类"""
+
+    def __init__(self, skills_dir: str, debounce: float = 0.2, poll_interval: float = 0.5,
+                 use_inotify: bool = True, max_delay: float = 1.0):
+        """
+        初始化技能监视器
+
+        Args:
+            skills_dir: 技能仓库目录
+            debounce: 去抖时间（秒），最后一次变更后等待这么久没有新变更才报告
+            poll_interval: 轮询模式的扫描间隔（秒）
+            use_inotify: 是否优先使用 inotify（为 False 时始终轮询）
+            max_delay: 变更持续不断时，第一次变更后最多等待这么久（秒）就报告
+        """
+        self.skills_dir = Path(skills_dir).resolve()
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.max_delay = max(max_delay, debounce)
+        self._stop_event = threading.Event()
+
+        self._backend = None
+        if use_inotify:
+            try:
+                self._backend = _InotifyBackend(self.skills_dir)
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify 不可用，改用轮询: {e}")
+        if self._backend is None:
+            self._backend = _PollingBackend(self.skills_dir, poll_interval, self._stop_event)
+
+        logger.info(f"技能监视器初始化完成 - 目录: {self.skills_dir}, 方式: {self.backend}")
+
+    @property
+    def backend(self) -> str:
+        """事件源名称（'inotify' 或 'polling'）"""
+        return self._backend.name
+
+    def run(self, on_change: Callable[[Set[str], float], None]):
+        """
+        持续监视直到调用 stop()
+
+        Args:
+            on_change: 变更回调，参数为发生变更的技能名称集合与该批第一次变更被检测到的时间
+                       （time.perf_counter()），回调在当前线程中执行
+        """
+        pending: Set[str] = set()
+        first_seen = last_seen = 0.0
+
+        try:
+            while not self._stop_event.is_set():
+                timeout = self.debounce if pending else self.poll_interval
+                changed = self._backend.read(timeout)
+                now = time.perf_counter()
+
+                if changed:
+                    if not pending:
+                        first_seen = now
+                    pending |= changed
+                    last_seen = now
+
+                if pending and (now - last_seen >= self.debounce or now - first_seen >= self.max_delay):
+                    batch, pending = pending, set()
+                    on_change(batch, first_seen)
+        finally:
+            self._backend.close()
+
+    def stop(self):
+        """停止监视（可从其他线程调用）"""
+        self._stop_event.set()
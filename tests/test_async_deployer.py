@@ -0,0 +1,112 @@
+"""
+异步部署器测试
+"""
+
+import json
+import time
+import asyncio
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.async_deployer import AsyncSkillDeployer
+from src.skill_manager import SkillManager
+from src.skill_deployer import SkillDeployer
+
+
+class TestAsyncSkillDeployer:
+    """异步技能部署器测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.skills_dir = Path(self.temp_dir) / "skills"
+
+        for i in range(5):
+            skill_path = self.skills_dir / f"skill-{i}"
+            (skill_path / "scripts").mkdir(parents=True)
+            (skill_path / "SKILL.md").write_text(
+                f"---\nname: skill-{i}\ndescription: 异步部署测试\n---\n\n# 技能 {i}\n", encoding='utf-8')
+            (skill_path / "scripts" / "run.py").write_text(f"print({i})\n", encoding='utf-8')
+
+        broken = self.skills_dir / "broken"
+        broken.mkdir()
+        (broken / "SKILL.md").write_text("# 没有头部\n", encoding='utf-8')
+
+        self.manager = SkillManager(str(self.skills_dir), str(Path(self.temp_dir) / "deployed"))
+        self.deployer = SkillDeployer(str(Path(self.temp_dir) / "deployed"), str(Path(self.temp_dir) / "config"))
+
+    def teardown_method(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    @pytest.mark.parametrize("workers,queue_size", [(1, 1), (4, None)])
+    def test_deploy_pipeline(self, workers, queue_size):
+        """测试流水线部署结果与索引"""
+        names = sorted(self.manager.discover_skills())
+        reports = AsyncSkillDeployer(self.manager, self.deployer, workers, queue_size).run(names)
+
+        assert [report['skill_name'] for report in reports] == names
+        failed = {report['skill_name']: report['error'] for report in reports if not report['success']}
+        assert failed == {'broken': "无法加载技能"}
+
+        for i in range(5):
+            deploy_path = Path(self.temp_dir) / "deployed" / f"skill-{i}"
+            assert (deploy_path / "scripts" / "run.py").read_text(encoding='utf-8') == f"print({i})\n"
+            assert (deploy_path / "USAGE.md").exists()
+            config = json.loads((deploy_path / "deployment.json").read_text(encoding='utf-8'))
+            assert set(config['manifest']) == {"SKILL.md", "scripts/run.py"}
+
+        index = self.deployer.generate_skill_index()
+        assert index['total_skills'] == 5
+        assert index['generation'] == 5
+
+        # 再次部署为增量空操作
+        reports = AsyncSkillDeployer(self.manager, self.deployer, workers, queue_size).run()
+        assert sum(report['success'] for report in reports) == 5
+
+    def test_copy_failure_is_reported(self, monkeypatch):
+        """测试单个技能复制失败不影响其他技能"""
+        deploy_files = self.deployer._deploy_files
+
+        def failing(skill_path, skill_name, force=False):
+            if skill_name == 'skill-2':
+                raise OSError("磁盘已满")
+            return deploy_files(skill_path, skill_name, force)
+
+        monkeypatch.setattr(self.deployer, '_deploy_files', failing)
+        reports = AsyncSkillDeployer(self.manager, self.deployer, 2).run([f"skill-{i}" for i in range(5)])
+
+        assert [report['success'] for report in reports] == [True, True, False, True, True]
+        assert reports[2]['error'] == "磁盘已满"
+        assert not (Path(self.temp_dir) / "deployed" / "skill-2").exists()
+
+    def test_cancellation(self, monkeypatch):
+        """测试取消部署后停止后续技能"""
+        deploy_files = self.deployer._deploy_files
+        copied = []
+
+        def slow(skill_path, skill_name, force=False):
+            time.sleep(0.05)
+            copied.append(skill_name)
+            return deploy_files(skill_path, skill_name, force)
+
+        monkeypatch.setattr(self.deployer, '_deploy_files', slow)
+        deployer = AsyncSkillDeployer(self.manager, self.deployer, 1, 1)
+
+        async def deploy_then_cancel():
+            task = asyncio.ensure_future(deployer.deploy([f"skill-{i}" for i in range(5)]))
+            await asyncio.sleep(0.02)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(deploy_then_cancel())
+
+        # 已开始的复制会完成，未开始的被丢弃
+        time.sleep(0.1)
+        assert len(copied) < 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
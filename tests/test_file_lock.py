@@ -0,0 +1,101 @@
+"""
+文件锁与多进程部署测试
+"""
+
+import json
+import pytest
+import tempfile
+import shutil
+import threading
+import multiprocessing
+from pathlib import Path
+from src.file_lock import FileLock, LockTimeout
+from src.skill_deployer import SkillDeployer
+
+
+def _deploy_worker(temp_dir: str, skill_names: list, rounds: int, staged: bool):
+    """在独立进程中反复部署技能"""
+    deployer = SkillDeployer(str(Path(temp_dir) / "deployed"), str(Path(temp_dir) / "config"), staged=staged)
+    for i in range(rounds):
+        for skill_name in skill_names:
+            skill_info = {'name': skill_name, 'metadata': {'name': skill_name, 'category': 'tools'}, 'content': ''}
+            assert deployer.deploy_skill(Path(temp_dir) / "skills" / skill_name, skill_info)
+
+
+class TestFileLock:
+    """文件锁测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.lock_file = Path(self.temp_dir) / "locks" / "test.lock"
+
+    def teardown_method(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_exclusive_and_shared(self):
+        """测试独占锁与共享锁的互斥关系"""
+        with FileLock(self.lock_file) as lock:
+            assert lock.locked
+            with pytest.raises(LockTimeout):
+                FileLock(self.lock_file, timeout=0.1).acquire()
+            with pytest.raises(LockTimeout):
+                FileLock(self.lock_file, shared=True, timeout=0.1).acquire()
+        assert not lock.locked
+
+        with FileLock(self.lock_file, shared=True), FileLock(self.lock_file, shared=True, timeout=0.1):
+            with pytest.raises(LockTimeout):
+                FileLock(self.lock_file, timeout=0.1).acquire()
+
+    def test_waiter_acquires_after_release(self):
+        """测试等待方在锁释放后获得锁"""
+        holder = FileLock(self.lock_file).acquire()
+        acquired = threading.Event()
+
+        def wait_for_lock():
+            with FileLock(self.lock_file, timeout=5):
+                acquired.set()
+
+        thread = threading.Thread(target=wait_for_lock)
+        thread.start()
+        assert not acquired.wait(0.2)
+        holder.release()
+        thread.join(timeout=5)
+        assert acquired.is_set()
+
+    @pytest.mark.parametrize("staged", [False, True])
+    def test_concurrent_deploy_processes(self, staged):
+        """测试多个进程同时部署同一目录时部署与索引保持一致"""
+        names = [f"skill-{i}" for i in range(3)]
+        for name in names:
+            skill_path = Path(self.temp_dir) / "skills" / name
+            (skill_path / "scripts").mkdir(parents=True)
+            (skill_path / "SKILL.md").write_text(f"---\nname: {name}\n---\n\n# {name}\n", encoding='utf-8')
+            for j in range(5):
+                (skill_path / "scripts" / f"f{j}.py").write_text(f"print({j})\n" * 100, encoding='utf-8')
+
+        rounds = 3
+        context = multiprocessing.get_context('spawn')
+        processes = [context.Process(target=_deploy_worker, args=(self.temp_dir, names, rounds, staged))
+                     for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        deployer = SkillDeployer(str(Path(self.temp_dir) / "deployed"), str(Path(self.temp_dir) / "config"))
+        index = json.loads((Path(self.temp_dir) / "config" / "skill_index.json").read_text(encoding='utf-8'))
+
+        # 每次部署都在索引锁内递增代数，索引无需重建
+        assert index['generation'] == len(processes) * rounds * len(names)
+        assert deployer.generate_skill_index() == index
+        assert [skill['name'] for skill in index['skills']] == names
+
+        for skill in deployer.list_deployed_skills(level='verify'):
+            assert skill.intact is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
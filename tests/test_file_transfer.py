@@ -0,0 +1,122 @@
+"""
+文件传输测试
+"""
+
+import os
+import errno
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src import file_transfer
+from src.file_transfer import TransferStats, copy_file, copy_tree
+from src.skill_manager import SkillManager
+
+
+class TestFileTransfer:
+    """文件传输测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.src = Path(self.temp_dir) / "source.bin"
+        self.data = os.urandom(300 * 1024 + 7)
+        self.src.write_bytes(self.data)
+        os.chmod(self.src, 0o640)
+
+    def teardown_method(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    @pytest.mark.parametrize("method", ['copy_file_range', 'sendfile', 'chunked'])
+    def test_copy_methods(self, method, monkeypatch):
+        """测试各复制方式的内容、元数据与统计"""
+        skipped = {'reflink', 'copy_file_range', 'sendfile'} - {method}
+        monkeypatch.setattr(file_transfer, '_unavailable', set(skipped))
+        if method != 'chunked' and not hasattr(os, method):
+            pytest.skip(f"平台不支持 {method}")
+
+        stats = TransferStats()
+        dst = Path(self.temp_dir) / "copy.bin"
+        dst.write_bytes(b"old content that is longer than nothing")
+
+        assert copy_file(self.src, dst, stats, chunk_size=64 * 1024) == method
+        assert dst.read_bytes() == self.data
+        assert dst.stat().st_mode & 0o777 == 0o640
+        assert dst.stat().st_mtime_ns == self.src.stat().st_mtime_ns
+
+        summary = stats.to_dict()
+        assert summary['files'] == 1
+        assert summary['bytes'] == len(self.data)
+        assert summary['methods'] == {method: 1}
+        assert stats.throughput > 0
+
+    def test_fallback_when_unsupported(self, monkeypatch):
+        """测试内核复制不受支持时退回并记住"""
+        monkeypatch.setattr(file_transfer, '_unavailable', {'reflink'})
+        calls = []
+
+        def unsupported(src_fd, dst_fd, size):
+            calls.append(size)
+            raise OSError(errno.ENOSYS, "not implemented")
+
+        monkeypatch.setattr(file_transfer, '_copy_file_range', unsupported)
+        monkeypatch.setattr(file_transfer, '_sendfile', unsupported)
+
+        for i in range(2):
+            dst = Path(self.temp_dir) / f"copy-{i}.bin"
+            assert copy_file(self.src, dst) == 'chunked'
+            assert dst.read_bytes() == self.data
+
+        assert len(calls) == 2
+        assert {'copy_file_range', 'sendfile'} <= file_transfer._unavailable
+
+    def test_empty_file_and_tree(self):
+        """测试空文件与目录复制"""
+        tree = Path(self.temp_dir) / "tree"
+        (tree / "a" / "b").mkdir(parents=True)
+        (tree / "empty.txt").write_bytes(b"")
+        (tree / "a" / "b" / "data.bin").write_bytes(self.data)
+
+        stats = TransferStats()
+        target = Path(self.temp_dir) / "target"
+        assert copy_tree(tree, target, stats) == 2
+        assert (target / "empty.txt").read_bytes() == b""
+        assert (target / "a" / "b" / "data.bin").read_bytes() == self.data
+        assert stats.files == 2 and stats.bytes == len(self.data)
+
+    @pytest.mark.parametrize("method", ['reflink', 'copy_file_range', 'chunked'])
+    def test_overwrite_replaces_hardlinked_target(self, method, monkeypatch):
+        """测试覆盖已存在的目标时替换文件而不修改共享的硬链接 inode"""
+        monkeypatch.setattr(file_transfer, '_unavailable', set(file_transfer.TRANSFER_METHODS[:-1]) - {method})
+        shared = Path(self.temp_dir) / "object.bin"
+        shared.write_bytes(b"shared")
+        dst = Path(self.temp_dir) / "deployed.bin"
+        os.link(shared, dst)
+
+        copy_file(self.src, dst)
+        assert dst.read_bytes() == self.data
+        assert shared.read_bytes() == b"shared"
+        assert not dst.samefile(shared)
+        assert sorted(p.name for p in Path(self.temp_dir).iterdir()) == ["deployed.bin", "object.bin", "source.bin"]
+
+    def test_manager_deploy_uses_transfer(self):
+        """测试技能管理器部署时统计复制量"""
+        skills_dir = Path(self.temp_dir) / "skills"
+        skill_path = skills_dir / "binary-skill"
+        (skill_path / "resources").mkdir(parents=True)
+        (skill_path / "SKILL.md").write_text(
+            "---\nname: binary-skill\ndescription: 二进制资源\n---\n\n# 二进制\n", encoding='utf-8')
+        shutil.copy2(self.src, skill_path / "resources" / "archive.tar.gz")
+
+        manager = SkillManager(str(skills_dir), str(Path(self.temp_dir) / "deployed"))
+        assert manager.deploy_skill("binary-skill")
+
+        deployed = Path(self.temp_dir) / "deployed" / "binary-skill" / "resources" / "archive.tar.gz"
+        assert deployed.read_bytes() == self.data
+        assert manager.transfer_stats.files == 2
+        assert manager.transfer_stats.bytes == len(self.data) + (skill_path / "SKILL.md").stat().st_size
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
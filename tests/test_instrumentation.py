@@ -0,0 +1,85 @@
+"""
+性能追踪测试
+"""
+
+import json
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src import instrumentation
+from src.instrumentation import enable_tracing, disable_tracing, span
+from src.skill_manager import SkillManager
+from src.skill_deployer import SkillDeployer
+
+
+class TestInstrumentation:
+    """性能追踪测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.skills_dir = Path(self.temp_dir) / "skills"
+        skill_path = self.skills_dir / "traced-skill"
+        (skill_path / "scripts").mkdir(parents=True)
+        (skill_path / "SKILL.md").write_text(
+            "---\nname: traced-skill\ndescription: 追踪测试\n---\n\n# 追踪\n", encoding='utf-8')
+        (skill_path / "scripts" / "run.py").write_text("print('x')\n", encoding='utf-8')
+
+    def teardown_method(self):
+        """测试清理"""
+        disable_tracing()
+        shutil.rmtree(self.temp_dir)
+
+    def test_disabled_is_noop(self):
+        """测试未启用时不记录"""
+        with span('noop') as s:
+            s.add(files=1)
+        assert s.enabled is False
+        assert instrumentation.get_tracer() is None
+
+    def test_deploy_stages(self):
+        """测试部署各阶段的耗时与计数"""
+        tracer = enable_tracing()
+        manager = SkillManager(str(self.skills_dir), str(Path(self.temp_dir) / "deployed"))
+        deployer = SkillDeployer(str(Path(self.temp_dir) / "deployed"), str(Path(self.temp_dir) / "config"))
+
+        for name in manager.discover_skills():
+            deployer.deploy_skill(self.skills_dir / name, manager.load_skill(name))
+        deployer.generate_skill_index(rebuild=True)
+
+        summary = tracer.summary()
+        for stage in ('discover', 'load', 'deploy', 'plan', 'copy', 'config', 'usage_guide', 'index_update', 'index'):
+            assert summary[stage]['count'] >= 1, stage
+        assert summary['copy']['files'] == 2
+        assert summary['copy']['bytes'] == (self.skills_dir / "traced-skill" / "SKILL.md").stat().st_size + 11
+
+        report = tracer.to_dict()
+        assert {s['attrs'].get('skill') for s in report['spans'] if s['name'] == 'copy'} == {'traced-skill'}
+
+    def test_exports(self):
+        """测试 JSON 与 Chrome trace 导出"""
+        tracer = enable_tracing()
+        with span('outer', skill='a') as s:
+            s.add(bytes=10)
+            with span('inner'):
+                pass
+        with pytest.raises(ValueError):
+            with span('failing'):
+                raise ValueError()
+
+        trace_file = Path(self.temp_dir) / "trace.json"
+        tracer.write_chrome_trace(str(trace_file))
+        events = json.loads(trace_file.read_text(encoding='utf-8'))['traceEvents']
+        assert [e['name'] for e in events] == ['outer a', 'inner', 'failing']
+        assert all(e['ph'] == 'X' and e['dur'] >= 0 for e in events)
+        assert events[0]['args'] == {'skill': 'a', 'bytes': 10}
+        assert events[2]['args'] == {'error': 'ValueError'}
+
+        json_file = Path(self.temp_dir) / "report.json"
+        tracer.write_json(str(json_file))
+        assert json.loads(json_file.read_text(encoding='utf-8'))['summary']['outer']['bytes'] == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
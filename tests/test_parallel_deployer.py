@@ -0,0 +1,79 @@
+"""
+并行部署器测试
+"""
+
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.skill_manager import SkillManager
+from src.skill_deployer import SkillDeployer
+from src.parallel_deployer import ParallelDeployer
+
+
+class TestParallelDeployer:
+    """并行部署器测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.skills_dir = Path(self.temp_dir) / "skills"
+        self.deployed_dir = Path(self.temp_dir) / "deployed"
+        self.config_dir = Path(self.temp_dir) / "config"
+
+        self.skill_names = [f"skill-{i:02d}" for i in range(8)]
+        for name in self.skill_names:
+            skill_dir = self.skills_dir / name
+            (skill_dir / "scripts").mkdir(parents=True)
+            (skill_dir / "SKILL.md").write_text(
+                f"---\nname: {name}\ndescription: 并行测试\n---\n\n# {name}\n", encoding='utf-8')
+            (skill_dir / "scripts" / "main.py").write_text("print('ok')\n", encoding='utf-8')
+
+    def teardown_method(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_results_keep_input_order(self):
+        """测试结果顺序与输入顺序一致"""
+        manager = SkillManager(str(self.skills_dir), str(self.deployed_dir))
+        deployer = SkillDeployer(str(self.deployed_dir), str(self.config_dir))
+
+        names = list(reversed(self.skill_names))
+        reports = ParallelDeployer(manager, deployer, jobs=4).deploy(names)
+
+        assert [r['skill_name'] for r in reports] == names
+        assert all(r['success'] for r in reports)
+        assert all(r['total_time'] >= r['deploy_time'] for r in reports)
+        assert (self.deployed_dir / "skill-03" / "scripts" / "main.py").exists()
+
+    def test_process_pool_parsing(self):
+        """测试使用进程池解析"""
+        manager = SkillManager(str(self.skills_dir), str(self.deployed_dir))
+        deployer = SkillDeployer(str(self.deployed_dir), str(self.config_dir))
+
+        reports = ParallelDeployer(manager, deployer, jobs=2, parse_processes=2).deploy(self.skill_names)
+
+        assert all(r['success'] for r in reports)
+
+    def test_missing_skill_reported(self):
+        """测试无法加载的技能返回失败结果"""
+        manager = SkillManager(str(self.skills_dir), str(self.deployed_dir))
+
+        reports = ParallelDeployer(manager, jobs=2).deploy(["skill-00", "missing"])
+
+        assert reports[0]['success'] is True
+        assert reports[1]['success'] is False
+        assert reports[1]['error']
+
+    def test_deploy_all_skills_parallel(self):
+        """测试 deploy_all_skills 并行模式"""
+        manager = SkillManager(str(self.skills_dir), str(self.deployed_dir))
+
+        results = manager.deploy_all_skills(jobs=4)
+
+        assert set(results) == set(self.skill_names)
+        assert all(results.values())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,182 @@
+"""
+技能包测试
+"""
+
+import json
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.skill_bundle import SkillBundle, SkillBundleWriter, BundleError, BUNDLE_MAGIC, _HEADER
+from src.skill_deployer import SkillDeployer
+
+
+class TestSkillBundle:
+    """技能包测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.deployed_dir = Path(self.temp_dir) / "deployed"
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.bundle_path = Path(self.temp_dir) / "skills.bundle"
+        self.deployer = SkillDeployer(str(self.deployed_dir), str(self.config_dir))
+
+        for name, category in (("pdf", "documents"), ("xlsx", "spreadsheets")):
+            skill_path = Path(self.temp_dir) / "skills" / name
+            (skill_path / "scripts").mkdir(parents=True)
+            (skill_path / "SKILL.md").write_text(f"---\nname: {name}\n---\n\n# {name} 技能\n", encoding='utf-8')
+            (skill_path / "scripts" / "main.py").write_text(f"print('{name}')\n", encoding='utf-8')
+            (skill_path / "scripts" / "empty.txt").write_bytes(b"")
+            skill_info = {'name': name, 'metadata': {'name': name, 'category': category, 'description': name},
+                          'content': ''}
+            assert self.deployer.deploy_skill(skill_path, skill_info)
+
+    def teardown_method(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_export_and_random_access(self):
+        """测试打包已部署技能后不解包直接读取"""
+        assert self.deployer.export_bundle(str(self.bundle_path)) == ["pdf", "xlsx"]
+
+        with SkillBundle(str(self.bundle_path)) as bundle:
+            assert bundle.skills() == ["pdf", "xlsx"]
+            assert "pdf" in bundle and len(bundle) == 2
+            assert bundle.skill_md("pdf") == "---\nname: pdf\n---\n\n# pdf 技能\n"
+            assert bundle.read("xlsx", "scripts/main.py") == b"print('xlsx')\n"
+            assert bundle.read("xlsx", "scripts/empty.txt") == b""
+            assert "deployment.json" not in bundle.files("pdf")
+            assert "USAGE.md" in bundle.files("pdf")
+
+            with bundle.view("pdf", "scripts/main.py") as view:
+                assert bytes(view) == b"print('pdf')\n"
+
+            assert bundle.metadata("xlsx")['category'] == "spreadsheets"
+            record = bundle.record("pdf")
+            assert record['name'] == "pdf"
+            assert record.manifest == self.deployer.get_deployment_status("pdf")['manifest']
+
+            assert all(bundle.verify().values())
+
+            with pytest.raises(KeyError):
+                bundle.read("pdf", "missing.txt")
+            with pytest.raises(KeyError):
+                bundle.skill_md("missing")
+
+    def test_extract_matches_deployment(self):
+        """测试解包结果与原部署一致"""
+        self.deployer.export_bundle(str(self.bundle_path), ["pdf"])
+        target = Path(self.temp_dir) / "restored"
+
+        with SkillBundle(str(self.bundle_path)) as bundle:
+            assert bundle.skills() == ["pdf"]
+            bundle.extract("pdf", str(target))
+
+        restored = SkillDeployer(str(target), str(Path(self.temp_dir) / "restored-config"))
+        status = restored.get_deployment_status("pdf", level='verify')
+        assert status.intact is True
+        assert json.loads((target / "pdf" / "deployment.json").read_text(encoding='utf-8')) == \
+            json.loads((self.deployed_dir / "pdf" / "deployment.json").read_text(encoding='utf-8'))
+
+    def test_verify_detects_corruption(self):
+        """测试校验发现被修改的技能包数据"""
+        self.deployer.export_bundle(str(self.bundle_path))
+        with SkillBundle(str(self.bundle_path)) as bundle:
+            offset = bundle._entry("pdf", "scripts/main.py")[0]
+
+        data = bytearray(self.bundle_path.read_bytes())
+        data[offset] ^= 0xFF
+        self.bundle_path.write_bytes(bytes(data))
+
+        with SkillBundle(str(self.bundle_path)) as bundle:
+            result = bundle.verify("pdf")
+            assert result["pdf/scripts/main.py"] is False
+            assert result["pdf/SKILL.md"] is True
+
+    def test_invalid_bundle(self):
+        """测试无效的技能包文件"""
+        self.bundle_path.write_bytes(b"not a bundle")
+        with pytest.raises(BundleError):
+            SkillBundle(str(self.bundle_path))
+
+        self.bundle_path.write_bytes(b"x" * 64)
+        with pytest.raises(BundleError):
+            SkillBundle(str(self.bundle_path))
+
+    def _write_raw_bundle(self, skills: dict, data: bytes = b"payload"):
+        """按格式直接写入技能包（用于构造不可信的目录）"""
+        toc = json.dumps({'version': 1, 'skills': skills}).encode('utf-8')
+        toc_offset = _HEADER.size + len(data)
+        self.bundle_path.write_bytes(_HEADER.pack(BUNDLE_MAGIC, 1, 0, toc_offset, len(toc)) + data + toc)
+
+    @pytest.mark.parametrize("skill_name, rel_path", [
+        ("pdf", "../../escaped.txt"),
+        ("pdf", "/tmp/escaped.txt"),
+        ("pdf", "scripts/../../escaped.txt"),
+        ("..", "escaped.txt"),
+        ("a/b", "escaped.txt"),
+    ])
+    def test_rejects_unsafe_paths(self, skill_name, rel_path):
+        """测试拒绝目录中的绝对路径与 .. 路径（防止解包到目标目录之外）"""
+        self._write_raw_bundle({skill_name: {'config': {}, 'files': {rel_path: [_HEADER.size, 7, '']}}})
+        with pytest.raises(BundleError):
+            SkillBundle(str(self.bundle_path))
+        assert not (Path(self.temp_dir).parent / "escaped.txt").exists()
+
+        with pytest.raises(ValueError):
+            with SkillBundleWriter(str(Path(self.temp_dir) / "out.bundle")) as writer:
+                writer.add_skill(skill_name, {rel_path: self.bundle_path})
+
+    @pytest.mark.parametrize("offset, size", [(0, 7), (_HEADER.size, 8), (_HEADER.size + 7, 1), (-1, 7)])
+    def test_rejects_out_of_range_entries(self, offset, size):
+        """测试拒绝数据范围超出数据区（指向文件头或目录）的文件"""
+        self._write_raw_bundle({'pdf': {'config': {}, 'files': {'SKILL.md': [offset, size, '']}}})
+        with pytest.raises(BundleError):
+            SkillBundle(str(self.bundle_path))
+
+    def test_extract_does_not_follow_symlinks(self):
+        """测试解包时不通过目标目录中已有的符号链接写到外部"""
+        self.deployer.export_bundle(str(self.bundle_path), ["pdf"])
+        target = Path(self.temp_dir) / "restored"
+        outside = Path(self.temp_dir) / "outside.txt"
+        outside.write_text("原内容", encoding='utf-8')
+        (target / "pdf").mkdir(parents=True)
+        (target / "pdf" / "SKILL.md").symlink_to(outside)
+
+        with SkillBundle(str(self.bundle_path)) as bundle:
+            bundle.extract("pdf", str(target))
+
+        assert outside.read_text(encoding='utf-8') == "原内容"
+        assert not (target / "pdf" / "SKILL.md").is_symlink()
+
+    def test_extract_rejects_symlinked_directories(self):
+        """测试目标目录中的目录符号链接指向外部时，不在外部创建任何文件或目录"""
+        source = Path(self.temp_dir) / "run.py"
+        source.write_text("print('run')\n", encoding='utf-8')
+        with SkillBundleWriter(str(self.bundle_path)) as writer:
+            writer.add_skill("demo", {"scripts/x/run.py": source})
+
+        target = Path(self.temp_dir) / "restored"
+        outside = Path(self.temp_dir) / "outside"
+        outside.mkdir()
+        (target / "demo").mkdir(parents=True)
+        (target / "demo" / "scripts").symlink_to(outside, target_is_directory=True)
+
+        with SkillBundle(str(self.bundle_path)) as bundle:
+            with pytest.raises(BundleError):
+                bundle.extract("demo", str(target))
+
+        assert list(outside.iterdir()) == []
+
+    def test_writer_aborts_on_error(self):
+        """测试写入失败时不留下不完整的技能包"""
+        with pytest.raises(FileNotFoundError):
+            with SkillBundleWriter(str(self.bundle_path)) as writer:
+                writer.add_skill("broken", {"SKILL.md": Path(self.temp_dir) / "missing.md"})
+
+        assert list(Path(self.temp_dir).glob("*bundle*")) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
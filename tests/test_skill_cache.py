@@ -0,0 +1,95 @@
+"""
+技能缓存测试
+"""
+
+import os
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.skill_manager import SkillManager
+
+
+SKILL_CONTENT = """---
+name: cached-skill
+description: 缓存测试技能
+version: 1.0.0
+---
+
+# 缓存技能
+
+正文内容。
+"""
+
+
+class TestSkillCache:
+    """技能缓存测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.skills_dir = Path(self.temp_dir) / "skills"
+        self.deployed_dir = Path(self.temp_dir) / "deployed"
+        self.cache_file = Path(self.temp_dir) / "config" / "skill_cache.db"
+
+        self.skill_dir = self.skills_dir / "cached-skill"
+        (self.skill_dir / "scripts").mkdir(parents=True)
+        (self.skill_dir / "SKILL.md").write_text(SKILL_CONTENT, encoding='utf-8')
+        (self.skill_dir / "scripts" / "run.py").write_text("print('hi')\n", encoding='utf-8')
+
+    def teardown_method(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def _manager(self):
+        return SkillManager(str(self.skills_dir), str(self.deployed_dir), str(self.cache_file))
+
+    def test_cache_hit_matches_uncached(self):
+        """测试缓存命中结果与直接解析一致"""
+        uncached = SkillManager(str(self.skills_dir), str(self.deployed_dir)).load_skill("cached-skill")
+
+        self._manager().load_skill("cached-skill")
+        manager = self._manager()
+        manager.cache.put = None  # 命中时不应写缓存
+        cached = manager.load_skill("cached-skill")
+
+        assert self.cache_file.exists()
+        assert cached == uncached
+
+    def test_cache_invalidated_on_change(self):
+        """测试 SKILL.md 修改后缓存失效"""
+        self._manager().load_skill("cached-skill")
+
+        skill_file = self.skill_dir / "SKILL.md"
+        skill_file.write_text(SKILL_CONTENT.replace("1.0.0", "2.0.0") + "新增内容\n", encoding='utf-8')
+
+        skill_info = self._manager().load_skill("cached-skill")
+        assert skill_info['metadata']['version'] == "2.0.0"
+        assert skill_info['content'].endswith("新增内容")
+
+    def test_cache_same_size_rewrite_uses_hash(self):
+        """测试大小不变但内容变化时通过哈希判断失效"""
+        self._manager().load_skill("cached-skill")
+
+        skill_file = self.skill_dir / "SKILL.md"
+        skill_file.write_text(SKILL_CONTENT.replace("1.0.0", "9.9.9"), encoding='utf-8')
+        st = skill_file.stat()
+        os.utime(skill_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+        skill_info = self._manager().load_skill("cached-skill")
+        assert skill_info['metadata']['version'] == "9.9.9"
+
+    def test_cache_invalidated_on_resource_added(self):
+        """测试新增资源文件后缓存失效"""
+        self._manager().load_skill("cached-skill")
+
+        nested = self.skill_dir / "scripts" / "lib"
+        nested.mkdir()
+        (nested / "util.py").write_text("", encoding='utf-8')
+
+        skill_info = self._manager().load_skill("cached-skill")
+        assert str(Path("scripts") / "lib" / "util.py") in skill_info['resources']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
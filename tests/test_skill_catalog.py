@@ -0,0 +1,118 @@
+"""
+技能目录测试
+"""
+
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.skill_catalog import SkillCatalog, normalize_tags
+from src.skill_deployer import SkillDeployer
+from src.skill_record import SkillRecord
+
+
+def make_record(name, **metadata):
+    return SkillRecord(name, dict(metadata, name=name), deployed_at='1700000000.5')
+
+
+class TestSkillCatalog:
+    """技能目录测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.catalog_file = Path(self.temp_dir) / "config" / "skill_catalog.db"
+        self.catalog = SkillCatalog(str(self.catalog_file))
+
+        self.catalog.replace_all([
+            make_record('pdf', category='documents', author='Anthropic', tags=['pdf', 'forms']),
+            make_record('pptx', category='documents', author='Anthropic', tags='slides, office'),
+            make_record('webapp-testing', category='development', tags=['testing']),
+            make_record('web-artifacts', author='Someone'),
+        ], generation=4)
+
+    def teardown_method(self):
+        """测试清理"""
+        self.catalog.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_normalize_tags(self):
+        """测试标签规范化"""
+        assert normalize_tags("a, b,,a") == ['a', 'b']
+        assert normalize_tags(['x', ' y ', 1]) == ['x', 'y', '1']
+        assert normalize_tags(None) == []
+
+    def test_query_filters(self):
+        """测试按分类、标签、作者和名称前缀查询"""
+        assert [s['name'] for s in self.catalog.query(category='documents')] == ['pdf', 'pptx']
+        assert [s['name'] for s in self.catalog.query(tag='slides')] == ['pptx']
+        assert [s['name'] for s in self.catalog.query(author='Anthropic', tag='forms')] == ['pdf']
+        assert [s['name'] for s in self.catalog.query(name_prefix='web')] == ['web-artifacts', 'webapp-testing']
+        assert [s['name'] for s in self.catalog.query(limit=1)] == ['pdf']
+
+        pdf = self.catalog.query(name_prefix='pdf')[0]
+        assert pdf['tags'] == ['forms', 'pdf']
+        assert pdf['deployed_at'] == 1700000000.5
+        assert pdf['metadata']['author'] == 'Anthropic'
+
+    def test_category_counts_and_generation(self):
+        """测试分类统计与部署代数"""
+        assert self.catalog.category_counts() == {'development': 1, 'documents': 2, 'uncategorized': 1}
+        assert self.catalog.generation == 4
+
+        self.catalog.remove('pdf', generation=5)
+        self.catalog.upsert(make_record('pptx', category='slides'), generation=6)
+        assert self.catalog.category_counts() == {'development': 1, 'slides': 1, 'uncategorized': 1}
+        assert self.catalog.query(tag='slides') == []
+        assert self.catalog.generation == 6
+
+    def test_deployer_maintains_catalog(self):
+        """测试部署器在部署/卸载时维护技能目录"""
+        skill_path = Path(self.temp_dir) / "skills" / "demo-skill"
+        skill_path.mkdir(parents=True)
+        (skill_path / "SKILL.md").write_text("---\nname: demo-skill\n---\n\n# 演示\n", encoding='utf-8')
+
+        deployer = SkillDeployer(str(Path(self.temp_dir) / "deployed"), str(Path(self.temp_dir) / "config"),
+                                 catalog_file=str(Path(self.temp_dir) / "deployer_catalog.db"))
+        deployer.deploy_skill(skill_path, {'name': 'demo-skill', 'metadata': {'category': 'demo', 'tags': ['x']}})
+        assert [s['name'] for s in deployer.catalog.query(tag='x')] == ['demo-skill']
+        assert deployer.catalog.generation == 1
+
+        deployer.undeploy_skill('demo-skill')
+        assert deployer.catalog.count() == 0
+
+        # 目录与部署代数不一致时完整同步
+        deployer.deploy_skill(skill_path, {'name': 'demo-skill', 'metadata': {}})
+        deployer.catalog.replace_all([], generation=0)
+        assert deployer.sync_catalog().count() == 1
+
+    def test_search(self):
+        """测试全文搜索的 BM25 排序、短语查询与增量更新"""
+        deployed_dir = Path(self.temp_dir) / "deployed"
+        for name, body in (
+            ('pdf', "# PDF\n\nFill a fillable form field.\n\n## Forms\n\nCommand: fill_form.py input.pdf"),
+            ('docx', "# DOCX\n\nReview tracked changes in a document.\nForm letters are supported."),
+        ):
+            (deployed_dir / name).mkdir(parents=True)
+            (deployed_dir / name / "SKILL.md").write_text(
+                f"---\nname: {name}\ndescription: {name} skill\n---\n\n{body}\n", encoding='utf-8')
+            self.catalog.upsert(SkillRecord(name, {'description': f'{name} skill'},
+                                            deploy_path=str(deployed_dir / name)))
+
+        assert [r['name'] for r in self.catalog.search('form')] == ['pdf', 'docx']
+        assert [r['name'] for r in self.catalog.search('tracked changes', phrase=True)] == ['docx']
+        assert self.catalog.search('changes tracked', phrase=True) == []
+        assert [r['name'] for r in self.catalog.search('fill_form')] == ['pdf']
+        assert '[' in self.catalog.search('fillable')[0]['snippet']
+
+        # FTS5 语法错误时按普通词语查询
+        assert [r['name'] for r in self.catalog.search('"tracked')] == ['docx']
+
+        self.catalog.remove('docx')
+        assert self.catalog.search('tracked') == []
+        self.catalog.replace_all([])
+        assert self.catalog.search('form') == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
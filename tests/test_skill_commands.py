@@ -0,0 +1,141 @@
+"""
+技能命令提取测试
+"""
+
+import re
+import pytest
+from src.skill_commands import (
+    CommandExtractor, CommandMatch, SHELL_PROMPT_PATTERN, FENCED_SHELL_PATTERN, _literal_prefix
+)
+from src.skill_loader import SkillLoader
+
+
+CONTENT = """# 工具
+
+Usage: python run.py --input file
+命令: make deploy
+
+$ pip install -r requirements.txt
+
+```bash
+npm install
+npm run build
+```
+
+```python
+print("不是 shell")
+```
+"""
+
+
+def legacy_extract(content):
+    """原 extract_skill_commands 的实现"""
+    commands = []
+    for pattern in [r'命令:\s*(.+)', r'Command:\s*(.+)', r'Usage:\s*(.+)', r'用法:\s*(.+)']:
+        commands.extend(re.findall(pattern, content, re.IGNORECASE | re.MULTILINE))
+    return commands
+
+
+class TestCommandExtractor:
+    """命令提取引擎测试类"""
+
+    def test_default_patterns_match_legacy(self):
+        """测试默认模式提取的命令与原实现一致（顺序改为按出现顺序）"""
+        extractor = CommandExtractor()
+        matches = extractor.extract(CONTENT)
+
+        assert sorted(m.text for m in matches) == sorted(legacy_extract(CONTENT))
+        assert [m.kind for m in matches] == ['usage', 'command']
+
+    def test_positions(self):
+        """测试返回的位置指向命令文本"""
+        for match in CommandExtractor().extract(CONTENT):
+            assert CONTENT[match.start:match.end] == match.text
+
+    def test_registered_patterns(self):
+        """测试注册 shell 提示符与围栏代码块模式"""
+        extractor = CommandExtractor()
+        extractor.register('shell', SHELL_PROMPT_PATTERN)
+        extractor.register('fenced', FENCED_SHELL_PATTERN)
+
+        matches = extractor.extract(CONTENT)
+        assert [(m.kind, m.text) for m in matches] == [
+            ('usage', 'python run.py --input file'),
+            ('command', 'make deploy'),
+            ('shell', 'pip install -r requirements.txt'),
+            ('fenced', 'npm install\nnpm run build'),
+        ]
+
+    def test_pattern_without_group(self):
+        """测试没有捕获组的模式取整个匹配"""
+        extractor = CommandExtractor(patterns=[('make', r'make \w+')])
+        assert extractor.extract("run make deploy now") == [CommandMatch('make', 'make deploy', 4, 15)]
+
+    def test_overlapping_matches(self):
+        """测试重叠的匹配只保留先出现的一个"""
+        matches = CommandExtractor().extract("Usage: Command: make deploy\nCommand: make test")
+        assert [(m.kind, m.text) for m in matches] == [
+            ('usage', 'Command: make deploy'),
+            ('command', 'make test'),
+        ]
+
+    @pytest.mark.parametrize("pattern, prefix", [
+        (r'Usage:\s*(.+)', 'usage:'),
+        (r'Usages?:\s*(.+)', 'usage'),
+        (r'run+\s(.+)', 'run'),
+        (r'命令:\s*(.+)', None),
+        (r'(?:Usage|用法):\s*(.+)', None),
+        (r'Usage|Run', None),
+        (SHELL_PROMPT_PATTERN, None),
+    ])
+    def test_literal_prefix(self, pattern, prefix):
+        """测试预检用的字面量前缀"""
+        assert _literal_prefix(pattern, re.IGNORECASE) == prefix
+        assert _literal_prefix(pattern, 0) is None
+
+    def test_prefix_guard_keeps_ignorecase_matches(self):
+        """测试前缀预检不漏掉忽略大小写才能匹配的命令"""
+        extractor = CommandExtractor(patterns=[('usage', r'Usage:\s*(.+)'), ('file', r'file:\s*(.+)')])
+        content = "USAGE: a\nusaGe: b\nFİle: c\nfıle: d\nfile e"
+        assert [m.text for m in extractor.extract(content)] == ['a', 'b', 'c', 'd']
+        assert extractor.extract("没有命令") == []
+
+    @pytest.mark.parametrize("content", [
+        "Usage: a\nUSAGE: b Usage: c\n",
+        "straße Usage: a\nusage: b\n",
+        "İ Usage: a\nı usage: b\n",
+        "Usage:\nUsage:\n",
+    ])
+    def test_prefix_scan_matches_finditer(self, content):
+        """测试按前缀位置匹配与整遍扫描结果一致（含折叠后长度变化的正文）"""
+        pattern = r'Usage:[ \t]*(.*)'
+        extractor = CommandExtractor(patterns=[('usage', pattern)])
+        expected = [
+            CommandMatch('usage', m.group(1), m.start(1), m.end(1))
+            for m in re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
+        ]
+        assert extractor.extract(content) == expected
+
+    def test_invalid_pattern(self):
+        """测试无效的正则"""
+        with pytest.raises(ValueError):
+            CommandExtractor().register('bad', r'(unclosed')
+
+    def test_batch(self):
+        """测试批量提取与命令目录"""
+        loader = SkillLoader()
+        skills = [
+            {'name': 'a', 'content': CONTENT},
+            {'name': 'b', 'content': '没有命令'},
+        ]
+
+        results = dict(loader.extract_commands_many(skills))
+        assert len(results['a']) == 2 and results['b'] == []
+
+        catalog = loader.command_extractor.command_catalog((s['name'], s['content']) for s in skills)
+        assert list(catalog) == ['a']
+        assert catalog['a'][0]['kind'] == 'usage'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,362 @@
+"""
+技能部署器测试
+"""
+
+import os
+import json
+import errno
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.skill_deployer import SkillDeployer
+from src.skill_record import SkillRecord
+
+
+class TestSkillDeployer:
+    """技能部署器测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.skill_path = Path(self.temp_dir) / "skills" / "demo-skill"
+        self.deployed_dir = Path(self.temp_dir) / "deployed"
+        self.config_dir = Path(self.temp_dir) / "config"
+
+        (self.skill_path / "scripts" / "lib").mkdir(parents=True)
+        (self.skill_path / "SKILL.md").write_text(
+            "---\nname: demo-skill\ndescription: 部署测试\n---\n\n# 演示\n", encoding='utf-8')
+        (self.skill_path / "scripts" / "main.py").write_text("print('main')\n", encoding='utf-8')
+        (self.skill_path / "scripts" / "lib" / "util.py").write_text("X = 1\n", encoding='utf-8')
+
+        self.skill_info = {
+            'name': 'demo-skill',
+            'metadata': {'name': 'demo-skill', 'description': '部署测试'},
+            'content': '# 演示'
+        }
+
+    def teardown_method(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def _deployer(self):
+        return SkillDeployer(str(self.deployed_dir), str(self.config_dir))
+
+    def test_first_deploy_writes_manifest(self):
+        """测试首次部署生成文件清单"""
+        deployer = self._deployer()
+        assert deployer.plan_deployment(self.skill_path, 'demo-skill')['mode'] == 'full'
+        assert deployer.deploy_skill(self.skill_path, self.skill_info) is True
+
+        config = json.loads((self.deployed_dir / "demo-skill" / "deployment.json").read_text(encoding='utf-8'))
+        assert set(config['manifest']) == {"SKILL.md", "scripts/main.py", "scripts/lib/util.py"}
+        assert config['manifest']["scripts/main.py"]['size'] == len("print('main')\n")
+
+    def test_plan_reports_delta(self):
+        """测试部署计划报告新增/变更/删除"""
+        deployer = self._deployer()
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+
+        (self.skill_path / "scripts" / "main.py").write_text("print('main v2')\n", encoding='utf-8')
+        (self.skill_path / "scripts" / "lib" / "util.py").unlink()
+        (self.skill_path / "scripts" / "new.py").write_text("", encoding='utf-8')
+
+        plan = deployer.plan_deployment(self.skill_path, 'demo-skill')
+        assert plan['mode'] == 'incremental'
+        assert plan['added'] == ["scripts/new.py"]
+        assert plan['changed'] == ["scripts/main.py"]
+        assert plan['removed'] == ["scripts/lib/util.py"]
+        assert plan['unchanged'] == ["SKILL.md"]
+
+    def test_incremental_deploy_only_touches_delta(self):
+        """测试增量部署只复制变更文件并删除已移除文件"""
+        deployer = self._deployer()
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+        deploy_path = self.deployed_dir / "demo-skill"
+        skill_inode = (deploy_path / "SKILL.md").stat().st_ino
+
+        (self.skill_path / "scripts" / "main.py").write_text("print('main v2')\n", encoding='utf-8')
+        shutil.rmtree(self.skill_path / "scripts" / "lib")
+
+        assert deployer.deploy_skill(self.skill_path, self.skill_info) is True
+        assert (deploy_path / "SKILL.md").stat().st_ino == skill_inode
+        assert (deploy_path / "scripts" / "main.py").read_text(encoding='utf-8') == "print('main v2')\n"
+        assert not (deploy_path / "scripts" / "lib").exists()
+
+        config = json.loads((deploy_path / "deployment.json").read_text(encoding='utf-8'))
+        assert set(config['manifest']) == {"SKILL.md", "scripts/main.py"}
+
+    def test_incremental_deploy_repairs_deployed_files(self):
+        """测试增量部署修复被删除或修改的已部署文件"""
+        deployer = self._deployer()
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+        deploy_path = self.deployed_dir / "demo-skill"
+        (deploy_path / "scripts" / "lib" / "util.py").unlink()
+        (deploy_path / "scripts" / "main.py").write_text("被篡改", encoding='utf-8')
+
+        plan = deployer.plan_deployment(self.skill_path, 'demo-skill')
+        assert plan['changed'] == ["scripts/lib/util.py", "scripts/main.py"]
+        assert plan['unchanged'] == ["SKILL.md"]
+
+        assert deployer.deploy_skill(self.skill_path, self.skill_info) is True
+        assert deployer.get_deployment_status('demo-skill', level='verify').intact is True
+
+    def test_force_rebuilds(self):
+        """测试 force 执行完整重建"""
+        deployer = self._deployer()
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+        stray = self.deployed_dir / "demo-skill" / "scripts" / "stray.txt"
+        stray.write_text("残留", encoding='utf-8')
+
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+        assert stray.exists()
+
+        deployer.deploy_skill(self.skill_path, self.skill_info, force=True)
+        assert not stray.exists()
+
+    def test_object_store_deduplicates(self):
+        """测试对象存储对相同文件去重"""
+        other_path = Path(self.temp_dir) / "skills" / "other-skill"
+        shutil.copytree(self.skill_path, other_path)
+        other_info = dict(self.skill_info, name='other-skill')
+
+        deployer = SkillDeployer(str(self.deployed_dir), str(self.config_dir), use_object_store=True)
+        assert deployer.deploy_skill(self.skill_path, self.skill_info) is True
+        assert deployer.deploy_skill(other_path, other_info) is True
+
+        first = self.deployed_dir / "demo-skill" / "scripts" / "main.py"
+        second = self.deployed_dir / "other-skill" / "scripts" / "main.py"
+        assert first.read_text(encoding='utf-8') == "print('main')\n"
+        assert first.stat().st_ino == second.stat().st_ino
+
+        status = deployer.get_deployment_status('demo-skill', verify=True)
+        assert status['intact'] is True
+
+    def test_store_mode_switch_keeps_shared_objects_intact(self):
+        """测试从对象存储切换为普通复制时不修改共享的硬链接文件"""
+        other_path = Path(self.temp_dir) / "skills" / "other-skill"
+        shutil.copytree(self.skill_path, other_path)
+        dedup = SkillDeployer(str(self.deployed_dir), str(self.config_dir), use_object_store=True)
+        dedup.deploy_skill(self.skill_path, self.skill_info)
+        dedup.deploy_skill(other_path, dict(self.skill_info, name='other-skill'))
+
+        (self.skill_path / "scripts" / "main.py").write_text("print('main v2')\n", encoding='utf-8')
+        plain = self._deployer()
+        assert plain.plan_deployment(self.skill_path, 'demo-skill')['mode'] == 'full'
+        assert plain.deploy_skill(self.skill_path, self.skill_info) is True
+
+        config = json.loads((self.deployed_dir / "demo-skill" / "deployment.json").read_text(encoding='utf-8'))
+        assert config['store'] == 'copy'
+        assert (self.deployed_dir / "demo-skill" / "scripts" / "main.py").stat().st_nlink == 1
+        assert (self.deployed_dir / "other-skill" / "scripts" / "main.py").read_text(encoding='utf-8') == \
+            "print('main')\n"
+        assert plain.get_deployment_status('other-skill', level='verify').intact is True
+
+    def test_verify_detects_corruption(self):
+        """测试完整性校验发现被修改的文件"""
+        deployer = self._deployer()
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+        (self.deployed_dir / "demo-skill" / "scripts" / "main.py").write_text("被篡改", encoding='utf-8')
+
+        status = deployer.get_deployment_status('demo-skill', verify=True)
+        assert status['intact'] is False
+        assert status['integrity']["scripts/main.py"] is False
+        assert status['integrity']["SKILL.md"] is True
+
+    def test_status_levels(self):
+        """测试 quick / stat / verify 三种状态检查级别"""
+        deployer = self._deployer()
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+        (self.deployed_dir / "demo-skill" / "scripts" / "lib" / "util.py").unlink()
+        (self.deployed_dir / "demo-skill" / "scripts" / "main.py").write_text("print('changed')\n", encoding='utf-8')
+
+        quick = deployer.get_deployment_status('demo-skill', level='quick')
+        assert quick.intact is None
+        assert all(quick.files_exist.values())
+
+        stat = deployer.get_deployment_status('demo-skill', level='stat')
+        assert stat.files_exist["scripts/lib/util.py"] is False
+        assert stat.integrity["scripts/main.py"] is False
+        assert stat.integrity["SKILL.md"] is True
+        assert stat.intact is False
+
+        verify = deployer.get_deployment_status('demo-skill', level='verify')
+        assert verify.integrity == stat.integrity
+
+        with pytest.raises(ValueError):
+            deployer.get_deployment_status('demo-skill', level='unknown')
+
+    def test_stat_level_with_object_store(self):
+        """测试对象存储硬链接部署后 stat 级别检查通过"""
+        other_path = Path(self.temp_dir) / "skills" / "other-skill"
+        shutil.copytree(self.skill_path, other_path)
+        deployer = SkillDeployer(str(self.deployed_dir), str(self.config_dir), use_object_store=True)
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+        deployer.deploy_skill(other_path, dict(self.skill_info, name='other-skill'))
+
+        for skill in deployer.list_deployed_skills(level='stat'):
+            assert skill.intact is True
+
+    def test_index_updated_incrementally(self):
+        """测试部署/卸载增量维护技能索引"""
+        deployer = self._deployer()
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+        other_path = Path(self.temp_dir) / "skills" / "other-skill"
+        shutil.copytree(self.skill_path, other_path)
+        deployer.deploy_skill(other_path, {'name': 'other-skill', 'metadata': {'category': 'tools'}})
+
+        index = json.loads((self.config_dir / "skill_index.json").read_text(encoding='utf-8'))
+        assert [s['name'] for s in index['skills']] == ['demo-skill', 'other-skill']
+        assert index['categories'] == {'uncategorized': 1, 'tools': 1}
+        assert index['generation'] == 2
+
+        deployer.undeploy_skill('other-skill')
+        index = deployer.generate_skill_index()
+        assert index['total_skills'] == 1
+        assert index['categories'] == {'uncategorized': 1}
+        rebuilt = deployer.generate_skill_index(rebuild=True)
+        assert {k: v for k, v in index.items() if k != 'last_updated'} == \
+            {k: v for k, v in rebuilt.items() if k != 'last_updated'}
+
+    def test_index_delta_keeps_names_sorted(self):
+        """测试增量更新按名称有序插入、更新与删除"""
+        index = {'total_skills': 0, 'skills': [], 'categories': {}}
+        for name in ['c', 'a', 'd', 'b', 'a']:
+            SkillDeployer._apply_index_delta(index, name, SkillRecord(name, {'category': name}))
+        assert [entry['name'] for entry in index['skills']] == ['a', 'b', 'c', 'd']
+        assert index['categories'] == {'a': 1, 'b': 1, 'c': 1, 'd': 1}
+
+        SkillDeployer._apply_index_delta(index, 'b', None)
+        SkillDeployer._apply_index_delta(index, 'e', None)
+        assert [entry['name'] for entry in index['skills']] == ['a', 'c', 'd']
+        assert index['total_skills'] == 3 and 'b' not in index['categories']
+
+    def test_index_rebuilt_on_generation_drift(self):
+        """测试部署代数不一致时完整重建索引"""
+        deployer = self._deployer()
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+
+        # 另一个部署器（不同的配置目录）部署后，原索引的代数已落后
+        other = SkillDeployer(str(self.deployed_dir), str(Path(self.temp_dir) / "other-config"))
+        other_path = Path(self.temp_dir) / "skills" / "other-skill"
+        shutil.copytree(self.skill_path, other_path)
+        other.deploy_skill(other_path, dict(self.skill_info, name='other-skill'))
+
+        index = deployer.generate_skill_index()
+        assert index['total_skills'] == 2
+        assert index['generation'] == 2
+
+    def test_undeploy_collects_unreferenced_objects(self):
+        """测试卸载后清理未引用的对象"""
+        deployer = SkillDeployer(str(self.deployed_dir), str(self.config_dir), use_object_store=True)
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+        objects = [p for p in (self.deployed_dir / ".objects").rglob('*') if p.is_file()]
+        assert len(objects) == 3
+
+        deployer.undeploy_skill('demo-skill')
+        assert not [p for p in (self.deployed_dir / ".objects").rglob('*') if p.is_file()]
+
+    def test_unchanged_redeploy_skips_writes(self):
+        """测试重复部署未变更的技能时不重写 deployment.json 与 USAGE.md"""
+        deployer = self._deployer()
+        skill_info = dict(self.skill_info, content='价格 $100 与 ${name}')
+        deployer.deploy_skill(self.skill_path, skill_info)
+        deploy_path = self.deployed_dir / "demo-skill"
+        config_file = deploy_path / "deployment.json"
+        usage_file = deploy_path / "USAGE.md"
+
+        assert '价格 $100 与 ${name}' in usage_file.read_text(encoding='utf-8')
+        config = json.loads(config_file.read_text(encoding='utf-8'))
+        assert "USAGE.md" in config['resources']
+        before = {path: path.stat().st_ino for path in (config_file, usage_file)}
+
+        deployer.deploy_skill(self.skill_path, skill_info)
+        assert {path: path.stat().st_ino for path in (config_file, usage_file)} == before
+        assert json.loads(config_file.read_text(encoding='utf-8')) == config
+
+        (self.skill_path / "scripts" / "main.py").write_text("print('main v2')\n", encoding='utf-8')
+        deployer.deploy_skill(self.skill_path, skill_info)
+        assert config_file.stat().st_ino != before[config_file]
+        assert json.loads(config_file.read_text(encoding='utf-8'))['deployed_at'] != config['deployed_at']
+
+    def test_staged_deploy_and_rollback(self):
+        """测试分阶段部署的原子切换、版本保留与回滚"""
+        deployer = self._deployer()
+        deployer.deploy_skill(self.skill_path, self.skill_info)
+
+        # 从原地部署转为分阶段部署
+        staged = SkillDeployer(str(self.deployed_dir), str(self.config_dir), staged=True, keep_releases=2)
+        (self.skill_path / "scripts" / "main.py").write_text("print('v2')\n", encoding='utf-8')
+        assert staged.deploy_skill(self.skill_path, self.skill_info)
+
+        live = self.deployed_dir / "demo-skill"
+        assert live.is_symlink()
+        assert (live / "scripts" / "main.py").read_text(encoding='utf-8') == "print('v2')\n"
+        releases = staged.list_releases('demo-skill')
+        assert [r['release'] for r in releases] == ['000000', '000001']
+        assert releases[-1]['current']
+
+        # 未变文件与上一个版本共享 inode
+        release_dir = self.deployed_dir / ".releases" / "demo-skill"
+        assert (release_dir / "000001" / "scripts" / "lib" / "util.py").samefile(
+            release_dir / "000000" / "scripts" / "lib" / "util.py")
+
+        for i in range(3):
+            (self.skill_path / "scripts" / "main.py").write_text(f"print('v{i + 3}')\n", encoding='utf-8')
+            assert staged.deploy_skill(self.skill_path, self.skill_info)
+        assert [r['release'] for r in staged.list_releases('demo-skill')] == ['000002', '000003', '000004']
+        assert staged.get_deployment_status('demo-skill', level='verify')['intact']
+
+        assert staged.rollback('demo-skill')
+        assert (live / "scripts" / "main.py").read_text(encoding='utf-8') == "print('v4')\n"
+        rolled_back = [r for r in staged.list_releases('demo-skill') if r['current']]
+        assert [r['release'] for r in rolled_back] == ['000003']
+        assert staged.generate_skill_index()['skills'][0]['deployed_at'] == rolled_back[0]['deployed_at']
+
+        assert staged.rollback('demo-skill', '000004')
+        assert (live / "scripts" / "main.py").read_text(encoding='utf-8') == "print('v5')\n"
+        assert not staged.rollback('demo-skill', '000001')
+
+        assert staged.undeploy_skill('demo-skill')
+        assert not live.is_symlink() and not release_dir.exists()
+        assert [s['name'] for s in staged.list_deployed_skills()] == []
+
+    def test_staged_unchanged_redeploy_keeps_release(self):
+        """测试分阶段部署在没有变化时沿用当前版本，不挤掉历史版本"""
+        staged = SkillDeployer(str(self.deployed_dir), str(self.config_dir), staged=True, keep_releases=1)
+        staged.deploy_skill(self.skill_path, self.skill_info)
+        (self.skill_path / "scripts" / "main.py").write_text("print('v2')\n", encoding='utf-8')
+        staged.deploy_skill(self.skill_path, self.skill_info)
+
+        config_file = self.deployed_dir / "demo-skill" / "deployment.json"
+        config_inode = config_file.stat().st_ino
+        for _ in range(3):
+            assert staged.deploy_skill(self.skill_path, self.skill_info)
+
+        assert [r['release'] for r in staged.list_releases('demo-skill')] == ['000001', '000002']
+        assert config_file.stat().st_ino == config_inode
+        assert staged.rollback('demo-skill')
+        assert (self.deployed_dir / "demo-skill" / "scripts" / "main.py").read_text(encoding='utf-8') == \
+            "print('main')\n"
+
+    def test_staged_link_failure_copies_from_source(self, monkeypatch):
+        """测试分阶段部署无法硬链接未变文件时从源复制（当前版本中的文件可能已丢失）"""
+        staged = SkillDeployer(str(self.deployed_dir), str(self.config_dir), staged=True)
+        staged.deploy_skill(self.skill_path, self.skill_info)
+        (self.skill_path / "scripts" / "main.py").write_text("print('v2')\n", encoding='utf-8')
+
+        def failing_link(src, dst):
+            os.unlink(src)
+            raise OSError(errno.EXDEV, "跨设备链接")
+
+        monkeypatch.setattr("src.skill_deployer.os.link", failing_link)
+        assert staged.deploy_skill(self.skill_path, self.skill_info)
+        monkeypatch.undo()
+
+        live = self.deployed_dir / "demo-skill"
+        assert (live / "scripts" / "lib" / "util.py").read_text(encoding='utf-8') == "X = 1\n"
+        assert staged.get_deployment_status('demo-skill', level='verify').intact is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
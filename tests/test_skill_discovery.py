@@ -0,0 +1,61 @@
+"""
+技能发现测试
+"""
+
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.skill_discovery import discover_skill_dirs
+
+
+class TestSkillDiscovery:
+    """技能发现测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = Path(self.temp_dir)
+
+        for rel_path in ["alpha", "beta", "group/gamma", "alpha/sub-skill",
+                         "node_modules/pkg", ".git/hooks"]:
+            skill_dir = self.root / rel_path
+            skill_dir.mkdir(parents=True, exist_ok=True)
+            (skill_dir / "SKILL.md").write_text("---\nname: x\n---\n", encoding='utf-8')
+
+        (self.root / "empty").mkdir()
+        (self.root / "README.md").write_text("", encoding='utf-8')
+
+    def teardown_method(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_default_depth(self):
+        """测试默认只发现第一层技能"""
+        names = [skill.name for skill in discover_skill_dirs(self.root)]
+        assert names == ["alpha", "beta"]
+
+    def test_unlimited_depth_with_nested(self):
+        """测试不限深度并包含嵌套技能，忽略目录被跳过"""
+        names = [skill.name for skill in discover_skill_dirs(self.root, max_depth=None, nested=True)]
+        assert names == ["alpha", "alpha/sub-skill", "beta", "group/gamma"]
+
+    def test_unlimited_depth_without_nested(self):
+        """测试不展开技能目录内部"""
+        names = [skill.name for skill in discover_skill_dirs(self.root, max_depth=None)]
+        assert names == ["alpha", "beta", "group/gamma"]
+
+    def test_record_contains_stat(self):
+        """测试记录包含 SKILL.md 的 stat 信息"""
+        skill = discover_skill_dirs(self.root, max_depth=2)[0]
+        st = Path(skill.skill_file).stat()
+        assert skill.size == st.st_size
+        assert skill.mtime_ns == st.st_mtime_ns
+
+    def test_missing_root(self):
+        """测试根目录不存在"""
+        assert discover_skill_dirs(self.root / "missing") == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,117 @@
+"""
+技能头部读取测试
+"""
+
+import yaml
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.skill_frontmatter import read_frontmatter, read_body, parse_frontmatter
+from src.skill_loader import SkillLoader
+from src.skill_manager import SkillManager
+
+
+SKILL_CONTENT = """---
+name: lazy-skill
+description: 延迟加载测试
+---
+
+# 延迟技能
+
+- Example: 示例
+"""
+
+
+class TestSkillFrontmatter:
+    """技能头部读取测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.skills_dir = Path(self.temp_dir) / "skills"
+        self.skill_dir = self.skills_dir / "lazy-skill"
+        self.skill_dir.mkdir(parents=True)
+        self.skill_file = self.skill_dir / "SKILL.md"
+        self.skill_file.write_text(SKILL_CONTENT, encoding='utf-8')
+
+    def teardown_method(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    @pytest.mark.parametrize("content", [
+        SKILL_CONTENT,
+        SKILL_CONTENT.replace("\n", "\r\n"),
+        "---name: inline---\nbody",
+        "---\nname: 中文 --- 分隔\n---\nbody",
+    ])
+    def test_matches_split(self, content):
+        """测试与 split('---', 2) 的切分结果一致"""
+        self.skill_file.write_bytes(content.encode('utf-8'))
+        normalized = content.replace('\r\n', '\n')
+        parts = normalized.split('---', 2)
+
+        yaml_text, offset = read_frontmatter(self.skill_file)
+        assert yaml_text == parts[1]
+        assert read_body(self.skill_file, offset) == parts[2].strip()
+
+    def test_invalid_frontmatter(self):
+        """测试缺少头部或结束标记"""
+        self.skill_file.write_text("# 没有头部\n", encoding='utf-8')
+        assert read_frontmatter(self.skill_file) is None
+
+        self.skill_file.write_text("---\nname: x\n", encoding='utf-8')
+        assert read_frontmatter(self.skill_file) is None
+
+    @pytest.mark.parametrize("text", [
+        "name: a\ndescription: 普通描述，带逗号, 和 C# 语言",
+        "name: a\ndescription: x   \n\n# 注释\nlicense: MIT",
+        "name: a\nversion: 1.0.0",
+        "name: a\nversion: 1.0",
+        "name: a\nenabled: yes",
+        "name: a\nvalue: null",
+        "name: a\ncreated: 2024-01-01",
+        "name: a\ntime: 1:30",
+        "name: a\ndescription: 带冒号: 会报错的写法",
+        "name: a\ndescription: 行尾注释 # 注释",
+        "name: a\ndescription: \"引号\"",
+        "name: a\ntags: [a, b]",
+        "name: a\nmeta:\n  k: v",
+        "on: a",
+        "name:a",
+        "",
+    ])
+    def test_parse_matches_safe_load(self, text):
+        """测试快速解析结果与 yaml.safe_load 一致"""
+        try:
+            expected = yaml.safe_load(text)
+        except yaml.YAMLError:
+            with pytest.raises(yaml.YAMLError):
+                parse_frontmatter(text)
+            return
+        assert parse_frontmatter(text) == expected
+
+    def test_manager_metadata_only(self):
+        """测试 SkillManager 只读取头部模式"""
+        manager = SkillManager(str(self.skills_dir), str(Path(self.temp_dir) / "deployed"))
+        full = manager.load_skill("lazy-skill")
+        lazy = manager.load_skill("lazy-skill", metadata_only=True)
+
+        assert not lazy.is_loaded('content')
+        assert lazy['metadata'] == full['metadata']
+        assert lazy['content'] == full['content']
+        assert lazy['resources'] == full['resources']
+
+    def test_loader_metadata_only(self):
+        """测试 SkillLoader 只读取头部模式"""
+        loader = SkillLoader()
+        full = loader.parse_skill_file(self.skill_file)
+        lazy = loader.parse_skill_file(self.skill_file, metadata_only=True)
+
+        assert lazy['metadata'] == full['metadata']
+        assert not lazy.is_loaded('parsed_content')
+        assert lazy['parsed_content'] == full['parsed_content']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+技能加载器批量解析/验证测试
+"""
+
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.skill_loader import SkillLoader
+from src.skill_commands import CommandExtractor, SHELL_PROMPT_PATTERN
+
+
+VALID_SKILL = "---\nname: {name}\ndescription: 批量测试\n---\n\n# {name}\n\n说明\n"
+
+
+class TestSkillLoaderBatch:
+    """技能加载器批量接口测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = []
+
+        for i in range(6):
+            skill_file = Path(self.temp_dir) / f"skill-{i}" / "SKILL.md"
+            skill_file.parent.mkdir()
+            skill_file.write_text(VALID_SKILL.format(name=f"skill-{i}"), encoding='utf-8')
+            self.paths.append(skill_file)
+
+        broken = Path(self.temp_dir) / "broken" / "SKILL.md"
+        broken.parent.mkdir()
+        broken.write_text("# 没有头部\n", encoding='utf-8')
+        self.paths.append(broken)
+
+        no_sections = Path(self.temp_dir) / "no-sections" / "SKILL.md"
+        no_sections.parent.mkdir()
+        no_sections.write_text("---\nname: no-sections\ndescription: 没有章节\n---\n\n只有正文\n", encoding='utf-8')
+        self.paths.append(no_sections)
+
+    def teardown_method(self):
+        """测试清理"""
+        shutil.rmtree(self.temp_dir)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_parse_many(self, workers):
+        """测试批量解析（顺序与进程池）"""
+        loader = SkillLoader()
+        results = dict(loader.parse_many(self.paths, workers=workers, chunk_size=3))
+
+        assert set(results) == set(self.paths)
+        assert results[self.paths[0]].name == 'skill-0'
+        assert results[self.paths[0]].parsed_content['sections'][0]['title'] == 'skill-0'
+        assert results[self.paths[6]] is None
+
+    def test_workers_keep_custom_command_patterns(self):
+        """测试进程池中的解析使用加载器注册的命令模式"""
+        for path in self.paths[:6]:
+            path.write_text(path.read_text(encoding='utf-8') + "\n$ make build\n", encoding='utf-8')
+
+        extractor = CommandExtractor()
+        extractor.register('shell', SHELL_PROMPT_PATTERN)
+        loader = SkillLoader(extractor)
+
+        sequential = dict(loader.parse_many(self.paths, workers=1))
+        pooled = dict(loader.parse_many(self.paths, workers=2, chunk_size=3))
+
+        assert sequential[self.paths[0]].parsed_content['commands'] == ['make build']
+        for path in self.paths[:6]:
+            assert pooled[path].parsed_content['commands'] == sequential[path].parsed_content['commands']
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_validate_many_summary(self, workers):
+        """测试批量验证与错误汇总"""
+        loader = SkillLoader()
+        summary = loader.summarize_validation(loader.validate_many(self.paths, workers=workers, chunk_size=2))
+
+        assert summary['total'] == 8
+        assert summary['valid'] == 6
+        assert summary['invalid'] == 2
+        assert summary['error_counts'] == {'metadata': 0, 'content': 0, 'structure': 2}
+        assert [Path(f['path']).parent.name for f in summary['failures']] == ['broken', 'no-sections']
+        assert summary['failures'][0]['name'] is None
+        assert summary['failures'][1]['errors'] == {'structure': ["技能缺少章节结构"]}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,88 @@
+"""
+技能 Markdown 解析测试
+"""
+
+import pytest
+from src.skill_markdown import parse_markdown, section_text, block_text
+from src.skill_loader import SkillLoader
+from src.skill_commands import CommandExtractor, SHELL_PROMPT_PATTERN
+
+
+CONTENT = """# 标题
+
+简介段落
+- Example: 第一个示例
+- Guideline: 保持简洁
+
+## 用法
+
+Usage: python run.py --input file
+
+```bash
+# 代码中的注释不是标题
+- Example: 代码中的示例
+命令: make deploy
+```
+
+#话题标签不是标题
+### 结尾"""
+
+
+class TestSkillMarkdown:
+    """技能 Markdown 解析测试类"""
+
+    def test_sections_and_offsets(self):
+        """测试章节识别与偏移"""
+        parsed = parse_markdown(CONTENT)
+
+        assert [(s['level'], s['title']) for s in parsed['sections']] == [(1, '标题'), (2, '用法'), (3, '结尾')]
+        assert section_text(CONTENT, parsed['sections'][0]).startswith('简介段落')
+        assert section_text(CONTENT, parsed['sections'][1]).endswith('#话题标签不是标题')
+        assert section_text(CONTENT, parsed['sections'][2]) == ''
+
+    def test_fenced_code_blocks(self):
+        """测试代码块内的行不会被识别为标题、示例"""
+        parsed = parse_markdown(CONTENT)
+
+        assert parsed['examples'] == ['第一个示例']
+        assert parsed['guidelines'] == ['保持简洁']
+        assert len(parsed['code_blocks']) == 1
+        block = parsed['code_blocks'][0]
+        assert block['language'] == 'bash'
+        assert block_text(CONTENT, block).splitlines()[0] == '# 代码中的注释不是标题'
+
+    def test_commands_in_document_order(self):
+        """测试命令按文档顺序提取（含代码块内）"""
+        parsed = parse_markdown(CONTENT)
+        assert parsed['commands'] == ['python run.py --input file', 'make deploy']
+
+    def test_unclosed_fence(self):
+        """测试未闭合的代码块延续到结尾"""
+        content = "# A\n````\n```\n# 不是标题"
+        parsed = parse_markdown(content)
+        assert len(parsed['sections']) == 1
+        assert block_text(content, parsed['code_blocks'][0]) == "```\n# 不是标题"
+
+    def test_loader_uses_single_pass_parser(self):
+        """测试 SkillLoader 使用单遍解析结果"""
+        loader = SkillLoader()
+        skill = loader.parse_skill_content(f"---\nname: md\ndescription: 测试\n---\n{CONTENT}\n")
+
+        assert skill.parsed_content == parse_markdown(skill.content)
+        assert loader.extract_skill_commands(skill) == ['python run.py --input file', 'make deploy']
+        assert loader.validate_skill(skill)['structure'] == []
+
+    def test_commands_use_loader_extractor(self):
+        """测试解析结果中的命令与加载器的命令提取引擎一致（含自定义模式）"""
+        extractor = CommandExtractor()
+        extractor.register('shell', SHELL_PROMPT_PATTERN)
+        loader = SkillLoader(command_extractor=extractor)
+        skill = loader.parse_skill_content(f"---\nname: md\ndescription: 测试\n---\n{CONTENT}\n$ ls -la\n")
+
+        assert skill.parsed_content['commands'] == ['python run.py --input file', 'make deploy', 'ls -la']
+        assert loader.extract_skill_commands(skill) == skill.parsed_content['commands']
+        assert parse_markdown(skill.content)['commands'] == ['python run.py --input file', 'make deploy']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
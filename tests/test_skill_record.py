@@ -0,0 +1,66 @@
+"""
+技能记录测试
+"""
+
+import pickle
+import pytest
+from src.skill_record import SkillRecord
+
+
+class TestSkillRecord:
+    """技能记录测试类"""
+
+    def test_lazy_field_loaded_once(self):
+        """测试延迟字段只在访问时加载一次"""
+        calls = []
+        record = SkillRecord('x', {'name': 'x'}, loaders={'content': lambda: calls.append(1) or "正文"})
+
+        assert 'content' in record
+        assert not record.is_loaded('content')
+        assert record['content'] == "正文"
+        assert record.content == "正文"
+        assert record.get('content') == "正文"
+        assert calls == [1]
+
+    def test_mapping_compatibility(self):
+        """测试兼容旧字典访问方式"""
+        record = SkillRecord.from_deployment_config(
+            {'skill_name': 'demo', 'metadata': {'category': 'test'}, 'deployed_at': '1.0', 'resources': []},
+            deploy_path='/tmp/demo'
+        )
+
+        assert record['skill_name'] == record['name'] == 'demo'
+        assert record.get('deployed_at') == '1.0'
+        assert record.get('files_exist', {}) == {}
+        assert record.files_exist is None
+        assert 'content' not in record
+        with pytest.raises(KeyError):
+            record['content']
+        assert record.to_dict() == {
+            'name': 'demo', 'metadata': {'category': 'test'}, 'resources': [],
+            'deployed_at': '1.0', 'deploy_path': '/tmp/demo'
+        }
+
+    def test_metadata_keys_interned(self):
+        """测试元数据键名被 intern"""
+        first = SkillRecord('a', {''.join(['desc', 'ription']): 'x'})
+        second = SkillRecord('b', {''.join(['descr', 'iption']): 'y'})
+
+        assert next(iter(first.metadata)) is next(iter(second.metadata))
+
+    def test_pickle_materializes_lazy_fields(self):
+        """测试序列化前加载延迟字段"""
+        record = SkillRecord('x', loaders={'content': lambda: "正文"})
+
+        restored = pickle.loads(pickle.dumps(record))
+        assert restored.content == "正文"
+        assert restored == record
+
+    def test_rejects_unknown_field(self):
+        """测试拒绝未知字段"""
+        with pytest.raises(TypeError):
+            SkillRecord('x', unknown=1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+"""
+技能监视器测试
+"""
+
+import time
+import queue
+import pytest
+import tempfile
+import shutil
+import threading
+from pathlib import Path
+from src.skill_watcher import SkillWatcher
+
+
+class TestSkillWatcher:
+    """技能监视器测试类"""
+
+    def setup_method(self):
+        """测试设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.skills_dir = Path(self.temp_dir) / "skills"
+
+        for name in ("skill-a", "skill-b"):
+            (self.skills_dir / name / "scripts").mkdir(parents=True)
+            (self.skills_dir / name / "SKILL.md").write_text(f"---\nname: {name}\n---\n", encoding='utf-8')
+
+        self.batches = queue.Queue()
+        self.watcher = None
+        self.thread = None
+
+    def teardown_method(self):
+        """测试清理"""
+        if self.watcher:
+            self.watcher.stop()
+            self.thread.join(timeout=5)
+        shutil.rmtree(self.temp_dir)
+
+    def start(self, use_inotify):
+        """在后台线程中启动监视"""
+        self.watcher = SkillWatcher(str(self.skills_dir), debounce=0.1, poll_interval=0.05,
+                                    use_inotify=use_inotify)
+        if use_inotify and self.watcher.backend != 'inotify':
+            pytest.skip("inotify 不可用")
+
+        self.thread = threading.Thread(
+            target=self.watcher.run, args=(lambda names, detected_at: self.batches.put(names),), daemon=True)
+        self.thread.start()
+
+    def next_batch(self):
+        return self.batches.get(timeout=3)
+
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_reports_owning_skill(self, use_inotify):
+        """测试变更按所属技能报告"""
+        self.start(use_inotify)
+
+        (self.skills_dir / "skill-a" / "scripts" / "run.py").write_text("print(1)\n", encoding='utf-8')
+        assert self.next_batch() == {"skill-a"}
+
+        # 新建技能及其中的子目录
+        (self.skills_dir / "skill-c" / "templates").mkdir(parents=True)
+        time.sleep(0.05)
+        (self.skills_dir / "skill-c" / "templates" / "t.md").write_text("x", encoding='utf-8')
+        assert self.next_batch() == {"skill-c"}
+
+        (self.skills_dir / "skill-c" / "templates" / "t.md").write_text("y", encoding='utf-8')
+        assert self.next_batch() == {"skill-c"}
+
+        shutil.rmtree(self.skills_dir / "skill-b")
+        assert self.next_batch() == {"skill-b"}
+
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_debounce_and_ignored_files(self, use_inotify):
+        """测试连续变更合并为一次报告，编辑器临时文件被忽略"""
+        self.start(use_inotify)
+
+        (self.skills_dir / "README.md").write_text("仓库说明", encoding='utf-8')
+        (self.skills_dir / "skill-a" / ".SKILL.md.swp").write_text("swap", encoding='utf-8')
+        for i in range(5):
+            (self.skills_dir / "skill-a" / "SKILL.md").write_text(f"---\nname: skill-a\n---\n{i}\n", encoding='utf-8')
+            (self.skills_dir / "skill-b" / "SKILL.md").write_text(f"---\nname: skill-b\n---\n{i}\n", encoding='utf-8')
+            time.sleep(0.01)
+
+        assert self.next_batch() == {"skill-a", "skill-b"}
+        with pytest.raises(queue.Empty):
+            self.batches.get(timeout=0.5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])